@@ -0,0 +1,68 @@
+"""
+배치 크롤링 입력 처리 — 검색 URL 목록 또는 URL 템플릿 + 파라미터 격자를 실제 URL 목록으로 전개.
+예) url_template="https://www.airbnb.co.kr/s/{city}/homes?checkin={checkin}",
+    params={"city": ["서울", "부산"], "checkin": ["2026-11-01", "2026-11-08"]} → URL 4개
+"""
+
+import itertools
+import string
+from urllib.parse import quote
+
+# 한 배치에서 만들 수 있는 최대 URL(하위 작업) 수
+MAX_BATCH_URLS = 200
+
+
+def _template_fields(template: str) -> list[str]:
+    """템플릿의 {이름} 필드 목록 (등장 순서, 중복 제거)."""
+    fields: list[str] = []
+    for _, name, _, _ in string.Formatter().parse(template):
+        if name is None:
+            continue
+        if not name.isidentifier():
+            raise ValueError(f"invalid template field: {{{name}}}")
+        if name not in fields:
+            fields.append(name)
+    return fields
+
+
+def expand_template(template: str, params: dict[str, list[str]]) -> list[str]:
+    """템플릿 필드별 값 목록의 모든 조합으로 URL 생성 (값은 URL 인코딩)."""
+    fields = _template_fields(template)
+    missing = [f for f in fields if not params.get(f)]
+    if missing:
+        raise ValueError(f"missing params for template fields: {', '.join(missing)}")
+    unused = sorted(set(params) - set(fields))
+    if unused:
+        raise ValueError(f"params not used in template: {', '.join(unused)}")
+    total = 1
+    for f in fields:
+        total *= len(params[f])
+    if total > MAX_BATCH_URLS:
+        raise ValueError(f"too many urls: {total} (max {MAX_BATCH_URLS})")
+    urls = []
+    for combo in itertools.product(*(params[f] for f in fields)):
+        values = {f: quote(str(v), safe="") for f, v in zip(fields, combo)}
+        urls.append(template.format(**values))
+    return urls
+
+
+def expand_batch_urls(
+    search_urls: list[str] | None = None,
+    url_template: str | None = None,
+    params: dict[str, list[str]] | None = None,
+) -> list[str]:
+    """
+    배치 요청을 URL 목록으로 변환 (입력 순서 유지, 중복 제거).
+    search_urls 와 url_template 은 함께 쓸 수 있음. 잘못된 입력은 ValueError.
+    """
+    urls = [u.strip() for u in (search_urls or []) if u and u.strip()]
+    if url_template:
+        urls.extend(expand_template(url_template, params or {}))
+    elif params:
+        raise ValueError("params requires url_template")
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        raise ValueError("no search urls")
+    if len(urls) > MAX_BATCH_URLS:
+        raise ValueError(f"too many urls: {len(urls)} (max {MAX_BATCH_URLS})")
+    return urls
@@ -0,0 +1,109 @@
+"""
+프로필 템플릿 벤치마크 — 새 드라이버의 첫 페이지 로드 시간을 빈 프로필(cold) vs 데운 템플릿 복제본(warm)으로 비교.
+드라이버마다: 프로필 준비(복제) → Chrome 시작 → URL 이동 + 숙소 카드 대기(_wait_for_listings) → 종료.
+JS 번들 캐시·동의 쿠키 효과를 보려면 실제 검색 URL 이 필요 (mock 서버에는 외부 리소스가 없음).
+
+실행 (backend 폴더에서, Chrome·chromedriver 필요):
+    python benchmarks/bench_browser_profile.py --drivers 5
+    python benchmarks/bench_browser_profile.py --url "https://www.airbnb.co.kr/s/부산/homes" --output bench_profile.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import browser_profile  # noqa: E402
+import crawler  # noqa: E402
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {
+        "mean_ms": round(statistics.fmean(samples), 1),
+        "p50_ms": round(statistics.median(samples), 1),
+        "max_ms": round(max(samples), 1),
+    }
+
+
+def run_mode(mode: str, url: str, drivers: int) -> dict[str, Any]:
+    prepare, start, first_page = [], [], []
+    found = 0
+    for _ in range(drivers):
+        t0 = time.perf_counter()
+        profile = browser_profile.PROFILES.clone() if mode == "warm" else tempfile.mkdtemp(prefix="bench-cold-")
+        if profile is None:
+            sys.exit("프로필 템플릿 복제 실패")
+        t1 = time.perf_counter()
+        driver = crawler.create_driver(user_data_dir=profile)
+        t2 = time.perf_counter()
+        try:
+            driver.get(url)
+            found += crawler._wait_for_listings(driver)
+            t3 = time.perf_counter()
+        finally:
+            driver.quit()
+            browser_profile.release(profile)
+        prepare.append((t1 - t0) * 1000)
+        start.append((t2 - t1) * 1000)
+        first_page.append((t3 - t2) * 1000)
+    return {
+        "mode": mode,
+        "drivers": drivers,
+        "listings_found": found,
+        "profile_prepare": _summary(prepare),
+        "driver_start": _summary(start),
+        "first_page": _summary(first_page),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=browser_profile.BROWSER_PROFILE_WARM_URL, help="첫 페이지로 열 검색 URL")
+    parser.add_argument("--drivers", type=int, default=5, help="모드별로 새로 띄울 드라이버 수")
+    parser.add_argument("--root", help="템플릿·복제본 폴더 (기본: 새 임시 폴더)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: stdout)")
+    args = parser.parse_args()
+
+    browser_profile.PROFILES = browser_profile.ProfileManager(
+        root=args.root or tempfile.mkdtemp(prefix="bench-profile-"), warm_url=args.url, enabled=True
+    )
+    start = time.perf_counter()
+    # --root 에 유효한 템플릿이 있으면 재사용
+    browser_profile.PROFILES.ensure()
+    if browser_profile.PROFILES.snapshot()["template"] is None:
+        sys.exit("프로필 템플릿 생성 실패")
+    build_ms = (time.perf_counter() - start) * 1000
+
+    results = []
+    for mode in ("cold", "warm"):
+        results.append(run_mode(mode, args.url, args.drivers))
+        r = results[-1]
+        print(f"{mode}: first page p50 {r['first_page']['p50_ms']}ms", file=sys.stderr)
+
+    report: dict[str, Any] = {
+        "url": args.url,
+        "template_build_ms": round(build_ms, 1),
+        "template_mb": round(browser_profile._dir_size(browser_profile.PROFILES.snapshot()["template"]) / 1024 ** 2, 1),
+        "reflink": browser_profile._reflink,
+        "results": results,
+    }
+    cold, warm = results
+    if warm["first_page"]["p50_ms"]:
+        report["first_page_speedup"] = round(cold["first_page"]["p50_ms"] / warm["first_page"]["p50_ms"], 2)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+브라우저 엔진 벤치마크 — selenium(chromedriver 경유) vs cdp(cdp_engine, websocket 직접 연결).
+mock 검색 서버(mock_search_server.py)를 대상으로:
+- 명령 지연: execute_script 1회, find_elements + get_attribute, fallback 추출(요소별 호출 수백 회), 고속 추출, 다음 페이지 이동
+- 크롤링 처리량: run_crawl(engine=...) 을 --jobs 개 동시에 실행해 초당 페이지
+결과는 JSON, 두 엔진을 모두 돌리면 cdp / selenium 배율 포함.
+
+실행 (backend 폴더에서, Chrome 필요 — selenium 엔진은 chromedriver 도 필요):
+    python benchmarks/bench_engines.py --calls 200 --pages 5
+    python benchmarks/bench_engines.py --engine cdp --jobs 4 --output bench_engines.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# 로컬 mock 서버에 대한 속도 제어 대기는 측정 대상이 아님
+os.environ.setdefault("PACING_START_RATE", "1000")
+os.environ.setdefault("PACING_MAX_RATE", "1000")
+os.environ.setdefault("PACING_JITTER", "0")
+
+import cdp_engine  # noqa: E402
+import crawler  # noqa: E402
+from mock_search_server import MockSearchServer  # noqa: E402
+from selenium.webdriver.common.by import By  # noqa: E402
+
+ENGINES = (crawler.ENGINE_SELENIUM, crawler.ENGINE_CDP)
+
+
+def _open(engine: str) -> Any:
+    return cdp_engine.CDP_ENGINE.acquire() if engine == crawler.ENGINE_CDP else crawler.create_driver()
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def _card_hrefs(driver: Any) -> list[str]:
+    return [c.get_attribute("href") for c in driver.find_elements(By.CSS_SELECTOR, 'a[href*="/rooms/"]')]
+
+
+def bench_commands(server: MockSearchServer, engine: str, calls: int, repeat: int) -> dict[str, Any]:
+    driver = _open(engine)
+    try:
+        url = server.search_url()
+        driver.get(url)
+        crawler._wait_for_listings(driver)
+        base_url = server.base_url
+        result: dict[str, Any] = {
+            "execute_script": _timed(lambda: driver.execute_script("return 1"), calls),
+            "find_elements_attributes": _timed(lambda: _card_hrefs(driver), repeat),
+            "extract_fallback": _timed(lambda: crawler._get_airbnb_listings_fallback(driver, base_url), repeat),
+            "extract_fast": _timed(lambda: crawler._get_airbnb_listings_fast(driver, base_url), repeat),
+        }
+
+        def next_page() -> None:
+            driver.get(url)
+            crawler._wait_for_listings(driver)
+            if not crawler.go_to_next_page(driver):
+                raise RuntimeError("next page not found")
+
+        result["navigate_and_next_page"] = _timed(next_page, repeat)
+        return result
+    finally:
+        driver.quit()
+
+
+def bench_crawl(server: MockSearchServer, engine: str, jobs: int, pages: int) -> dict[str, Any]:
+    # 검색마다 다른 가격대 — 같은 결과를 캐시로 재사용하지 않도록
+    urls = [f"{server.search_url()}&price_min={i * 1000}" for i in range(jobs)]
+    collected = [0] * jobs
+    errors: list[str] = []
+
+    def crawl(i: int) -> None:
+        def on_page(page: int, page_listings: list[dict], _all: list[dict]) -> None:
+            collected[i] = page
+        try:
+            crawler.run_crawl(urls[i], pages, on_page_result=on_page, keep_results=False, engine=engine)
+        except Exception as e:
+            errors.append(f"{urls[i]}: {e}")
+
+    threads = [threading.Thread(target=crawl, args=(i,)) for i in range(jobs)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.perf_counter() - start
+    total_pages = sum(collected)
+    return {
+        "jobs": jobs,
+        "pages": total_pages,
+        "seconds": round(seconds, 3),
+        "pages_per_second": round(total_pages / seconds, 3) if seconds else 0.0,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", choices=(*ENGINES, "both"), default="both")
+    parser.add_argument("--calls", type=int, default=200, help="execute_script 지연 측정 횟수")
+    parser.add_argument("--repeat", type=int, default=5, help="추출·페이지 이동 측정 반복 횟수")
+    parser.add_argument("--jobs", type=int, default=2, help="처리량 측정 시 동시 크롤링 수")
+    parser.add_argument("--pages", type=int, default=5, help="크롤링당 페이지 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: stdout)")
+    args = parser.parse_args()
+
+    engines = ENGINES if args.engine == "both" else (args.engine,)
+    results: dict[str, Any] = {}
+    with MockSearchServer(total=3000) as server:
+        for engine in engines:
+            commands = bench_commands(server, engine, args.calls, args.repeat)
+            crawl = bench_crawl(server, engine, args.jobs, args.pages)
+            results[engine] = {"commands": commands, "crawl": crawl}
+            print(
+                f"{engine}: execute_script p50 {commands['execute_script']['p50_ms']}ms, "
+                f"fallback p50 {commands['extract_fallback']['p50_ms']}ms, {crawl['pages_per_second']} pages/s",
+                file=sys.stderr,
+            )
+
+    report: dict[str, Any] = {"calls": args.calls, "repeat": args.repeat, "results": results}
+    if len(results) == 2:
+        sel, cdp = results[crawler.ENGINE_SELENIUM], results[crawler.ENGINE_CDP]
+        report["cdp_speedup"] = {
+            name: round(sel["commands"][name]["p50_ms"] / cdp["commands"][name]["p50_ms"], 2)
+            for name in sel["commands"]
+            if cdp["commands"][name]["p50_ms"]
+        }
+        if sel["crawl"]["pages_per_second"]:
+            report["cdp_speedup"]["crawl"] = round(
+                cdp["crawl"]["pages_per_second"] / sel["crawl"]["pages_per_second"], 2
+            )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if any(r["crawl"]["errors"] for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
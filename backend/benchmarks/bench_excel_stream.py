@@ -0,0 +1,153 @@
+"""
+/excel-from-listings 업로드 벤치마크 — 같은 listing N 행을 JSON(기존, 전체 메모리 처리) vs NDJSON·CSV(스트리밍) 본문으로 변환.
+백엔드를 별도 프로세스로 띄우고 형식마다 한 번씩 요청 (NDJSON·CSV 는 chunked 전송, 본문을 클라이언트에서도 미리 만들지 않음).
+형식별 소요 시간, 응답 크기, 요청 동안 서버 프로세스 RSS 증가량(요청 직전 대비 최대값)을 JSON 으로 출력.
+
+실행 (backend 폴더에서, Linux):
+    python benchmarks/bench_excel_stream.py --rows 100000
+    python benchmarks/bench_excel_stream.py --rows 100000 --formats ndjson csv --output bench_excel_stream.json
+"""
+
+import argparse
+import csv
+import http.client
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Iterator
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from loadtest import ProcessSampler, _wait_ready  # noqa: E402
+
+FORMATS = ("json", "ndjson", "csv")
+CONTENT_TYPES = {"json": "application/json", "ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+CSV_FIELDS = ["no", "title", "price", "rating", "review_count", "url", "room_id", "badges"]
+# chunked 전송 시 한 번에 보낼 행 수
+ROWS_PER_CHUNK = 500
+
+
+def serve(port: int) -> None:
+    sys.path.insert(0, BACKEND_DIR)
+    os.environ["CRAWLER_WARMUP"] = "0"
+    import uvicorn
+
+    import main
+
+    uvicorn.run(main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def _listing(i: int) -> dict[str, Any]:
+    return {
+        "no": i,
+        "title": f"해운대 오션뷰 아파트 {i}",
+        "price": f"₩{50000 + i % 1000 * 100:,}",
+        "rating": round(4 + i % 10 / 10, 2),
+        "review_count": i % 500,
+        "url": f"https://www.airbnb.co.kr/rooms/{1000000 + i}",
+        "room_id": str(1000000 + i),
+        "badges": "게스트 선호",
+    }
+
+
+def _ndjson_chunks(rows: int) -> Iterator[bytes]:
+    for start in range(1, rows + 1, ROWS_PER_CHUNK):
+        end = min(start + ROWS_PER_CHUNK, rows + 1)
+        yield "".join(json.dumps(_listing(i), ensure_ascii=False) + "\n" for i in range(start, end)).encode()
+
+
+def _csv_chunks(rows: int) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    for start in range(1, rows + 1, ROWS_PER_CHUNK):
+        for i in range(start, min(start + ROWS_PER_CHUNK, rows + 1)):
+            writer.writerow(_listing(i))
+        yield buf.getvalue().encode()
+        buf.seek(0)
+        buf.truncate()
+
+
+def _json_body(rows: int) -> bytes:
+    return json.dumps({"listings": [_listing(i) for i in range(1, rows + 1)]}, ensure_ascii=False).encode()
+
+
+def _current_rss_kib(pid: int) -> int:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def run_format(port: int, pid: int, fmt: str, rows: int) -> dict[str, Any]:
+    # JSON 은 본문 전체가 필요하므로 미리 만들어 둠 (직렬화 시간은 측정에서 제외)
+    body: Any = _json_body(rows) if fmt == "json" else (_ndjson_chunks if fmt == "ndjson" else _csv_chunks)(rows)
+    baseline = _current_rss_kib(pid)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+    with ProcessSampler(pid, interval=0.05) as sampler:
+        start = time.perf_counter()
+        conn.request(
+            "POST", "/excel-from-listings", body=body,
+            headers={"Content-Type": CONTENT_TYPES[fmt]}, encode_chunked=fmt != "json",
+        )
+        resp = conn.getresponse()
+        size = len(resp.read())
+        seconds = time.perf_counter() - start
+    conn.close()
+    if resp.status != 200:
+        raise RuntimeError(f"{fmt}: HTTP {resp.status}")
+    return {
+        "format": fmt,
+        "seconds": round(seconds, 2),
+        "rows_per_second": round(rows / seconds),
+        "response_bytes": size,
+        "row_count_header": resp.getheader("X-Row-Count"),
+        "server_rss_before_mb": round(baseline / 1024, 1),
+        "server_rss_growth_mb": round(max(sampler.max_rss_kib - baseline, 0) / 1024, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--rows", type=int, default=100_000, help="업로드할 listing 행 수")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: stdout)")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    results = []
+    # 형식마다 새 서버 프로세스 — 앞 요청이 키운 힙이 다음 측정의 RSS 증가량을 가리지 않도록
+    for fmt in args.formats:
+        proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(args.port)], cwd=BACKEND_DIR
+        )
+        try:
+            _wait_ready(args.port, proc)
+            results.append(run_format(args.port, proc.pid, fmt, args.rows))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=10)
+        r = results[-1]
+        print(f"{fmt}: {r['seconds']}s, RSS +{r['server_rss_growth_mb']}MB", file=sys.stderr)
+
+    text = json.dumps({"rows": args.rows, "results": results}, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
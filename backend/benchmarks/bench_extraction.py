@@ -0,0 +1,249 @@
+"""
+추출 엔진 오프라인 벤치마크 — 녹화된 검색 결과 HTML 을 로컬 서버로 띄우고 headless Chrome 에서 실행.
+엔진: fast(_get_airbnb_listings_fast — 사전 설치한 수집 함수 호출), fast_inline(같은 수집 함수 소스를 페이지마다 전송),
+      fallback(_get_airbnb_listings_fallback), auto(get_airbnb_listings),
+      next_page(go_to_next_page, 다음 페이지 링크가 있는 fixture 만).
+지표: 페이지당 지연(ms), WebDriver 호출 수, 추출 정확도(방 ID 재현율·정밀도, 필드 일치율), Python 피크 메모리, JS 힙.
+결과는 JSON. --baseline 으로 이전 결과와 비교해 느려지거나 정확도가 떨어지면 종료 코드 1.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_extraction.py --repeat 5 --output bench_extraction.json
+    python benchmarks/bench_extraction.py --baseline bench_extraction.json --max-slowdown 1.25
+"""
+
+import argparse
+import glob
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Callable
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from crawler import (  # noqa: E402
+    _get_airbnb_listings_fallback,
+    _get_airbnb_listings_fast,
+    create_driver,
+    get_airbnb_listings,
+    go_to_next_page,
+)
+from fixture_server import FIXTURE_DIR, FixtureServer  # noqa: E402
+from listing_index import room_id_from_url  # noqa: E402
+
+FIELDS = ("title", "price", "address", "rating")
+
+ENGINES: dict[str, Callable[[Any, str], list[dict] | None]] = {
+    "fast": _get_airbnb_listings_fast,
+    "fast_inline": lambda driver, base_url: _get_airbnb_listings_fast(driver, base_url, inline=True),
+    "fallback": _get_airbnb_listings_fallback,
+    "auto": lambda driver, base_url: get_airbnb_listings(driver),
+}
+
+
+class CallCounter:
+    """driver.execute 를 감싸 WebDriver 명령(HTTP 왕복) 수를 셈. WebElement 호출도 driver.execute 를 거침."""
+
+    def __init__(self, driver: Any) -> None:
+        self.counts: Counter[str] = Counter()
+        original = driver.execute
+
+        def counting_execute(command: str, params: dict | None = None) -> Any:
+            self.counts[command] += 1
+            return original(command, params)
+
+        driver.execute = counting_execute
+
+    def reset(self) -> None:
+        self.counts.clear()
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+def _load_fixtures(names: list[str] | None) -> list[tuple[str, dict]]:
+    fixtures = []
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.expected.json"))):
+        name = os.path.basename(path)[: -len(".expected.json")]
+        if names and name not in names:
+            continue
+        with open(path, encoding="utf-8") as f:
+            fixtures.append((name, json.load(f)))
+    return fixtures
+
+
+def _accuracy(rows: list[dict], expected: list[dict]) -> dict[str, Any]:
+    """방 ID 기준 재현율·정밀도, 매칭된 행의 필드별 일치율."""
+    got = {room_id_from_url(r.get("url", "")): r for r in rows}
+    want = {e["room_id"]: e for e in expected}
+    matched = [rid for rid in want if rid in got]
+    field_accuracy = {}
+    for field in FIELDS:
+        hits = sum(1 for rid in matched if (got[rid].get(field) or "").strip() == want[rid][field])
+        field_accuracy[field] = round(hits / len(want), 3) if want else 1.0
+    return {
+        "recall": round(len(matched) / len(want), 3) if want else 1.0,
+        "precision": round(len(matched) / len(got), 3) if got else (1.0 if not want else 0.0),
+        "duplicates": len(rows) - len(got),
+        "fields": field_accuracy,
+    }
+
+
+def _load(driver: Any, url: str) -> None:
+    driver.get(url)
+    driver.execute_script("return document.readyState")
+
+
+def _js_heap_kib(driver: Any) -> float | None:
+    try:
+        used = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : null")
+        return round(used / 1024, 1) if used else None
+    except Exception:
+        return None
+
+
+def _summary(latencies: list[float]) -> dict[str, float]:
+    return {
+        "mean": round(statistics.fmean(latencies), 2),
+        "p50": round(statistics.median(latencies), 2),
+        "max": round(max(latencies), 2),
+    }
+
+
+def run_engine(driver: Any, counter: CallCounter, server: FixtureServer, name: str, spec: dict,
+               engine: str, repeat: int) -> dict[str, Any]:
+    latencies, calls, peaks = [], [], []
+    rows: list[dict] = []
+    for _ in range(repeat):
+        _load(driver, server.url(f"{name}.html"))
+        counter.reset()
+        tracemalloc.start()
+        start = time.perf_counter()
+        rows = ENGINES[engine](driver, server.base_url) or []
+        latencies.append((time.perf_counter() - start) * 1000)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        calls.append(counter.total)
+    return {
+        "fixture": name,
+        "engine": engine,
+        "latency_ms": _summary(latencies),
+        "webdriver_calls": max(calls),
+        "rows": len(rows),
+        "accuracy": _accuracy(rows, spec["listings"]),
+        "py_peak_kib": round(max(peaks) / 1024, 1),
+        "js_heap_kib": _js_heap_kib(driver),
+    }
+
+
+def run_next_page(driver: Any, counter: CallCounter, server: FixtureServer, name: str, spec: dict,
+                  repeat: int) -> dict[str, Any]:
+    latencies, calls, successes = [], [], 0
+    for _ in range(repeat):
+        _load(driver, server.url(f"{name}.html"))
+        counter.reset()
+        start = time.perf_counter()
+        moved = go_to_next_page(driver)
+        latencies.append((time.perf_counter() - start) * 1000)
+        calls.append(counter.total)
+        if moved and driver.current_url.endswith(spec["next_page"]):
+            successes += 1
+    return {
+        "fixture": name,
+        "engine": "next_page",
+        "latency_ms": _summary(latencies),
+        "webdriver_calls": max(calls),
+        "accuracy": {"success_rate": round(successes / repeat, 3)},
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def compare(result: dict, baseline: dict, max_slowdown: float) -> list[str]:
+    """기준 결과 대비 회귀 목록 (지연 증가율 초과, 재현율·필드 정확도 하락)."""
+    base = {(r["fixture"], r["engine"]): r for r in baseline.get("results", [])}
+    problems = []
+    for r in result["results"]:
+        b = base.get((r["fixture"], r["engine"]))
+        if b is None:
+            continue
+        key = f"{r['fixture']}/{r['engine']}"
+        if r["latency_ms"]["p50"] > b["latency_ms"]["p50"] * max_slowdown:
+            problems.append(f"{key}: p50 {b['latency_ms']['p50']}ms -> {r['latency_ms']['p50']}ms")
+        for metric in ("recall", "success_rate"):
+            if metric in b["accuracy"] and r["accuracy"].get(metric, 0) < b["accuracy"][metric]:
+                problems.append(f"{key}: {metric} {b['accuracy'][metric]} -> {r['accuracy'].get(metric)}")
+        for field, value in b["accuracy"].get("fields", {}).items():
+            if r["accuracy"]["fields"].get(field, 0) < value:
+                problems.append(f"{key}: {field} 정확도 {value} -> {r['accuracy']['fields'].get(field)}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="fixture·엔진 조합당 반복 횟수")
+    parser.add_argument("--fixtures", nargs="*", help="실행할 fixture 이름 (기본: 전체)")
+    parser.add_argument("--engines", nargs="*", default=[*ENGINES, "next_page"])
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: stdout)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-slowdown", type=float, default=1.25, help="허용 p50 지연 배율")
+    args = parser.parse_args()
+
+    fixtures = _load_fixtures(args.fixtures)
+    results = []
+    driver = create_driver()
+    try:
+        counter = CallCounter(driver)
+        with FixtureServer() as server:
+            for name, spec in fixtures:
+                for engine in args.engines:
+                    if engine == "next_page":
+                        if spec.get("next_page"):
+                            results.append(run_next_page(driver, counter, server, name, spec, args.repeat))
+                        continue
+                    results.append(run_engine(driver, counter, server, name, spec, engine, args.repeat))
+                    print(f"{name}/{engine}: {results[-1]['latency_ms']['p50']}ms", file=sys.stderr)
+        browser_version = driver.capabilities.get("browserVersion")
+    finally:
+        driver.quit()
+
+    result = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "browser_version": browser_version,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(result, json.load(f), args.max_slowdown)
+        for p in problems:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+탭 공유 벤치마크 — 같은 검색 N개를 (a) 작업마다 Chrome 하나 vs (b) Chrome 하나에 탭 N개로 동시에 크롤링.
+mock 검색 서버(mock_search_server.py, --delay 로 응답 지연 흉내)를 대상으로 run_crawl 을 그대로 실행.
+지표: 수집 페이지 수, 소요 시간, 초당 페이지, Chrome 프로세스 트리 최대 RSS(MB), RAM 1GB 당 초당 페이지.
+RSS 는 이 프로세스의 자식 프로세스(chromedriver·Chrome) 합계를 주기적으로 샘플링 (Linux /proc, psutil 이 있으면 psutil).
+
+실행 (backend 폴더에서, Chrome·chromedriver 필요):
+    python benchmarks/bench_multitab.py --jobs 4 --pages 5 --delay 0.3
+    python benchmarks/bench_multitab.py --jobs 8 --mode tabs --output bench_multitab.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# 로컬 mock 서버에 대한 속도 제어 대기는 측정 대상이 아님
+os.environ.setdefault("PACING_START_RATE", "1000")
+os.environ.setdefault("PACING_MAX_RATE", "1000")
+os.environ.setdefault("PACING_JITTER", "0")
+
+import crawler  # noqa: E402
+import multitab  # noqa: E402
+from mock_search_server import MockSearchServer  # noqa: E402
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def _children_rss_bytes(root_pid: int) -> int:
+    """root_pid 의 모든 하위 프로세스 RSS 합계."""
+    if psutil is not None:
+        total = 0
+        for child in psutil.Process(root_pid).children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        return total
+    parents: dict[int, int] = {}
+    rss: dict[int, int] = {}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                fields = f.read().rsplit(")", 1)[1].split()
+            parents[int(name)] = int(fields[1])
+            rss[int(name)] = int(fields[21]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    family = {root_pid}
+    changed = True
+    while changed:
+        changed = False
+        for pid, ppid in parents.items():
+            if ppid in family and pid not in family:
+                family.add(pid)
+                changed = True
+    return sum(rss[p] for p in family if p != root_pid)
+
+
+class RssSampler:
+    """백그라운드에서 하위 프로세스 RSS 최대값 기록."""
+
+    def __init__(self, interval: float = 0.25) -> None:
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _children_rss_bytes(os.getpid()))
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_mode(server: MockSearchServer, mode: str, jobs: int, pages: int) -> dict[str, Any]:
+    # 검색마다 다른 가격대 — 같은 결과를 캐시로 재사용하지 않도록
+    urls = [f"{server.search_url()}&price_min={i * 1000}" for i in range(jobs)]
+    multitab.TAB_POOL = multitab.TabPool(jobs if mode == "tabs" else 1)
+    collected = [0] * jobs
+    errors: list[str] = []
+
+    def crawl(i: int) -> None:
+        def on_page(page: int, page_listings: list[dict], _all: list[dict]) -> None:
+            collected[i] = page
+        try:
+            crawler.run_crawl(urls[i], pages, on_page_result=on_page, keep_results=False)
+        except Exception as e:
+            errors.append(f"{urls[i]}: {e}")
+
+    threads = [threading.Thread(target=crawl, args=(i,)) for i in range(jobs)]
+    with RssSampler() as sampler:
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        seconds = time.perf_counter() - start
+    total_pages = sum(collected)
+    peak_gb = sampler.peak / 1024 ** 3
+    pages_per_second = total_pages / seconds if seconds else 0.0
+    return {
+        "mode": mode,
+        "jobs": jobs,
+        "pages": total_pages,
+        "seconds": round(seconds, 3),
+        "pages_per_second": round(pages_per_second, 3),
+        "peak_rss_mb": round(sampler.peak / 1024 ** 2, 1),
+        "pages_per_second_per_gb": round(pages_per_second / peak_gb, 3) if peak_gb else None,
+        "errors": errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=4, help="동시에 크롤링할 검색 수 (tabs 모드의 탭 수)")
+    parser.add_argument("--pages", type=int, default=5, help="검색당 페이지 수")
+    parser.add_argument("--delay", type=float, default=0.3, help="mock 서버 응답 지연(초)")
+    parser.add_argument("--total", type=int, default=3000, help="mock 서버 숙소 수")
+    parser.add_argument("--mode", choices=("drivers", "tabs", "both"), default="both")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: stdout)")
+    args = parser.parse_args()
+
+    modes = ("drivers", "tabs") if args.mode == "both" else (args.mode,)
+    results = []
+    with MockSearchServer(total=args.total, delay=args.delay) as server:
+        for mode in modes:
+            results.append(run_mode(server, mode, args.jobs, args.pages))
+            r = results[-1]
+            print(
+                f"{mode}: {r['pages']} pages in {r['seconds']}s, peak RSS {r['peak_rss_mb']}MB, "
+                f"{r['pages_per_second_per_gb']} pages/s/GB",
+                file=sys.stderr,
+            )
+
+    report: dict[str, Any] = {"jobs": args.jobs, "pages": args.pages, "delay": args.delay, "results": results}
+    if len(results) == 2 and results[0]["pages_per_second_per_gb"] and results[1]["pages_per_second_per_gb"]:
+        report["tabs_vs_drivers_per_gb"] = round(
+            results[1]["pages_per_second_per_gb"] / results[0]["pages_per_second_per_gb"], 2
+        )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if any(r["errors"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+검색 분할 벤치마크 — mock 검색 서버(mock_search_server.py)에 대해 분할 계획을 세우고 하위 검색을 병렬로 수집.
+비교: 단일 검색 순차 수집(페이지 한도에서 잘림) vs 분할 검색 병렬 수집.
+지표: 하위 검색 수, probe 횟수, 계획·수집 시간, 커버리지(수집 방 ID / 정답 방 ID), 하위 검색 간 중복 수.
+브라우저 없이 HTTP 로 페이지를 받아 방 ID 만 추출 — 계획기·병합 로직 검증용 (Chrome 불필요).
+분할 결과가 정답을 모두 덮지 못하거나(잘림 제외) 하위 검색이 겹치면 종료 코드 1.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_sharding.py --total 3000 --workers 4 --delay 0.02
+    python benchmarks/bench_sharding.py --strategy bbox --output bench_sharding.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import urljoin
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from mock_search_server import MockSearchServer  # noqa: E402
+from sharding import http_probe, plan_shards  # noqa: E402
+
+_ROOM_RE = re.compile(r'href="/rooms/(\d+)')
+_NEXT_RE = re.compile(r'<a aria-label="다음" href="([^"]+)"')
+
+
+def crawl_ids(url: str, max_pages: int = 20) -> list[str]:
+    """검색 URL 을 다음 링크를 따라 수집해 방 ID 목록 반환."""
+    ids: list[str] = []
+    for _ in range(max_pages):
+        with urllib.request.urlopen(url, timeout=10) as resp:
+            text = resp.read().decode("utf-8")
+        ids.extend(_ROOM_RE.findall(text))
+        m = _NEXT_RE.search(text)
+        if not m:
+            break
+        url = urljoin(url, m.group(1).replace("&amp;", "&"))
+    return ids
+
+
+def run_strategy(server: MockSearchServer, strategy: str, workers: int, saturation: int, max_shards: int) -> dict[str, Any]:
+    search_url = server.search_url(bbox=strategy == "bbox")
+    truth = server.room_ids(search_url)
+
+    start = time.perf_counter()
+    baseline_ids = set(crawl_ids(search_url))
+    baseline_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plan = plan_shards(search_url, http_probe, strategy, saturation=saturation, max_shards=max_shards)
+    plan_seconds = time.perf_counter() - start
+
+    urls = [s["url"] for s in plan["shards"]]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        per_shard = list(pool.map(crawl_ids, urls))
+    crawl_seconds = time.perf_counter() - start
+
+    merged: set[str] = set()
+    duplicates = 0
+    for ids in per_shard:
+        duplicates += len(merged & set(ids))
+        merged.update(ids)
+    # 하위 검색 정답 집합끼리 겹치면 분할 경계 오류
+    shard_truth_total = sum(len(server.room_ids(u)) for u in urls)
+    return {
+        "strategy": plan["strategy"],
+        "total_rooms": len(truth),
+        "single": {
+            "collected": len(baseline_ids),
+            "coverage": round(len(baseline_ids & truth) / len(truth), 4) if truth else 1.0,
+            "seconds": round(baseline_seconds, 3),
+        },
+        "sharded": {
+            "shards": len(urls),
+            "probes": plan["probes"],
+            "truncated": plan["truncated"],
+            "max_shard_count": max((s["count"] or 0 for s in plan["shards"]), default=0),
+            "plan_seconds": round(plan_seconds, 3),
+            "crawl_seconds": round(crawl_seconds, 3),
+            "collected": len(merged),
+            "coverage": round(len(merged & truth) / len(truth), 4) if truth else 1.0,
+            "duplicates_across_shards": duplicates,
+            "overlapping_rooms": shard_truth_total - len(truth),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--total", type=int, default=3000, help="mock 서버 숙소 수")
+    parser.add_argument("--strategy", choices=("price", "bbox", "both"), default="both")
+    parser.add_argument("--workers", type=int, default=4, help="병렬 수집 워커 수")
+    parser.add_argument("--delay", type=float, default=0.02, help="mock 서버 요청당 지연(초)")
+    parser.add_argument("--saturation", type=int, default=270, help="분할 기준 결과 수")
+    parser.add_argument("--max-shards", type=int, default=64)
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: stdout)")
+    args = parser.parse_args()
+
+    strategies = ("price", "bbox") if args.strategy == "both" else (args.strategy,)
+    results = []
+    with MockSearchServer(total=args.total, delay=args.delay) as server:
+        for strategy in strategies:
+            results.append(run_strategy(server, strategy, args.workers, args.saturation, args.max_shards))
+            sharded = results[-1]["sharded"]
+            print(
+                f"{strategy}: shards={sharded['shards']} coverage={sharded['coverage']} "
+                f"(single {results[-1]['single']['coverage']}) crawl={sharded['crawl_seconds']}s",
+                file=sys.stderr,
+            )
+
+    text = json.dumps({"total": args.total, "workers": args.workers, "results": results}, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    problems = []
+    for r in results:
+        s = r["sharded"]
+        if s["overlapping_rooms"]:
+            problems.append(f"{r['strategy']}: shards overlap ({s['overlapping_rooms']} rooms)")
+        if s["coverage"] < 1.0 and not s["truncated"]:
+            problems.append(f"{r['strategy']}: incomplete coverage {s['coverage']}")
+    for p in problems:
+        print(f"FAIL {p}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
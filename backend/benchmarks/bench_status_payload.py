@@ -0,0 +1,120 @@
+"""
+status/json 응답 벤치마크 — 기존(json.dumps, 무압축) vs 최적화(페이지 청크 + 버전 캐시 + 압축).
+요청당 CPU 시간과 전송 bytes 를 비교해 JSON 으로 출력.
+
+실행 (backend 폴더에서):
+    python benchmarks/bench_status_payload.py --pages 20 --per-page 18 --requests 200
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_manager import JobManager  # noqa: E402
+from response_utils import brotli, orjson  # noqa: E402
+
+
+def _make_page(page: int, per_page: int) -> list[dict]:
+    """실제 수집 결과와 비슷한 길이의 한글·URL 필드를 가진 가짜 숙소 목록."""
+    rows = []
+    for i in range(per_page):
+        room_id = 1578661826370529738 + page * 1000 + i
+        rows.append({
+            "no": 0,
+            "title": f"광안리 해변 도보 5분 오션뷰 아파트 {page}-{i} · 넷플릭스 · 무료 주차",
+            "price": f"총액 ₩{(page * 37 + i * 11) % 900 + 100},000, 원래 요금 ₩1,017,031",
+            "address": "부산 수영구 광안동의 아파트 전체",
+            "rating": f"평점 4.{(page + i) % 100:02d}점(5점 만점), 후기 {page * 7 + i}개",
+            "url": (
+                f"https://www.airbnb.co.kr/rooms/{room_id}?search_mode=regular_search&adults=1"
+                "&check_in=2026-03-02&check_out=2026-03-07&children=0&infants=0&pets=0"
+                "&source_impression_id=p3_1770180800_P3tSoZUxoXcI31Ri&previous_page_section_name=1000"
+            ),
+        })
+    return rows
+
+
+def _baseline_payload(job: dict) -> bytes:
+    """변경 전 get_crawl_status_json 과 같은 방식 (요청마다 dict 구성 + json.dumps)."""
+    listings = job.get("listings") or []
+    payload = {
+        "status": job["status"],
+        "current_page": job["current_page"],
+        "max_pages": job.get("max_pages", 0),
+        "total_listings": len(listings),
+        "listings": listings,
+        "progress_percent": job.get("progress_percent", 0),
+        "error_message": job.get("error_message"),
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def _cpu_per_request(fn, n: int) -> float:
+    start = time.process_time()
+    for _ in range(n):
+        fn()
+    return (time.process_time() - start) / n * 1e6
+
+
+def _poll_after_span(job_id: str, encoding: str | None) -> None:
+    JobManager.add_phase_time(job_id, "navigate", 0.01)
+    JobManager.get_status_payload(job_id, encoding)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--per-page", type=int, default=18)
+    parser.add_argument("--requests", type=int, default=200, help="측정 반복 횟수 (폴링 요청 수)")
+    args = parser.parse_args()
+
+    job_id = JobManager.create_job("https://www.airbnb.co.kr/s/부산/homes", args.pages)
+    JobManager.set_running(job_id)
+    all_listings: list[dict] = []
+    for page in range(1, args.pages + 1):
+        rows = _make_page(page, args.per_page)
+        for idx, item in enumerate(rows):
+            item["no"] = len(all_listings) + idx + 1
+        all_listings.extend(rows)
+        JobManager.set_page_result(job_id, page, rows, all_listings)
+    job = JobManager.get_status(job_id)
+
+    baseline = _baseline_payload(job)
+    result = {
+        "listings": len(all_listings),
+        "orjson": orjson is not None,
+        "brotli": brotli is not None,
+        "baseline": {
+            "bytes": len(baseline),
+            "cpu_us_per_request": round(_cpu_per_request(lambda: _baseline_payload(job), args.requests), 1),
+        },
+        "optimized": {},
+    }
+    # 캐시 경로는 gzip 만 지원 (br 은 since 증분 폴링·listings 응답에서 사용)
+    encodings = [None, "gzip"]
+    for encoding in encodings:
+        # 첫 요청(캐시 미스)은 직렬화·압축 비용, 이후 요청은 캐시 재사용 비용
+        job["version"] += 1
+        start = time.process_time()
+        body, _ = JobManager.get_status_payload(job_id, encoding)
+        first_us = (time.process_time() - start) * 1e6
+        result["optimized"][encoding or "identity"] = {
+            "bytes": len(body),
+            "first_request_cpu_us": round(first_us, 1),
+            "cached_cpu_us_per_request": round(
+                _cpu_per_request(lambda: JobManager.get_status_payload(job_id, encoding), args.requests), 1
+            ),
+            # 실행 중처럼 요청 사이에 구간 시간(span)이 기록돼도 캐시가 유지되는지
+            "with_phase_updates_cpu_us_per_request": round(
+                _cpu_per_request(lambda: _poll_after_span(job_id, encoding), args.requests), 1
+            ),
+        }
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+부하 테스트용 가짜 크롤러 — run_crawl 과 같은 시그니처, 브라우저 없이 결정적인 결과를 지연과 함께 생성.
+같은 (search_url, page) 는 항상 같은 숙소 목록을 만든다.
+"""
+
+import hashlib
+import time
+from typing import Callable
+
+
+def fake_page(search_url: str, page: int, listings_per_page: int) -> list[dict]:
+    """search_url·page 로 결정되는 가짜 숙소 목록 (실제 결과와 비슷한 필드 길이)."""
+    seed = int(hashlib.md5(search_url.encode("utf-8")).hexdigest()[:8], 16)
+    rows = []
+    for i in range(listings_per_page):
+        room_id = 10**15 + (seed % 10**6) * 10**4 + page * 100 + i
+        n = (seed + page * 31 + i * 7) % 1000
+        rows.append({
+            "no": 0,
+            "title": f"부하 테스트 숙소 {page}-{i} · 오션뷰 · 무료 주차",
+            "price": f"총액 ₩{n * 1000 + 50000:,}, 원래 요금 ₩{n * 1100 + 60000:,}",
+            "address": f"부산 수영구의 아파트 전체 {n % 17}",
+            "rating": f"평점 4.{n % 100:02d}점(5점 만점), 후기 {n}개",
+            "url": f"https://www.airbnb.co.kr/rooms/{room_id}?adults=1&check_in=2026-03-02&check_out=2026-03-07",
+        })
+    return rows
+
+
+def make_fake_run_crawl(
+    listings_per_page: int = 18,
+    page_delay: float = 0.5,
+    startup_delay: float = 1.0,
+    max_pages_override: int | None = None,
+) -> Callable[..., list[dict]]:
+    """설정값을 고정한 가짜 run_crawl 생성 (startup_delay: 드라이버 기동, page_delay: 페이지당 수집·이동)."""
+
+    def fake_run_crawl(
+        search_url: str,
+        max_pages: int,
+        on_page_result: Callable[[int, list[dict], list[dict]], None] | None = None,
+        should_stop: Callable[[], bool] | None = None,
+        keep_results: bool = True,
+        **_: object,
+    ) -> list[dict]:
+        pages = max_pages_override or max_pages
+        all_listings: list[dict] = []
+        collected = 0
+        time.sleep(startup_delay)
+        for page in range(1, pages + 1):
+            if should_stop and should_stop():
+                break
+            time.sleep(page_delay)
+            page_listings = fake_page(search_url, page, listings_per_page)
+            for idx, item in enumerate(page_listings):
+                item["no"] = collected + idx + 1
+            collected += len(page_listings)
+            if keep_results:
+                all_listings.extend(page_listings)
+            if on_page_result:
+                on_page_result(page, page_listings, all_listings)
+        return all_listings
+
+    return fake_run_crawl
@@ -0,0 +1,42 @@
+"""
+벤치마크용 로컬 HTTP 서버 — 녹화된 검색 결과 HTML(fixtures/)을 127.0.0.1 임의 포트로 제공.
+    with FixtureServer() as server:
+        driver.get(server.url("modern_p1.html"))
+"""
+
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class FixtureServer:
+    """fixtures 디렉터리를 정적 서빙하는 백그라운드 HTTP 서버."""
+
+    def __init__(self, directory: str = FIXTURE_DIR, port: int = 0) -> None:
+        handler = functools.partial(_QuietHandler, directory=directory)
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
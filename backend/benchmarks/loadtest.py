@@ -0,0 +1,338 @@
+"""
+API 부하 테스트 — 가짜 크롤러(fake_crawler.py)로 run_crawl 을 대체한 백엔드를 별도 프로세스로 띄우고
+POST /crawl, /status/json 폴링, SSE /status 구독, /download 를 지정 동시성으로 호출.
+엔드포인트별 p50/p95/p99 지연, 처리량, 서버 프로세스의 스레드 수·RSS 최대값을 JSON 으로 출력.
+결과에 커밋 해시를 기록하므로 --baseline 으로 커밋 간 비교 가능 (p95 가 --max-slowdown 배 초과 시 종료 코드 1).
+
+실행 (backend 폴더에서, Linux):
+    python benchmarks/loadtest.py --jobs 20 --pollers 50 --sse 20 --downloads 10 --pages 5 --output loadtest.json
+    python benchmarks/loadtest.py --baseline loadtest.json
+"""
+
+import argparse
+import gzip
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+
+
+# ----------------------------------------------------------------------
+# 서버 프로세스 (--serve)
+# ----------------------------------------------------------------------
+
+def serve(args: argparse.Namespace) -> None:
+    """가짜 크롤러로 run_crawl 을 바꾼 뒤 uvicorn 실행 (부하 측정 대상 프로세스)."""
+    sys.path.insert(0, BACKEND_DIR)
+    # 가짜 크롤러만 쓰므로 실제 crawler 사전 준비(chromedriver 조회)는 생략
+    os.environ["CRAWLER_WARMUP"] = "0"
+    import uvicorn
+
+    import main
+    from fake_crawler import make_fake_run_crawl
+
+    main.run_crawl = make_fake_run_crawl(
+        listings_per_page=args.listings_per_page,
+        page_delay=args.page_delay,
+        startup_delay=args.startup_delay,
+    )
+    uvicorn.run(main.app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+# ----------------------------------------------------------------------
+# 부하 생성 (클라이언트)
+# ----------------------------------------------------------------------
+
+class Recorder:
+    """엔드포인트별 지연·오류 기록 (스레드 안전)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.bytes: dict[str, int] = defaultdict(int)
+
+    def add(self, endpoint: str, seconds: float, ok: bool, size: int = 0) -> None:
+        with self._lock:
+            self.latencies[endpoint].append(seconds * 1000)
+            self.bytes[endpoint] += size
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+class ProcessSampler:
+    """서버 프로세스 RSS·스레드 수를 주기적으로 읽어 최대값 기록 (/proc, Linux)."""
+
+    def __init__(self, pid: int, interval: float = 0.2) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.max_rss_kib = 0
+        self.max_threads = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _read(self) -> tuple[int, int]:
+        rss = threads = 0
+        with open(f"/proc/{self.pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1])
+                elif line.startswith("Threads:"):
+                    threads = int(line.split()[1])
+        return rss, threads
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                rss, threads = self._read()
+            except OSError:
+                return
+            self.max_rss_kib = max(self.max_rss_kib, rss)
+            self.max_threads = max(self.max_threads, threads)
+
+    def __enter__(self) -> "ProcessSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _request(port: int, method: str, path: str, body: dict | None = None,
+             headers: dict | None = None, timeout: float = 60) -> tuple[int, bytes, dict]:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        hdrs = {"Content-Type": "application/json", **(headers or {})} if payload else dict(headers or {})
+        conn.request(method, path, body=payload, headers=hdrs)
+        resp = conn.getresponse()
+        data = resp.read()
+        return resp.status, data, {k.lower(): v for k, v in resp.getheaders()}
+    finally:
+        conn.close()
+
+
+def _timed(rec: Recorder, endpoint: str, port: int, method: str, path: str, **kwargs: Any) -> tuple[int, bytes, dict]:
+    start = time.perf_counter()
+    try:
+        status, data, headers = _request(port, method, path, **kwargs)
+    except Exception:
+        rec.add(endpoint, time.perf_counter() - start, False)
+        return 0, b"", {}
+    rec.add(endpoint, time.perf_counter() - start, 200 <= status < 300, len(data))
+    return status, data, headers
+
+
+def _poller(rec: Recorder, port: int, job_ids: list[str], done: set, stop: threading.Event, offset: int) -> None:
+    i = offset
+    while not stop.is_set():
+        pending = [j for j in job_ids if j not in done]
+        if not pending:
+            return
+        job_id = pending[i % len(pending)]
+        i += 1
+        status, data, headers = _timed(
+            rec, "GET /status/json", port, "GET", f"/crawl/{job_id}/status/json",
+            headers={"Accept-Encoding": "gzip"},
+        )
+        if status == 200:
+            if headers.get("content-encoding") == "gzip":
+                data = gzip.decompress(data)
+            if json.loads(data).get("status") in ("completed", "failed"):
+                done.add(job_id)
+
+
+def _sse_subscriber(rec: Recorder, port: int, job_id: str) -> None:
+    """SSE 스트림 구독 — 첫 이벤트까지 시간과 스트림 전체 시간을 기록."""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=600)
+    start = time.perf_counter()
+    ok = True
+    try:
+        conn.request("GET", f"/crawl/{job_id}/status")
+        resp = conn.getresponse()
+        first = True
+        while True:
+            line = resp.fp.readline()
+            if not line:
+                break
+            if line.startswith(b"data:") and first:
+                rec.add("SSE first event", time.perf_counter() - start, True)
+                first = False
+    except Exception:
+        ok = False
+    finally:
+        conn.close()
+    rec.add("SSE stream", time.perf_counter() - start, ok)
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+
+    def pct(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))], 2)
+
+    return {"p50": pct(50), "p95": pct(95), "p99": pct(99), "mean": round(statistics.fmean(ordered), 2)}
+
+
+def run_load(args: argparse.Namespace, port: int, server_pid: int) -> dict[str, Any]:
+    rec = Recorder()
+    done: set[str] = set()
+    stop = threading.Event()
+    wall_start = time.perf_counter()
+    with ProcessSampler(server_pid) as sampler:
+        with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+            futures = [
+                pool.submit(
+                    _timed, rec, "POST /crawl", port, "POST", "/crawl",
+                    body={"search_url": f"https://www.airbnb.co.kr/s/loadtest-{i}/homes", "max_pages": args.pages},
+                )
+                for i in range(args.jobs)
+            ]
+            job_ids = [json.loads(f.result()[1])["job_id"] for f in futures if f.result()[0] == 200]
+
+        threads = [
+            threading.Thread(target=_poller, args=(rec, port, job_ids, done, stop, i), daemon=True)
+            for i in range(args.pollers)
+        ]
+        threads += [
+            threading.Thread(target=_sse_subscriber, args=(rec, port, job_ids[i % len(job_ids)]), daemon=True)
+            for i in range(args.sse if job_ids else 0)
+        ]
+        for t in threads:
+            t.start()
+        deadline = time.monotonic() + args.timeout
+        for t in threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+        stop.set()
+
+        with ThreadPoolExecutor(max_workers=max(1, args.downloads)) as pool:
+            for i in range(args.downloads if job_ids else 0):
+                pool.submit(_timed, rec, "GET /download", port, "GET", f"/crawl/{job_ids[i % len(job_ids)]}/download")
+    wall = time.perf_counter() - wall_start
+
+    endpoints = {}
+    for endpoint, values in sorted(rec.latencies.items()):
+        endpoints[endpoint] = {
+            "requests": len(values),
+            "errors": rec.errors.get(endpoint, 0),
+            "throughput_rps": round(len(values) / wall, 2),
+            "bytes": rec.bytes.get(endpoint, 0),
+            "latency_ms": _percentiles(values),
+        }
+    return {
+        "wall_seconds": round(wall, 2),
+        "jobs_completed": len(done),
+        "endpoints": endpoints,
+        "server": {"max_rss_mib": round(sampler.max_rss_kib / 1024, 1), "max_threads": sampler.max_threads},
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def _wait_ready(port: int, proc: subprocess.Popen, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError("서버 프로세스가 종료되었습니다.")
+        try:
+            if _request(port, "GET", "/health", timeout=1)[0] == 200:
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("서버 기동 대기 시간 초과")
+
+
+def compare(result: dict, baseline: dict, max_slowdown: float) -> list[str]:
+    """기준 결과 대비 p95 지연 증가·오류 증가 목록."""
+    problems = []
+    for endpoint, cur in result["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(endpoint)
+        if not base:
+            continue
+        if cur["latency_ms"]["p95"] > base["latency_ms"]["p95"] * max_slowdown:
+            problems.append(f"{endpoint}: p95 {base['latency_ms']['p95']}ms -> {cur['latency_ms']['p95']}ms")
+        if cur["errors"] > base["errors"]:
+            problems.append(f"{endpoint}: errors {base['errors']} -> {cur['errors']}")
+    return problems
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jobs", type=int, default=10, help="동시에 시작할 크롤링 작업 수")
+    parser.add_argument("--pollers", type=int, default=20, help="status/json 폴링 스레드 수")
+    parser.add_argument("--sse", type=int, default=10, help="SSE 구독자 수")
+    parser.add_argument("--downloads", type=int, default=10, help="완료 후 엑셀 다운로드 요청 수")
+    parser.add_argument("--pages", type=int, default=5, help="작업당 페이지 수")
+    parser.add_argument("--listings-per-page", type=int, default=18)
+    parser.add_argument("--page-delay", type=float, default=0.5, help="가짜 크롤러 페이지당 지연(초)")
+    parser.add_argument("--startup-delay", type=float, default=1.0, help="가짜 크롤러 드라이버 기동 지연(초)")
+    parser.add_argument("--timeout", type=float, default=300, help="폴링·SSE 단계 최대 시간(초)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (기본: stdout)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-slowdown", type=float, default=1.25, help="허용 p95 지연 배율")
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    forwarded = [
+        "--serve", "--port", str(args.port),
+        "--listings-per-page", str(args.listings_per_page),
+        "--page-delay", str(args.page_delay),
+        "--startup-delay", str(args.startup_delay),
+    ]
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), *forwarded], cwd=BACKEND_DIR)
+    try:
+        _wait_ready(args.port, proc)
+        load = run_load(args, args.port, proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    result = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": {k: v for k, v in vars(args).items() if k not in ("serve", "output", "baseline")},
+        },
+        **load,
+    }
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            problems = compare(result, json.load(f), args.max_slowdown)
+        for p in problems:
+            print(f"REGRESSION {p}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+검색 분할 검증용 로컬 mock 검색 서버 — 가짜 숙소 데이터(가격·좌표)를 만들고 검색 결과 페이지를 흉내 냄.
+- GET /s/{지역}/homes?price_min=&price_max=&ne_lat=&ne_lng=&sw_lat=&sw_lng=&items_offset=
+- 제목에 결과 수('숙소 N개', 1,000 초과 시 '숙소 1,000개 이상'), 카드 마크업은 fixtures/ 와 같은 형식
+- 실제 사이트처럼 MAX_PAGES 페이지까지만 노출 (그 이후 결과는 잘림)
+    with MockSearchServer(total=3000) as server:
+        plan_shards(server.search_url(), http_probe)
+"""
+
+import html
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit
+
+PAGE_SIZE = 18
+MAX_PAGES = 15
+# 서울 일대 지도 영역
+SEOUL_BBOX = {"ne_lat": 37.70, "ne_lng": 127.18, "sw_lat": 37.43, "sw_lng": 126.80}
+
+
+def make_rooms(total: int, seed: int = 0) -> list[dict]:
+    """가짜 숙소 목록 (방 ID, 1박 가격, 좌표 — 좌표는 소수 6자리)."""
+    rng = random.Random(seed)
+    rooms = []
+    for i in range(total):
+        # 저가 숙소가 많고 고가는 드문 분포
+        price = int(min(2_000_000, 20000 + rng.lognormvariate(11.3, 0.7)) // 1000 * 1000)
+        # 도심에 몰린 좌표
+        lat = rng.triangular(SEOUL_BBOX["sw_lat"], SEOUL_BBOX["ne_lat"], 37.56)
+        lng = rng.triangular(SEOUL_BBOX["sw_lng"], SEOUL_BBOX["ne_lng"], 126.98)
+        rooms.append({
+            "room_id": str(10_000_000 + i),
+            "price": price,
+            "lat": round(lat, 6),
+            "lng": round(lng, 6),
+            "rating": round(rng.uniform(3.5, 5.0), 2),
+            "reviews": rng.randint(0, 500),
+        })
+    return rooms
+
+
+def filter_rooms(rooms: list[dict], query: dict[str, str]) -> list[dict]:
+    """검색 파라미터(가격 범위 양끝 포함, 지도 영역 경계 포함)로 필터."""
+    lo = int(query["price_min"]) if query.get("price_min") else None
+    hi = int(query["price_max"]) if query.get("price_max") else None
+    bbox = None
+    if all(query.get(k) for k in SEOUL_BBOX):
+        bbox = {k: float(query[k]) for k in SEOUL_BBOX}
+    result = []
+    for r in rooms:
+        if lo is not None and r["price"] < lo:
+            continue
+        if hi is not None and r["price"] > hi:
+            continue
+        if bbox and not (bbox["sw_lat"] <= r["lat"] <= bbox["ne_lat"] and bbox["sw_lng"] <= r["lng"] <= bbox["ne_lng"]):
+            continue
+        result.append(r)
+    return result
+
+
+def _render_card(r: dict) -> str:
+    rid = r["room_id"]
+    return (
+        '<div role="group" data-testid="card-container">\n'
+        f'  <a aria-labelledby="title_{rid}" href="/rooms/{rid}?search_mode=regular_search"></a>\n'
+        '  <div>\n'
+        f'    <div id="title_{rid}" data-testid="listing-card-title">숙소 {rid}</div>\n'
+        f'    <div data-testid="listing-card-subtitle"><span data-testid="listing-card-name">서울 ({r["lat"]}, {r["lng"]})</span></div>\n'
+        f'    <div data-testid="price-availability-row"><span aria-label="총액 ₩{r["price"]:,}">₩{r["price"]:,}</span></div>\n'
+        f'    <span class="a8jt5op">평점 {r["rating"]:.2f}점(5점 만점), 후기 {r["reviews"]}개</span>\n'
+        '  </div>\n'
+        '</div>\n'
+    )
+
+
+def render_search_page(path: str, query: dict[str, str], matched: list[dict]) -> str:
+    count = len(matched)
+    heading = "숙소 1,000개 이상" if count > 1000 else f"숙소 {count:,}개"
+    offset = int(query.get("items_offset") or 0)
+    visible = matched[: PAGE_SIZE * MAX_PAGES]
+    page = visible[offset: offset + PAGE_SIZE]
+    cards = "".join(_render_card(r) for r in page)
+    nav = ""
+    if offset + PAGE_SIZE < len(visible):
+        next_query = {**query, "items_offset": str(offset + PAGE_SIZE)}
+        nav = f'<nav><a aria-label="다음" href="{html.escape(path + "?" + urlencode(next_query))}">다음</a></nav>'
+    return (
+        '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>mock search</title></head><body><main>\n'
+        f'<h1 data-testid="stays-page-heading">서울의 {heading}</h1>\n{cards}{nav}\n</main></body></html>'
+    )
+
+
+class MockSearchServer:
+    """가짜 검색 결과를 제공하는 백그라운드 HTTP 서버. delay 는 요청당 응답 지연(초)."""
+
+    def __init__(self, total: int = 3000, seed: int = 0, delay: float = 0.0, port: int = 0) -> None:
+        self.rooms = sorted(make_rooms(total, seed), key=lambda r: r["room_id"])
+        self.delay = delay
+        self.requests = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                with server._lock:
+                    server.requests += 1
+                if server.delay:
+                    time.sleep(server.delay)
+                parts = urlsplit(self.path)
+                if not parts.path.startswith("/s/"):
+                    self.send_error(404)
+                    return
+                query = dict(parse_qsl(parts.query))
+                body = render_search_page(parts.path, query, filter_rooms(server.rooms, query)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def search_url(self, bbox: bool = False) -> str:
+        """전체 검색 URL (bbox=True 면 서울 지도 영역 포함)."""
+        query = {"adults": "2", **({k: str(v) for k, v in SEOUL_BBOX.items()} if bbox else {})}
+        return f"{self.base_url}/s/{quote('서울')}/homes?{urlencode(query)}"
+
+    def room_ids(self, url: str) -> set[str]:
+        """URL 검색 조건에 맞는 전체 방 ID (페이지 한도 없이 — 정답 비교용)."""
+        return {r["room_id"] for r in filter_rooms(self.rooms, dict(parse_qsl(urlsplit(url).query)))}
+
+    def __enter__(self) -> "MockSearchServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
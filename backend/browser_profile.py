@@ -0,0 +1,322 @@
+"""
+Chrome 프로필 템플릿 — 한 번 데워 둔 프로필(HTTP 디스크 캐시·동의 쿠키·로케일)을 드라이버마다 복제해 --user-data-dir 로 사용.
+- 템플릿 생성: 템플릿 폴더로 드라이버를 띄워 BROWSER_PROFILE_WARM_URL(검색 페이지) 방문 → 쿠키 동의 버튼 클릭 → 정상 종료(쿠키·캐시 기록)
+  → 크기가 BROWSER_PROFILE_MAX_MB 를 넘으면 다시 받을 수 있는 캐시 폴더부터 삭제
+- 복제: 파일마다 reflink(FICLONE — btrfs·XFS 등 copy-on-write 파일시스템), 지원하지 않으면 일반 복사. 드라이버 quit() 시 복제본 삭제
+- 갱신: 템플릿이 BROWSER_PROFILE_REFRESH 초보다 오래되면 다음 복제 때 백그라운드에서 새로 만들어 교체 (그동안은 기존 템플릿 사용)
+- 템플릿이 아직 없으면 빈 프로필(기존 동작)로 띄우고 백그라운드에서 생성 시작. 완성된 템플릿은 재시작 후에도 재사용
+BROWSER_PROFILE=1 일 때만 사용 (기본 끔).
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from typing import Any
+from urllib.parse import urlparse
+
+from metrics import Counter, span
+from pacing import RATE_CONTROLLER
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+BROWSER_PROFILE = os.environ.get("BROWSER_PROFILE", "").strip().lower() in ("1", "true", "yes")
+BROWSER_PROFILE_DIR = os.environ.get("BROWSER_PROFILE_DIR") or os.path.join(
+    tempfile.gettempdir(), "airbnb_crawler_browser_profile"
+)
+BROWSER_PROFILE_WARM_URL = os.environ.get("BROWSER_PROFILE_WARM_URL", "https://www.airbnb.co.kr/s/서울/homes")
+BROWSER_PROFILE_REFRESH = float(os.environ.get("BROWSER_PROFILE_REFRESH", str(6 * 3600)))
+BROWSER_PROFILE_MAX_MB = int(os.environ.get("BROWSER_PROFILE_MAX_MB", "300"))
+# 템플릿·복제본 Chrome 의 HTTP 디스크 캐시 상한 (--disk-cache-size)
+DISK_CACHE_BYTES = BROWSER_PROFILE_MAX_MB * 1024 * 1024 // 2
+
+# 완성된 템플릿 표시 파일 (복제하지 않음)
+_READY_MARKER = ".template-ready"
+# 복제하지 않는 항목 — 실행 중 잠금·포트 파일, 크래시 덤프, GPU 셰이더 캐시
+_SKIP_NAMES = frozenset({
+    _READY_MARKER,
+    "SingletonLock",
+    "SingletonSocket",
+    "SingletonCookie",
+    "DevToolsActivePort",
+    "Crashpad",
+    "Crash Reports",
+    "BrowserMetrics",
+    "ShaderCache",
+    "GrShaderCache",
+    "GraphiteDawnCache",
+})
+# 크기 상한을 넘으면 지우는 순서 (다시 받을 수 있는 캐시부터)
+_PRUNE_ORDER = (
+    os.path.join("Default", "Service Worker", "CacheStorage"),
+    os.path.join("Default", "GPUCache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "Cache"),
+)
+# linux/fs.h FICLONE — 두 파일이 같은 블록을 공유 (쓸 때 복사)
+_FICLONE = 0x40049409
+
+# 쿠키·개인정보 동의 배너의 수락 버튼 클릭 (배너가 없으면 false)
+_CONSENT_SCRIPT = """
+const roots = document.querySelectorAll(
+  '[data-testid*="cookie"], [aria-label*="쿠키"], [aria-label*="cookie" i], [aria-label*="privacy" i], [role="dialog"]'
+);
+const label = /^(모두 수락|수락|동의|동의합니다|확인|accept all|accept|ok|got it)$/i;
+for (const root of roots) {
+  for (const button of root.querySelectorAll('button')) {
+    if (label.test((button.innerText || '').trim())) { button.click(); return true; }
+  }
+}
+return false;
+"""
+
+PROFILE_CLONES_TOTAL = Counter(
+    "crawl_browser_profile_clones_total", "드라이버 프로필 (warm: 템플릿 복제, cold: 빈 프로필)", ("kind",)
+)
+PROFILE_BUILDS_TOTAL = Counter("crawl_browser_profile_builds_total", "프로필 템플릿 생성 수", ("result",))
+
+_reflink: bool | None = None
+
+
+def _clone_file(src: str, dst: str) -> str:
+    """reflink 복제, 파일시스템이 지원하지 않으면 (한 번 실패한 뒤로는) 일반 복사."""
+    global _reflink
+    if fcntl is not None and _reflink is not False:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            _reflink = True
+            return dst
+        except OSError:
+            _reflink = False
+    return shutil.copy2(src, dst)
+
+
+def _ignore(_dir: str, names: list[str]) -> set[str]:
+    return {n for n in names if n in _SKIP_NAMES}
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # Windows 에서 os.kill(pid, 0) 은 프로세스를 종료시킴 — 정리하지 않음
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def release(path: str) -> None:
+    """복제본 삭제."""
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def remove_on_quit(driver: Any, path: str) -> None:
+    """driver.quit() 뒤 복제본 삭제 — 드라이버를 종료하는 모든 경로(run_crawl·탭 풀·상세 수집 등)에 적용되도록 인스턴스 메서드 교체."""
+    quit_driver = driver.quit
+
+    def quit_and_release() -> None:
+        try:
+            quit_driver()
+        finally:
+            release(path)
+
+    driver.quit = quit_and_release
+
+
+class _Template:
+    def __init__(self, path: str, created: float) -> None:
+        self.path = path
+        self.created = created
+        # 복제 중인 수 — 교체된(retired) 템플릿은 0 이 되면 삭제
+        self.users = 0
+        self.retired = False
+
+
+class ProfileManager:
+    """프로필 템플릿 생성·갱신·복제 (프로세스 전역, 스레드 안전)."""
+
+    def __init__(
+        self,
+        root: str = BROWSER_PROFILE_DIR,
+        warm_url: str = BROWSER_PROFILE_WARM_URL,
+        refresh: float = BROWSER_PROFILE_REFRESH,
+        max_bytes: int = BROWSER_PROFILE_MAX_MB * 1024 * 1024,
+        enabled: bool = BROWSER_PROFILE,
+    ) -> None:
+        self.root = root
+        self.warm_url = warm_url
+        self.refresh = refresh
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._template: _Template | None = None
+        self._building = False
+        self._loaded = False
+
+    def _load_existing(self) -> None:
+        """이전 실행에서 만든 최신 템플릿 재사용, 나머지 템플릿과 종료된 프로세스의 복제본 삭제 (lock 안에서 호출)."""
+        self._loaded = True
+        os.makedirs(self.root, exist_ok=True)
+        templates = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if name.startswith("template-"):
+                marker = os.path.join(path, _READY_MARKER)
+                if os.path.isfile(marker):
+                    templates.append((os.path.getmtime(marker), path))
+                else:
+                    release(path)
+            elif name.startswith("clone-"):
+                pid = name.split("-")[1]
+                if pid.isdigit() and not _pid_alive(int(pid)):
+                    release(path)
+        templates.sort()
+        for _created, path in templates[:-1]:
+            release(path)
+        if templates:
+            created, path = templates[-1]
+            self._template = _Template(path, created)
+            logger.info("기존 프로필 템플릿 사용: %s", path)
+
+    def _stale(self) -> bool:
+        return self._template is None or time.time() - self._template.created > self.refresh
+
+    def clone(self) -> str | None:
+        """템플릿 복제본 경로 (드라이버 --user-data-dir 용). 템플릿이 없거나 꺼져 있으면 None — 필요하면 백그라운드 생성 시작."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            if not self._loaded:
+                self._load_existing()
+            if self._stale() and not self._building:
+                self._building = True
+                threading.Thread(target=self._build, name="profile-build", daemon=True).start()
+            template = self._template
+            if template is None:
+                PROFILE_CLONES_TOTAL.inc(kind="cold")
+                return None
+            template.users += 1
+        dest = os.path.join(self.root, f"clone-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        try:
+            with span("profile_clone"):
+                shutil.copytree(template.path, dest, symlinks=True, ignore=_ignore, copy_function=_clone_file)
+        except OSError as e:
+            logger.warning("프로필 복제 실패, 빈 프로필 사용: %s", e)
+            release(dest)
+            PROFILE_CLONES_TOTAL.inc(kind="cold")
+            return None
+        finally:
+            self._unuse(template)
+        PROFILE_CLONES_TOTAL.inc(kind="warm")
+        return dest
+
+    def _unuse(self, template: _Template) -> None:
+        with self._lock:
+            template.users -= 1
+            remove = template.retired and template.users == 0
+        if remove:
+            release(template.path)
+
+    def ensure(self) -> bool:
+        """템플릿이 없거나 오래됐으면 지금 생성 (기동 시 사전 준비용). 다른 스레드가 생성 중이면 건너뜀."""
+        if not self.enabled:
+            return False
+        with self._lock:
+            if not self._loaded:
+                self._load_existing()
+            if not self._stale() or self._building:
+                return False
+            self._building = True
+        return self._build()
+
+    def _build(self) -> bool:
+        path = os.path.join(self.root, f"template-{int(time.time() * 1000)}")
+        try:
+            with span("profile_build"):
+                self._warm(path)
+                self._prune(path)
+                open(os.path.join(path, _READY_MARKER), "w").close()
+        except Exception as e:
+            logger.warning("프로필 템플릿 생성 실패: %s", e)
+            release(path)
+            PROFILE_BUILDS_TOTAL.inc(result="error")
+            with self._lock:
+                self._building = False
+            return False
+        PROFILE_BUILDS_TOTAL.inc(result="ok")
+        with self._lock:
+            old, self._template = self._template, _Template(path, time.time())
+            self._building = False
+            remove_old = old is not None and old.users == 0
+            if old is not None:
+                old.retired = True
+        if remove_old:
+            release(old.path)
+        logger.info("프로필 템플릿 생성: %s (%.1fMB)", path, _dir_size(path) / 1024 ** 2)
+        return True
+
+    def _warm(self, path: str) -> None:
+        """템플릿 폴더로 드라이버를 띄워 검색 페이지 방문·동의 처리 후 정상 종료 (쿠키·캐시를 디스크에 기록)."""
+        import crawler
+        host = urlparse(self.warm_url).hostname or ""
+        driver = crawler.create_driver(user_data_dir=path)
+        try:
+            RATE_CONTROLLER.acquire(host)
+            driver.get(self.warm_url)
+            crawler._wait_for_listings(driver)
+            if driver.execute_script(_CONSENT_SCRIPT):
+                logger.info("프로필 템플릿: 쿠키 동의 적용")
+                # 동의 후 다시 읽어 동의 상태로 렌더링되는 리소스까지 캐시
+                RATE_CONTROLLER.acquire(host)
+                driver.refresh()
+                crawler._wait_for_listings(driver)
+        finally:
+            driver.quit()
+
+    def _prune(self, path: str) -> None:
+        size = _dir_size(path)
+        for relative in _PRUNE_ORDER:
+            if size <= self.max_bytes:
+                break
+            shutil.rmtree(os.path.join(path, relative), ignore_errors=True)
+            size = _dir_size(path)
+        if size > self.max_bytes:
+            raise RuntimeError(f"프로필 템플릿이 상한보다 큼: {size / 1024 ** 2:.1f}MB")
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            template = self._template
+            return {
+                "enabled": self.enabled,
+                "template": template.path if template else None,
+                "age_seconds": round(time.time() - template.created, 1) if template else None,
+                "building": self._building,
+                "reflink": _reflink,
+            }
+
+
+PROFILES = ProfileManager()
@@ -0,0 +1,603 @@
+"""
+Chrome DevTools Protocol(CDP) 직접 연결 엔진 — chromedriver 를 거치지 않고 websocket 으로 Chrome 과 통신.
+- 브라우저: Chrome 을 --remote-debugging-port=0 으로 직접 실행하고 프로필 폴더의 DevToolsActivePort 로 접속
+- 연결: 브라우저당 websocket 하나, 탭(target)마다 flatten 세션. 모든 브라우저·탭의 명령·이벤트를 전용 스레드의 asyncio 이벤트 루프 하나가 처리
+- CDPTab: run_crawl 등 기존 코드가 WebDriver 처럼 쓰는 동기 프록시 (get·refresh·current_url·execute_script·find_element(s)·
+  execute_cdp_cmd·get_log("performance")·quit). 명령마다 chromedriver HTTP 왕복 + chromedriver→Chrome 중계 대신 websocket 왕복 한 번.
+- 탭 배치는 multitab 과 같음: 브라우저당 TABS_PER_DRIVER 개 탭, 탭마다 별도 브라우저 컨텍스트(쿠키·저장소 분리), 마지막 탭이 반납되면 브라우저 종료.
+  BROWSER_PROFILE=1 로 데운 프로필 복제본에서 띄운 브라우저는 캐시·동의 쿠키를 쓰도록 탭을 기본 컨텍스트에 엶.
+CRAWL_ENGINE=cdp 또는 run_crawl(engine="cdp") 로 사용. websockets 패키지 필요.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Coroutine
+
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    JavascriptException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+import browser_profile
+from metrics import DRIVER_STARTUPS_TOTAL, Gauge, span
+from scheduler import TABS_PER_DRIVER
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+logger = logging.getLogger(__name__)
+
+# CDP 명령 응답 최대 대기(초)
+CDP_COMMAND_TIMEOUT = float(os.environ.get("CDP_COMMAND_TIMEOUT", "30"))
+# Chrome 실행 후 DevTools 포트가 열릴 때까지 최대 대기(초)
+CDP_LAUNCH_TIMEOUT = 20
+# 탐색(get·refresh) 후 DOMContentLoaded 까지 최대 대기(초) — 숙소 카드 대기는 _wait_for_listings 가 담당
+CDP_NAVIGATE_TIMEOUT = 30
+# 탐색 중이라 실행 컨텍스트가 없을 때 evaluate 재시도 횟수·간격
+_CONTEXT_RETRIES = 20
+_CONTEXT_RETRY_DELAY = 0.05
+
+_CHROME_CANDIDATES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+_CONTEXT_ERRORS = (
+    "Execution context was destroyed",
+    "Cannot find default execution context",
+    "Cannot find context with specified id",
+)
+_STALE_ERRORS = ("Could not find object with given id", "Cannot find context with specified id")
+_STALE_MARKER = "__stale__"
+
+CDP_BROWSERS = Gauge("crawl_cdp_browsers", "CDP 엔진 Chrome 브라우저 수")
+CDP_TABS = Gauge("crawl_cdp_tabs", "CDP 엔진에서 사용 중인 탭 수")
+
+# 요소 검색 (this: document 또는 요소). by 는 'css selector' / 'xpath' — 나머지 로케이터는 Python 에서 CSS 로 변환
+_FIND_FUNCTION = """
+function (by, value, first) {
+  if (this !== document && !this.isConnected) throw new Error('__stale__');
+  let found;
+  if (by === 'xpath') {
+    const snap = document.evaluate(value, this, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    found = [];
+    for (let i = 0; i < snap.snapshotLength; i++) found.push(snap.snapshotItem(i));
+  } else {
+    found = first ? [this.querySelector(value)] : Array.from(this.querySelectorAll(value));
+  }
+  found = found.filter((n) => n && n.nodeType === 1);
+  return first ? (found[0] || null) : found;
+}
+"""
+
+
+def _element_function(body: str) -> str:
+    return "function (arg) { if (!this.isConnected) throw new Error('__stale__'); " + body + " }"
+
+
+_ELEMENT_TEXT = _element_function("return this.innerText || '';")
+_ELEMENT_TAG = _element_function("return this.tagName.toLowerCase();")
+_ELEMENT_ENABLED = _element_function("return !this.disabled;")
+_ELEMENT_DISPLAYED = _element_function(
+    "const s = getComputedStyle(this);"
+    "return s.visibility !== 'hidden' && s.display !== 'none' && this.getClientRects().length > 0;"
+)
+# WebDriver get_attribute 와 같이 프로퍼티 우선 (href 는 절대 URL), 불리언은 'true'/None
+_ELEMENT_ATTRIBUTE = _element_function(
+    "const p = this[arg];"
+    "if (typeof p === 'boolean') return p ? 'true' : null;"
+    "if (p != null && typeof p !== 'object' && typeof p !== 'function') return String(p);"
+    "return this.getAttribute(arg);"
+)
+_ELEMENT_CLICK_POINT = _element_function(
+    "this.scrollIntoView({block: 'center', inline: 'center'});"
+    "const r = this.getBoundingClientRect();"
+    "return r.width && r.height ? [r.left + r.width / 2, r.top + r.height / 2] : null;"
+)
+
+# By 로케이터 → CSS (selenium 원격 드라이버와 같은 변환)
+_LOCATOR_CSS: dict[str, Callable[[str], str]] = {
+    By.ID: lambda v: f'[id="{v}"]',
+    By.NAME: lambda v: f'[name="{v}"]',
+    By.CLASS_NAME: lambda v: f".{v}",
+    By.TAG_NAME: lambda v: v,
+    By.CSS_SELECTOR: lambda v: v,
+}
+
+
+class CDPError(WebDriverException):
+    """CDP 명령 오류 응답 또는 연결 종료."""
+
+
+def _find_chrome() -> str:
+    import crawler
+    path = crawler.CHROME_BINARY or next(filter(None, (shutil.which(name) for name in _CHROME_CANDIDATES)), None)
+    if not path:
+        raise RuntimeError("CDP 엔진: Chrome 실행 파일을 찾을 수 없습니다 (CHROME_BINARY 지정 또는 PATH 에 추가).")
+    return path
+
+
+def _unwrap(result: dict, by_value: bool) -> Any:
+    """Runtime.evaluate/callFunctionOn 결과 → 값(by_value) 또는 RemoteObject. 스크립트 예외는 JavascriptException."""
+    details = result.get("exceptionDetails")
+    if details:
+        message = (details.get("exception") or {}).get("description") or details.get("text") or "script error"
+        if _STALE_MARKER in message:
+            raise StaleElementReferenceException("element is not attached to the page document")
+        raise JavascriptException(message)
+    remote = result.get("result") or {}
+    return remote.get("value") if by_value else remote
+
+
+class _Connection:
+    """브라우저 websocket 하나 — 명령은 id 로 응답과 짝짓고, 이벤트는 세션별 핸들러로 전달. 이벤트 루프 스레드에서만 사용."""
+
+    def __init__(self, ws: Any) -> None:
+        self._ws = ws
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._handlers: dict[str, Callable[[str, dict], None]] = {}
+        self.closed = False
+        self._reader = asyncio.get_running_loop().create_task(self._read())
+
+    @classmethod
+    async def open(cls, url: str) -> "_Connection":
+        ws = await websockets.connect(url, max_size=None, ping_interval=None)
+        return cls(ws)
+
+    async def send(self, method: str, params: dict | None = None, session_id: str | None = None) -> dict:
+        if self.closed:
+            raise CDPError("CDP connection closed")
+        msg_id = next(self._ids)
+        message: dict[str, Any] = {"id": msg_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        try:
+            await self._ws.send(json.dumps(message))
+            return await asyncio.wait_for(future, CDP_COMMAND_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise CDPError(f"{method}: no response in {CDP_COMMAND_TIMEOUT}s") from None
+        finally:
+            self._pending.pop(msg_id, None)
+
+    def on_events(self, session_id: str, handler: Callable[[str, dict], None] | None) -> None:
+        if handler is None:
+            self._handlers.pop(session_id, None)
+        else:
+            self._handlers[session_id] = handler
+
+    async def _read(self) -> None:
+        try:
+            async for raw in self._ws:
+                message = json.loads(raw)
+                msg_id = message.get("id")
+                if msg_id is None:
+                    handler = self._handlers.get(message.get("sessionId"))
+                    if handler is not None:
+                        handler(message.get("method", ""), message.get("params") or {})
+                    continue
+                future = self._pending.get(msg_id)
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(CDPError(message["error"].get("message", "CDP error")))
+                else:
+                    future.set_result(message.get("result") or {})
+        except Exception as e:
+            logger.debug("CDP 연결 종료: %s", e)
+        finally:
+            self.closed = True
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CDPError("CDP connection closed"))
+
+    async def close(self) -> None:
+        await self._ws.close()
+        await self._reader
+
+
+class _Browser:
+    """CDP 엔진 브라우저 하나: Chrome 프로세스, 프로필 폴더(템플릿 복제본 또는 빈 임시 폴더), websocket 연결. 탭 수는 CDPEngine lock 으로 보호."""
+
+    def __init__(self) -> None:
+        self.process: subprocess.Popen | None = None
+        self.profile_dir: str | None = None
+        # 데운 프로필 복제본 사용 여부 — 탭을 기본 컨텍스트에 열어 캐시·쿠키 공유
+        self.warm = False
+        self.conn: _Connection | None = None
+        self.ready = threading.Event()
+        self.broken = False
+        # 빌려준 탭 수 (생성 중 예약 포함)
+        self.tabs = 0
+
+    def start(self, engine: "CDPEngine") -> None:
+        import crawler
+        try:
+            with span("driver_start"):
+                self.profile_dir = browser_profile.PROFILES.clone()
+                self.warm = self.profile_dir is not None
+                if not self.warm:
+                    self.profile_dir = tempfile.mkdtemp(prefix="cdp-chrome-")
+                profile_args = [f"--disk-cache-size={browser_profile.DISK_CACHE_BYTES}"] if self.warm else []
+                self.process = subprocess.Popen(
+                    [
+                        _find_chrome(),
+                        "--headless=new",
+                        "--no-sandbox",
+                        "--disable-dev-shm-usage",
+                        "--disable-gpu",
+                        "--window-size=1920,1080",
+                        "--lang=ko-KR",
+                        f"--user-agent={crawler.CHROME_USER_AGENT}",
+                        "--disable-blink-features=AutomationControlled",
+                        "--no-first-run",
+                        "--no-default-browser-check",
+                        "--remote-debugging-port=0",
+                        f"--user-data-dir={self.profile_dir}",
+                        *profile_args,
+                        "about:blank",
+                    ],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+                self.conn = engine.call(_Connection.open(self._devtools_url()))
+            DRIVER_STARTUPS_TOTAL.inc()
+        except Exception:
+            self.broken = True
+            self.quit(engine)
+            raise
+        finally:
+            self.ready.set()
+
+    def _devtools_url(self) -> str:
+        """Chrome 이 프로필 폴더에 쓰는 DevToolsActivePort(포트, 브라우저 경로)로 websocket 주소 구성."""
+        port_file = os.path.join(self.profile_dir, "DevToolsActivePort")
+        deadline = time.monotonic() + CDP_LAUNCH_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Chrome 이 종료됨 (exit {self.process.returncode})")
+            try:
+                with open(port_file, encoding="utf-8") as f:
+                    lines = f.read().split()
+                if len(lines) >= 2:
+                    return f"ws://127.0.0.1:{lines[0]}{lines[1]}"
+            except OSError:
+                pass
+            time.sleep(0.05)
+        raise RuntimeError(f"Chrome DevTools 포트 대기 시간 초과 ({CDP_LAUNCH_TIMEOUT}s)")
+
+    def quit(self, engine: "CDPEngine") -> None:
+        if self.conn is not None:
+            try:
+                engine.call(self.conn.send("Browser.close"))
+            except Exception:
+                pass
+            try:
+                engine.call(self.conn.close())
+            except Exception:
+                pass
+        if self.process is not None:
+            try:
+                self.process.wait(5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+
+class CDPTab:
+    """
+    CDP 엔진 탭 하나 — run_crawl 등 기존 코드가 WebDriver 처럼 사용 (호출 스레드에서 이벤트 루프로 명령을 넘기고 결과 대기).
+    performance 로그 대신 세션의 Network.responseReceived 이벤트를 같은 형식으로 모아 get_log("performance") 로 전달.
+    """
+
+    def __init__(
+        self, engine: "CDPEngine", browser: _Browser, context_id: str | None, target_id: str, session_id: str
+    ) -> None:
+        self._engine = engine
+        self._browser = browser
+        self._context_id = context_id
+        self._target_id = target_id
+        self._session_id = session_id
+        self._network: deque = deque()
+        self._load_waiter: asyncio.Future | None = None
+
+    def _on_event(self, method: str, params: dict) -> None:
+        # 이벤트 루프 스레드에서 호출
+        if method == "Page.domContentEventFired":
+            if self._load_waiter is not None and not self._load_waiter.done():
+                self._load_waiter.set_result(None)
+        elif method == "Network.responseReceived":
+            response = params.get("response") or {}
+            message = {
+                "method": method,
+                "params": {"type": params.get("type"), "response": {"status": response.get("status"), "url": response.get("url")}},
+            }
+            self._network.append({"message": json.dumps({"message": message, "webview": self._target_id})})
+
+    async def _send(self, method: str, params: dict | None = None) -> dict:
+        return await self._browser.conn.send(method, params, self._session_id)
+
+    async def _navigate(self, method: str, params: dict) -> None:
+        self._load_waiter = asyncio.get_running_loop().create_future()
+        try:
+            result = await self._send(method, params)
+            if result.get("errorText"):
+                raise WebDriverException(f"navigation failed: {result['errorText']}")
+            # 같은 문서 안 이동(해시 변경)은 loaderId 가 없고 DOMContentLoaded 도 없음
+            if method == "Page.navigate" and not result.get("loaderId"):
+                return
+            try:
+                await asyncio.wait_for(self._load_waiter, CDP_NAVIGATE_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.debug("DOMContentLoaded 대기 시간 초과: %s", params)
+        finally:
+            self._load_waiter = None
+
+    async def _evaluate(self, expression: str, by_value: bool = True) -> Any:
+        """Runtime.evaluate — 탐색 중이라 실행 컨텍스트가 없으면 잠시 후 재시도."""
+        params = {"expression": expression, "returnByValue": by_value, "awaitPromise": True}
+        for attempt in range(_CONTEXT_RETRIES):
+            try:
+                return _unwrap(await self._send("Runtime.evaluate", params), by_value)
+            except (CDPError, JavascriptException) as e:
+                if attempt + 1 == _CONTEXT_RETRIES or not any(m in str(e) for m in _CONTEXT_ERRORS):
+                    raise
+            await asyncio.sleep(_CONTEXT_RETRY_DELAY)
+
+    async def _call_on(self, object_id: str, function: str, args: tuple, by_value: bool = True) -> Any:
+        params = {
+            "objectId": object_id,
+            "functionDeclaration": function,
+            "arguments": [{"value": a} for a in args],
+            "returnByValue": by_value,
+            "awaitPromise": True,
+        }
+        try:
+            result = await self._send("Runtime.callFunctionOn", params)
+        except CDPError as e:
+            if any(m in str(e) for m in _STALE_ERRORS):
+                raise StaleElementReferenceException("element is not attached to the page document") from None
+            raise
+        return _unwrap(result, by_value)
+
+    async def _find(self, object_id: str | None, by: str, value: str, first: bool) -> Any:
+        if by == By.XPATH:
+            args: tuple = ("xpath", value, first)
+        elif by in _LOCATOR_CSS:
+            args = ("css selector", _LOCATOR_CSS[by](value), first)
+        else:
+            raise WebDriverException(f"CDP 엔진이 지원하지 않는 로케이터: {by}")
+        if object_id is None:
+            remote = await self._evaluate(f"({_FIND_FUNCTION}).apply(document, {json.dumps(list(args))})", by_value=False)
+        else:
+            remote = await self._call_on(object_id, _FIND_FUNCTION, args, by_value=False)
+        if first:
+            if remote.get("subtype") == "null" or "objectId" not in remote:
+                raise NoSuchElementException(f"no such element: {by}={value}")
+            return _CDPElement(self, remote["objectId"])
+        props = await self._send("Runtime.getProperties", {"objectId": remote["objectId"], "ownProperties": True})
+        items = [p for p in props.get("result", []) if p.get("name", "").isdigit() and "objectId" in (p.get("value") or {})]
+        items.sort(key=lambda p: int(p["name"]))
+        return [_CDPElement(self, p["value"]["objectId"]) for p in items]
+
+    async def _click_at(self, x: float, y: float) -> None:
+        for event in ("mouseMoved", "mousePressed", "mouseReleased"):
+            await self._send(
+                "Input.dispatchMouseEvent",
+                {"type": event, "x": x, "y": y, "button": "left", "clickCount": 0 if event == "mouseMoved" else 1},
+            )
+
+    # --- WebDriver 호환 (동기) ---
+
+    def get(self, url: str) -> None:
+        self._engine.call(self._navigate("Page.navigate", {"url": url}))
+
+    def refresh(self) -> None:
+        self._engine.call(self._navigate("Page.reload", {}))
+
+    @property
+    def current_url(self) -> str:
+        return self.execute_script("return location.href")
+
+    @property
+    def page_source(self) -> str:
+        return self.execute_script("return document.documentElement ? document.documentElement.outerHTML : ''")
+
+    def execute_script(self, script: str, *args: Any) -> Any:
+        """WebDriver execute_script 와 같이 함수 본문으로 실행 (인자는 JSON 값만)."""
+        return self._engine.call(self._evaluate(f"(function () {{{script}\n}}).apply(null, {json.dumps(list(args))})"))
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: dict) -> dict:
+        return self._engine.call(self._send(cmd, cmd_args))
+
+    def find_element(self, by: str = By.ID, value: str | None = None) -> "_CDPElement":
+        return self._engine.call(self._find(None, by, value, True))
+
+    def find_elements(self, by: str = By.ID, value: str | None = None) -> list["_CDPElement"]:
+        return self._engine.call(self._find(None, by, value, False))
+
+    def implicitly_wait(self, seconds: float) -> None:
+        # 요소 검색은 대기 없이 즉시 결과 반환 — 대기는 WebDriverWait·_wait_for_listings 가 담당
+        pass
+
+    def get_log(self, log_type: str) -> list[dict]:
+        if log_type != "performance":
+            return []
+        # deque popleft 는 스레드 안전 — 이벤트 루프 스레드가 동시에 추가해도 유실 없음
+        entries = []
+        while self._network:
+            entries.append(self._network.popleft())
+        return entries
+
+    def quit(self) -> None:
+        self._engine.release(self)
+
+
+class _CDPElement:
+    """CDPTab 에서 찾은 요소 (Runtime 원격 객체). 문서에서 떨어졌거나 문서가 바뀌면 StaleElementReferenceException."""
+
+    def __init__(self, tab: CDPTab, object_id: str) -> None:
+        self._tab = tab
+        self._object_id = object_id
+
+    def _call(self, function: str, *args: Any) -> Any:
+        return self._tab._engine.call(self._tab._call_on(self._object_id, function, args))
+
+    @property
+    def text(self) -> str:
+        return self._call(_ELEMENT_TEXT)
+
+    @property
+    def tag_name(self) -> str:
+        return self._call(_ELEMENT_TAG)
+
+    def get_attribute(self, name: str) -> str | None:
+        return self._call(_ELEMENT_ATTRIBUTE, name)
+
+    def is_enabled(self) -> bool:
+        return self._call(_ELEMENT_ENABLED)
+
+    def is_displayed(self) -> bool:
+        return self._call(_ELEMENT_DISPLAYED)
+
+    def click(self) -> None:
+        point = self._call(_ELEMENT_CLICK_POINT)
+        if not point:
+            raise ElementNotInteractableException("element has no size and location")
+        self._tab._engine.call(self._tab._click_at(*point))
+
+    def find_element(self, by: str = By.ID, value: str | None = None) -> "_CDPElement":
+        return self._tab._engine.call(self._tab._find(self._object_id, by, value, True))
+
+    def find_elements(self, by: str = By.ID, value: str | None = None) -> list["_CDPElement"]:
+        return self._tab._engine.call(self._tab._find(self._object_id, by, value, False))
+
+
+class CDPEngine:
+    """
+    프로세스 전역 CDP 엔진. 빈 탭 자리가 있는 브라우저에서 탭을 열고, 없으면 Chrome 을 새로 실행 (multitab.TabPool 과 같은 배치).
+    websocket 입출력은 전용 스레드의 이벤트 루프 하나에서 처리 — 작업 스레드는 call() 로 코루틴을 넘기고 결과를 기다림.
+    """
+
+    def __init__(self, tabs_per_browser: int = TABS_PER_DRIVER) -> None:
+        self.tabs_per_browser = max(1, tabs_per_browser)
+        self._lock = threading.Lock()
+        self._browsers: list[_Browser] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="cdp-loop", daemon=True).start()
+            return self._loop
+
+    def call(self, coro: Coroutine) -> Any:
+        """이벤트 루프 스레드에서 coro 실행 후 결과 반환 (작업 스레드에서만 호출)."""
+        return asyncio.run_coroutine_threadsafe(coro, self._event_loop()).result()
+
+    def acquire(self) -> CDPTab:
+        if websockets is None:
+            raise RuntimeError("CRAWL_ENGINE=cdp 에는 websockets 패키지가 필요합니다 (pip install websockets).")
+        with self._lock:
+            browser = next(
+                (b for b in self._browsers if not b.broken and b.tabs < self.tabs_per_browser), None
+            )
+            create = browser is None
+            if create:
+                browser = _Browser()
+                self._browsers.append(browser)
+            browser.tabs += 1
+            self._update_gauges()
+        try:
+            if create:
+                browser.start(self)
+            else:
+                browser.ready.wait()
+                if browser.broken:
+                    raise RuntimeError("shared browser failed to start")
+            tab = self.call(self._open_tab(browser))
+        except Exception:
+            self._release_slot(browser)
+            raise
+        import crawler
+        crawler._apply_stealth_cdp(tab)
+        crawler._install_extractor(tab)
+        return tab
+
+    async def _open_tab(self, browser: _Browser) -> CDPTab:
+        """
+        새 브라우저 컨텍스트(데운 프로필이면 기본 컨텍스트)에 탭을 열고 세션 연결.
+        Page·Network 이벤트 활성화 — Runtime.enable 은 감지 신호라 쓰지 않음.
+        """
+        import crawler
+        conn = browser.conn
+        target: dict[str, Any] = {"url": "about:blank"}
+        context_id = None
+        if not browser.warm:
+            context_id = (await conn.send("Target.createBrowserContext", {"disposeOnDetach": True}))["browserContextId"]
+            target["browserContextId"] = context_id
+        target_id = (await conn.send("Target.createTarget", target))["targetId"]
+        session_id = (await conn.send("Target.attachToTarget", {"targetId": target_id, "flatten": True}))["sessionId"]
+        tab = CDPTab(self, browser, context_id, target_id, session_id)
+        conn.on_events(session_id, tab._on_event)
+        await tab._send("Page.enable")
+        if crawler.PACING_NETWORK_LOG:
+            await tab._send("Network.enable")
+        return tab
+
+    async def _close_tab(self, tab: CDPTab) -> None:
+        conn = tab._browser.conn
+        conn.on_events(tab._session_id, None)
+        if tab._context_id is None:
+            await conn.send("Target.closeTarget", {"targetId": tab._target_id})
+        else:
+            # 컨텍스트를 지우면 그 안의 탭도 닫힘
+            await conn.send("Target.disposeBrowserContext", {"browserContextId": tab._context_id})
+
+    def release(self, tab: CDPTab) -> None:
+        browser = tab._browser
+        try:
+            self.call(self._close_tab(tab))
+        except Exception as e:
+            logger.warning("CDP 탭 닫기 실패, 브라우저 재사용 중단: %s", e)
+            browser.broken = True
+        self._release_slot(browser)
+
+    def _release_slot(self, browser: _Browser) -> None:
+        """탭 자리 반납. 마지막 탭이면 브라우저를 풀에서 빼고 종료."""
+        with self._lock:
+            browser.tabs -= 1
+            last = browser.tabs == 0
+            if last:
+                self._browsers.remove(browser)
+            self._update_gauges()
+        if last:
+            browser.quit(self)
+            logger.info("CDP 엔진 브라우저 종료")
+
+    def _update_gauges(self) -> None:
+        CDP_BROWSERS.set(len(self._browsers))
+        CDP_TABS.set(sum(b.tabs for b in self._browsers))
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {"browsers": len(self._browsers), "tabs": sum(b.tabs for b in self._browsers)}
+
+
+CDP_ENGINE = CDPEngine()
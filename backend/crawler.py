@@ -1,15 +1,20 @@
 """
 에어비앤비 숙소 목록 크롤러
 FastAPI 백엔드용 — headless Chrome 전용, 페이지 단위 수집 및 다음 페이지 이동.
-봇 감지 우회: CDP로 navigator.webdriver 숨김, 랜덤 지연, (선택) undetected-chromedriver.
+봇 감지 우회: CDP로 navigator.webdriver 숨김, 호스트별 적응형 속도 제어(pacing), (선택) undetected-chromedriver.
+브라우저 엔진: selenium(chromedriver 경유, 기본) 또는 cdp(cdp_engine — websocket 으로 Chrome DevTools Protocol 직접 사용).
 """
 
+import json
 import logging
 import os
 import random
 import re
+import shutil
+import threading
 import time
 from typing import Any, Callable
+from urllib.parse import urlparse
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -20,6 +25,21 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from webdriver_manager.chrome import ChromeDriverManager
 
+from metrics import (
+    DRIVER_STARTUPS_TOTAL,
+    EXTRACTIONS_TOTAL,
+    LISTINGS_PER_PAGE,
+    LISTINGS_TOTAL,
+    PAGES_TOTAL,
+    span,
+)
+import browser_profile
+import cdp_engine
+import multitab
+from pacing import RATE_CONTROLLER
+from profiling import CHROME_TRACE_CATEGORIES, extract_trace_events
+from sharding import parse_result_count
+
 logger = logging.getLogger(__name__)
 
 # 실제 Chrome User-Agent (최신 버전) — 고정 사용
@@ -28,6 +48,39 @@ CHROME_USER_AGENT = (
     "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
 )
 
+# 드라이버 경로 — CHROMEDRIVER_PATH/CHROME_BINARY 로 고정, CRAWLER_OFFLINE=1 이면 네트워크 조회 없이 로컬 경로만 사용
+CHROMEDRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH", "").strip() or None
+CHROME_BINARY = os.environ.get("CHROME_BINARY", "").strip() or None
+CRAWLER_OFFLINE = os.environ.get("CRAWLER_OFFLINE", "").strip().lower() in ("1", "true", "yes")
+
+# performance 로그의 네트워크 이벤트로 HTTP 429/403 차단 감지 (PACING_NETWORK_LOG=0 이면 끔)
+PACING_NETWORK_LOG = os.environ.get("PACING_NETWORK_LOG", "1").strip().lower() not in ("0", "false", "no")
+# 차단 감지 후 같은 페이지 재시도 횟수 (백오프 대기 후 새로고침)
+PACING_BLOCK_RETRIES = int(os.environ.get("PACING_BLOCK_RETRIES", "2"))
+# 브라우저 엔진 — selenium: chromedriver(HTTP) 경유 / cdp: Chrome DevTools Protocol websocket 직접 연결 (cdp_engine.py)
+ENGINE_SELENIUM = "selenium"
+ENGINE_CDP = "cdp"
+CRAWL_ENGINE = os.environ.get("CRAWL_ENGINE", ENGINE_SELENIUM).strip().lower()
+# 페이지 로드·이동 후 숙소 카드가 나타날 때까지 최대 대기(초)
+LISTINGS_WAIT_TIMEOUT = 10
+
+# captcha·차단 페이지 표식 (소문자 비교)
+_BLOCK_MARKERS = (
+    "captcha",
+    "px-captcha",
+    "challenge-platform",
+    "are you a robot",
+    "unusual traffic",
+    "access denied",
+    "checking your browser",
+    "verify you are human",
+    "자동 입력 방지",
+    "비정상적인 트래픽",
+)
+
+_driver_path_lock = threading.Lock()
+_driver_path: str | None = None
+
 # 에어비앤비 검색 결과 페이지 — 실제 HTML: title_ID, price-availability-row, 총액 span[aria-label*="총액"], 평점 span.a8jt5op / span[aria-hidden="true"]
 SELECTORS = {
     "listing_card": [
@@ -94,12 +147,93 @@ def _apply_stealth_cdp(driver: webdriver.Chrome) -> None:
         logger.debug("CDP stealth 적용 실패(무시 가능): %s", e)
 
 
-def create_driver() -> webdriver.Chrome:
+def resolve_chromedriver_path() -> str:
+    """
+    chromedriver 경로를 프로세스당 한 번만 결정해 캐시.
+    CHROMEDRIVER_PATH 지정 시 그대로 사용, CRAWLER_OFFLINE=1 이면 PATH 의 chromedriver,
+    그 외에는 ChromeDriverManager().install() (네트워크·디스크 조회) 결과.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path:
+            return _driver_path
+        with span("driver_install"):
+            if CHROMEDRIVER_PATH:
+                path = CHROMEDRIVER_PATH
+            elif CRAWLER_OFFLINE:
+                path = shutil.which("chromedriver") or ""
+                if not path:
+                    raise RuntimeError("CRAWLER_OFFLINE=1 이지만 CHROMEDRIVER_PATH 가 없고 PATH 에 chromedriver 도 없습니다.")
+            else:
+                path = ChromeDriverManager().install()
+        if not os.path.isfile(path):
+            raise RuntimeError(f"chromedriver 를 찾을 수 없습니다: {path}")
+        _driver_path = path
+        logger.info("chromedriver 경로 확정: %s", path)
+        return path
+
+
+def _enable_performance_log(options: Any, trace_categories: str | None) -> None:
+    """chromedriver performance 로그 활성화 (네트워크 이벤트). trace_categories 가 있으면 Chrome trace 이벤트도 기록."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    prefs: dict[str, Any] = {"enableNetwork": True, "enablePage": False}
+    if trace_categories:
+        prefs["traceCategories"] = trace_categories
+    options.add_experimental_option("perfLoggingPrefs", prefs)
+
+
+def _read_performance_log(driver: webdriver.Chrome) -> list[dict]:
+    """performance 로그를 비우며 CDP 메시지({method, params}) 목록으로 반환."""
+    try:
+        entries = driver.get_log("performance")
+    except Exception as e:
+        logger.debug("performance 로그 조회 실패: %s", e)
+        return []
+    messages = []
+    for entry in entries:
+        try:
+            messages.append(json.loads(entry["message"])["message"])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return messages
+
+
+def _add_profile_args(options: Any, user_data_dir: str | None) -> None:
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+        options.add_argument(f"--disk-cache-size={browser_profile.DISK_CACHE_BYTES}")
+
+
+def create_driver(
+    trace_categories: str | None = None,
+    page_load_strategy: str | None = None,
+    user_data_dir: str | None = None,
+) -> webdriver.Chrome:
     """
     headless Chrome 드라이버 생성.
     봇 감지 우회: --disable-blink-features=AutomationControlled, CDP로 webdriver 속성 숨김.
     환경변수 USE_UNDETECTED_CHROME=1 이면 undetected_chromedriver 사용(감지 우회 강화).
+    performance 로그: PACING_NETWORK_LOG(차단 감지용 네트워크 이벤트), trace_categories 지정 시 Chrome trace 도 수집.
+    page_load_strategy="none" 이면 탐색 명령이 로딩을 기다리지 않음 (탭 공유 브라우저용).
+    user_data_dir 미지정 시 BROWSER_PROFILE=1 이면 데워 둔 프로필 템플릿의 복제본 사용 (quit() 시 삭제, browser_profile.py).
     """
+    clone = None
+    if user_data_dir is None:
+        user_data_dir = clone = browser_profile.PROFILES.clone()
+    try:
+        driver = _start_chrome(trace_categories, page_load_strategy, user_data_dir)
+    except Exception:
+        if clone:
+            browser_profile.release(clone)
+        raise
+    if clone:
+        browser_profile.remove_on_quit(driver, clone)
+    return driver
+
+
+def _start_chrome(
+    trace_categories: str | None, page_load_strategy: str | None, user_data_dir: str | None
+) -> webdriver.Chrome:
     use_uc = os.environ.get("USE_UNDETECTED_CHROME", "").strip().lower() in ("1", "true", "yes")
 
     if use_uc:
@@ -110,9 +244,22 @@ def create_driver() -> webdriver.Chrome:
             opts.add_argument("--disable-dev-shm-usage")
             opts.add_argument("--window-size=1920,1080")
             opts.add_argument("--lang=ko-KR")
-            driver = uc.Chrome(options=opts, headless=True)
+            if trace_categories or PACING_NETWORK_LOG:
+                _enable_performance_log(opts, trace_categories)
+            if page_load_strategy:
+                opts.page_load_strategy = page_load_strategy
+            _add_profile_args(opts, user_data_dir)
+            uc_paths: dict[str, str] = {}
+            if CHROMEDRIVER_PATH:
+                uc_paths["driver_executable_path"] = CHROMEDRIVER_PATH
+            if CHROME_BINARY:
+                uc_paths["browser_executable_path"] = CHROME_BINARY
+            with span("driver_start"):
+                driver = uc.Chrome(options=opts, headless=True, **uc_paths)
+            DRIVER_STARTUPS_TOTAL.inc()
             driver.implicitly_wait(3)
             _apply_stealth_cdp(driver)
+            _install_extractor(driver)
             return driver
         except Exception as e:
             logger.warning("undetected_chromedriver 생성 실패, 일반 Chrome 사용: %s", e)
@@ -128,10 +275,20 @@ def create_driver() -> webdriver.Chrome:
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
-
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    if trace_categories or PACING_NETWORK_LOG:
+        _enable_performance_log(options, trace_categories)
+    if page_load_strategy:
+        options.page_load_strategy = page_load_strategy
+    _add_profile_args(options, user_data_dir)
+    if CHROME_BINARY:
+        options.binary_location = CHROME_BINARY
+
+    service = Service(resolve_chromedriver_path())
+    with span("driver_start"):
+        driver = webdriver.Chrome(service=service, options=options)
+    DRIVER_STARTUPS_TOTAL.inc()
     _apply_stealth_cdp(driver)
+    _install_extractor(driver)
     driver.implicitly_wait(3)
     return driver
 
@@ -194,119 +351,157 @@ def _room_id_from_href(href: str) -> str:
     return part or ""
 
 
-# 한 번의 스크립트 실행으로 페이지 전체 카드 수집 (실제 HTML: title_ID, price-availability-row, 총액, 평점)
-_FAST_SCRAPE_SCRIPT = """
-var cards = document.querySelectorAll('a[href*="/rooms/"][aria-labelledby^="title_"]');
-var seen = {}, out = [];
-for (var i = 0; i < cards.length; i++) {
-  var a = cards[i];
-  var href = (a.getAttribute('href') || '').trim();
-  var roomId = href.split('/rooms/')[1];
-  if (roomId) roomId = roomId.split('?')[0];
-  if (!roomId || seen[roomId]) continue;
-  seen[roomId] = true;
-  var titleId = a.getAttribute('aria-labelledby');
-  var title = '';
-  var cardRoot = a.parentElement;
-  if (titleId) {
-    var te = document.getElementById(titleId);
-    if (te) {
-      title = (te.textContent || '').trim();
-      for (var w = te.parentElement; w && w !== document.body; w = w.parentElement) {
-        if (w.querySelector('[data-testid="price-availability-row"]')) { cardRoot = w; break; }
-      }
-    }
-  }
-    var price = '', totalPrice = '', rating = '', address = '';
-  if (cardRoot) {
-    var priceRow = cardRoot.querySelector('[data-testid="price-availability-row"]');
-    if (priceRow) {
-      var totalSpan = priceRow.querySelector('span[aria-label*="총액"], [aria-label*="총액"]');
-      if (totalSpan) {
-        totalPrice = (totalSpan.textContent || '').trim();
-        if (!price) price = totalPrice;
+# 페이지 전체 카드 수집 함수 (실제 HTML: title_ID, price-availability-row, 총액, 평점).
+# 드라이버 생성 시 Page.addScriptToEvaluateOnNewDocument 로 문서마다 미리 정의해 두고 페이지마다 짧은 호출문만 전송.
+# 반환 (열 압축): [tails, rows] — tails: 카드 링크에서 '/rooms/{id}' 뒤 나머지(쿼리 등)의 중복 없는 목록,
+# rows: [방 ID, tails 인덱스, 제목, 가격, 평점, 주소] 배열. 링크가 '/rooms/{id}' 로 시작하지 않으면 방 ID 는 '' 이고 tails 에 링크 전체.
+_EXTRACTOR_NAME = "__lxExtract"
+_EXTRACTOR_SOURCE = """
+(function () {
+  function extract() {
+    var cards = document.querySelectorAll('a[href*="/rooms/"][aria-labelledby^="title_"]');
+    var seen = {}, tails = [], tailIndex = {}, rows = [];
+    for (var i = 0; i < cards.length; i++) {
+      var a = cards[i];
+      var href = (a.getAttribute('href') || '').trim();
+      var roomId = href.split('/rooms/')[1];
+      if (roomId) roomId = roomId.split('?')[0];
+      if (!roomId || seen[roomId]) continue;
+      seen[roomId] = true;
+      var titleId = a.getAttribute('aria-labelledby');
+      var title = '';
+      var cardRoot = a.parentElement;
+      if (titleId) {
+        var te = document.getElementById(titleId);
+        if (te) {
+          title = (te.textContent || '').trim();
+          for (var w = te.parentElement; w && w !== document.body; w = w.parentElement) {
+            if (w.querySelector('[data-testid="price-availability-row"]')) { cardRoot = w; break; }
+          }
+        }
       }
-      if (!totalPrice) {
-        var amountSpan = priceRow.querySelector('span.u174bpcy');
-        if (amountSpan) {
-          totalPrice = (amountSpan.textContent || '').trim();
+      var price = '', totalPrice = '', rating = '', address = '';
+      if (cardRoot) {
+        var priceRow = cardRoot.querySelector('[data-testid="price-availability-row"]');
+        if (priceRow) {
+          var totalSpan = priceRow.querySelector('span[aria-label*="총액"], [aria-label*="총액"]');
+          if (totalSpan) {
+            totalPrice = (totalSpan.textContent || '').trim();
+            if (!price) price = totalPrice;
+          }
+          if (!totalPrice) {
+            var amountSpan = priceRow.querySelector('span.u174bpcy');
+            if (amountSpan) {
+              totalPrice = (amountSpan.textContent || '').trim();
+              if (!price) price = totalPrice;
+            }
+          }
+          if (!totalPrice) {
+            var allSpans = priceRow.querySelectorAll('span');
+            for (var s = 0; s < allSpans.length; s++) {
+              var t = (allSpans[s].textContent || '').trim();
+              if (t.charAt(0) === '\u20a9' && t.length < 20) {
+                totalPrice = t;
+                if (!price) price = t;
+                break;
+              }
+            }
+          }
+          var otherPrice = priceRow.querySelector('span.sjwpj0z');
+          if (otherPrice && !price) price = (otherPrice.textContent || '').trim();
+        }
+        if (!totalPrice) {
+          var tp = cardRoot.querySelector('span[aria-label*="총액"], [aria-label*="총액"]');
+          if (tp) totalPrice = (tp.textContent || '').trim();
+        }
+        if (!totalPrice) {
+          var uSpan = cardRoot.querySelector('span.u174bpcy');
+          if (uSpan) totalPrice = (uSpan.textContent || '').trim();
           if (!price) price = totalPrice;
         }
-      }
-      if (!totalPrice) {
-        var allSpans = priceRow.querySelectorAll('span');
-        for (var s = 0; s < allSpans.length; s++) {
-          var t = (allSpans[s].textContent || '').trim();
-          if (t.charAt(0) === '\u20a9' && t.length < 20) {
-            totalPrice = t;
-            if (!price) price = t;
-            break;
+        if (!price) {
+          var pe = cardRoot.querySelector('[class*="price"], [data-testid="listing-card-price"]');
+          if (pe) price = (pe.textContent || '').trim();
+        }
+        var ratingSpan = cardRoot.querySelector('span.a8jt5op');
+        if (ratingSpan && (ratingSpan.textContent || '').indexOf('평점') !== -1) rating = (ratingSpan.textContent || '').trim();
+        if (!rating) {
+          var hidden = cardRoot.querySelectorAll('.t1phmnpa span[aria-hidden="true"], .r4a59j5 span[aria-hidden="true"]');
+          for (var h = 0; h < hidden.length; h++) {
+            var t = (hidden[h].textContent || '').trim();
+            if (/^\\d+\\.\\d+\\s*\\(\\d+\\)$/.test(t)) { rating = t; break; }
           }
         }
+        if (!rating) {
+          var re = cardRoot.querySelector('[class*="rating"], [class*="review"]');
+          if (re) rating = (re.textContent || '').trim();
+        }
+        var le = cardRoot.querySelector('[data-testid="listing-card-name"], [class*="location"], [data-testid="listing-card-location"]');
+        if (le) address = (le.textContent || '').trim();
       }
-      var otherPrice = priceRow.querySelector('span.sjwpj0z');
-      if (otherPrice && !price) price = (otherPrice.textContent || '').trim();
-    }
-    if (!totalPrice) {
-      var tp = cardRoot.querySelector('span[aria-label*="총액"], [aria-label*="총액"]');
-      if (tp) totalPrice = (tp.textContent || '').trim();
-    }
-    if (!totalPrice) {
-      var uSpan = cardRoot.querySelector('span.u174bpcy');
-      if (uSpan) totalPrice = (uSpan.textContent || '').trim();
-      if (!price) price = totalPrice;
-    }
-    if (!price) {
-      var pe = cardRoot.querySelector('[class*="price"], [data-testid="listing-card-price"]');
-      if (pe) price = (pe.textContent || '').trim();
-    }
-    var ratingSpan = cardRoot.querySelector('span.a8jt5op');
-    if (ratingSpan && (ratingSpan.textContent || '').indexOf('평점') !== -1) rating = (ratingSpan.textContent || '').trim();
-    if (!rating) {
-      var hidden = cardRoot.querySelectorAll('.t1phmnpa span[aria-hidden="true"], .r4a59j5 span[aria-hidden="true"]');
-      for (var h = 0; h < hidden.length; h++) {
-        var t = (hidden[h].textContent || '').trim();
-        if (/^\\d+\\.\\d+\\s*\\(\\d+\\)$/.test(t)) { rating = t; break; }
-      }
+      var prefix = '/rooms/' + roomId, rest = href, id = roomId;
+      if (href.indexOf(prefix) === 0) rest = href.slice(prefix.length); else id = '';
+      var ti = tailIndex[rest];
+      if (ti === undefined) { ti = tailIndex[rest] = tails.length; tails.push(rest); }
+      rows.push([id, ti, title, price, rating, address]);
     }
-    if (!rating) {
-      var re = cardRoot.querySelector('[class*="rating"], [class*="review"]');
-      if (re) rating = (re.textContent || '').trim();
-    }
-    var le = cardRoot.querySelector('[data-testid="listing-card-name"], [class*="location"], [data-testid="listing-card-location"]');
-    if (le) address = (le.textContent || '').trim();
+    return [tails, rows];
   }
-  out.push({ href: href, title: title, price: price, rating: rating, address: address });
-}
-return out;
-"""
+  Object.defineProperty(window, '__EXTRACTOR_NAME__', { value: extract, configurable: true, enumerable: false });
+})();
+""".replace("__EXTRACTOR_NAME__", _EXTRACTOR_NAME)
+# 미리 정의된 함수 호출 (없으면 null — 설치 전에 열린 문서)
+_EXTRACT_CALL = f"return window.{_EXTRACTOR_NAME} ? window.{_EXTRACTOR_NAME}() : null;"
+# 함수 정의 + 호출을 한 번에 (CDP 설치가 안 된 드라이버·문서용)
+_EXTRACT_INLINE = _EXTRACTOR_SOURCE + _EXTRACT_CALL
+
+
+def _install_extractor(driver: webdriver.Chrome) -> None:
+    """현재 탭의 이후 모든 문서에 수집 함수를 미리 정의 (CDP). 실패하면 페이지마다 소스를 보내는 방식으로 동작."""
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _EXTRACTOR_SOURCE})
+    except Exception as e:
+        logger.debug("수집 함수 사전 설치 실패(페이지마다 전송): %s", e)
+
+
+def _absolute_url(origin: str, href: str) -> str:
+    if href.startswith(("http://", "https://")):
+        return href
+    return origin + href if href.startswith("/") else f"{origin}/{href}"
+
+
+def _decode_listings(raw: Any, base_url: str) -> list[dict]:
+    """열 압축 결과([tails, rows])를 listing 레코드로 변환 (한 번의 리스트 컴프리헨션)."""
+    tails, rows = raw
+    origin = base_url.rstrip("/")
+    room_prefix = origin + "/rooms/"
+    return [
+        {
+            "no": i + 1,
+            "title": title or f"숙소 {i + 1}",
+            "price": price,
+            "address": address,
+            "rating": rating,
+            "url": room_prefix + room_id + tails[ti] if room_id else _absolute_url(origin, tails[ti]),
+        }
+        for i, (room_id, ti, title, price, rating, address) in enumerate(rows)
+    ]
 
 
-def _get_airbnb_listings_fast(driver: webdriver.Chrome, base_url: str) -> list[dict] | None:
+def _get_airbnb_listings_fast(driver: webdriver.Chrome, base_url: str, inline: bool = False) -> list[dict] | None:
     """
-    execute_script 한 번으로 전체 카드 수집. 성공 시 리스트 반환, 실패 시 None.
+    미리 설치한 수집 함수를 짧은 호출문 하나로 실행해 전체 카드 수집. 성공 시 리스트 반환, 실패 시 None.
+    함수가 없는 문서(설치 전 로드·CDP 미지원)거나 inline=True 면 소스째 실행 (execute_script 1회 추가).
     """
     try:
-        raw = driver.execute_script(_FAST_SCRAPE_SCRIPT)
-        if not raw or not isinstance(raw, list):
+        raw = None if inline else driver.execute_script(_EXTRACT_CALL)
+        if raw is None:
+            raw = driver.execute_script(_EXTRACT_INLINE)
+        if not raw or not isinstance(raw, list) or len(raw) != 2:
             return None
-        listings = []
-        for i, row in enumerate(raw):
-            href = (row.get("href") or "").strip()
-            if not href:
-                continue
-            url = (base_url.rstrip("/") + href) if href.startswith("/") else (base_url + href)
-            title = (row.get("title") or "").strip() or f"숙소 {i+1}"
-            listings.append({
-                "no": len(listings) + 1,
-                "title": title,
-                "price": (row.get("price") or "").strip(),
-                "address": (row.get("address") or "").strip(),
-                "rating": (row.get("rating") or "").strip(),
-                "url": url,
-            })
+        listings = _decode_listings(raw, base_url)
         if listings:
-            logger.info("고속 수집: %d개 카드 (execute_script 1회)", len(listings))
+            logger.info("고속 수집: %d개 카드", len(listings))
         return listings if listings else None
     except Exception as e:
         logger.debug("고속 수집 실패, fallback 사용: %s", e)
@@ -323,11 +518,21 @@ def get_airbnb_listings(driver: webdriver.Chrome) -> list[dict]:
     base_url = base_match.group(0) if base_match else "https://www.airbnb.co.kr"
 
     # 1) 고속 경로: 스크립트 1회로 전체 수집 (a[href*="/rooms/"][aria-labelledby^="title_"] 구조)
-    fast = _get_airbnb_listings_fast(driver, base_url)
+    with span("extract_fast"):
+        fast = _get_airbnb_listings_fast(driver, base_url)
     if fast is not None:
+        EXTRACTIONS_TOTAL.inc(path="fast")
         return fast
 
     # 2) Fallback: 요소별 수집
+    with span("extract_fallback"):
+        listings = _get_airbnb_listings_fallback(driver, base_url)
+    EXTRACTIONS_TOTAL.inc(path="fallback")
+    return listings
+
+
+def _get_airbnb_listings_fallback(driver: webdriver.Chrome, base_url: str) -> list[dict]:
+    """SELECTORS 로 카드·제목·가격·평점·주소를 요소별로 수집 (WebDriver 호출이 많아 느림)."""
     listings: list[dict] = []
     wait = WebDriverWait(driver, 10)
     cards: list[Any] = []
@@ -396,17 +601,45 @@ def get_airbnb_listings(driver: webdriver.Chrome) -> list[dict]:
     return listings
 
 
+def _wait_for_listings(driver: webdriver.Chrome, timeout: float = LISTINGS_WAIT_TIMEOUT) -> bool:
+    """숙소 링크가 나타날 때까지 대기 (고정 sleep 대신 — 빨리 뜨면 바로 진행)."""
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.2).until(
+            lambda d: d.execute_script("return document.querySelector('a[href*=\"/rooms/\"]') !== null")
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def _is_stale(element: Any) -> bool:
+    try:
+        element.is_enabled()
+        return False
+    except Exception:
+        return True
+
+
 def go_to_next_page(driver: webdriver.Chrome) -> bool:
     """
     다음 검색 결과 페이지로 이동.
-    '다음' 버튼 또는 items_offset 링크 클릭. 성공 시 True.
+    '다음' 버튼 또는 items_offset 링크 클릭 후 URL 변경·기존 카드 교체·새 카드 표시까지 대기. 성공 시 True.
     """
+    old_url = driver.current_url
+    old_cards = driver.find_elements(By.CSS_SELECTOR, SELECTORS["listing_card"][1])
+    marker = old_cards[0] if old_cards else None
     for selector in SELECTORS["next_page"]:
         try:
             elem = driver.find_element(By.CSS_SELECTOR, selector)
             if elem.is_displayed() and elem.is_enabled():
                 elem.click()
-                time.sleep(random.uniform(1.0, 2.0))
+                try:
+                    WebDriverWait(driver, LISTINGS_WAIT_TIMEOUT, poll_frequency=0.2).until(
+                        lambda d: d.current_url != old_url or (marker is not None and _is_stale(marker))
+                    )
+                except TimeoutException:
+                    logger.debug("다음 페이지 클릭 후 변화 감지 시간 초과")
+                _wait_for_listings(driver)
                 return True
         except NoSuchElementException:
             continue
@@ -427,44 +660,181 @@ def go_to_next_page(driver: webdriver.Chrome) -> bool:
     return False
 
 
+def detect_block(driver: webdriver.Chrome, page_listings: list[dict], messages: list[dict]) -> str | None:
+    """
+    차단 신호 감지. 사유 문자열(http_429, http_403, captcha) 또는 None.
+    messages: _read_performance_log 결과 (문서·XHR 응답 상태 코드 확인).
+    빈 페이지만으로는 차단으로 보지 않음 — 결과 없는 검색(첫 페이지 포함)은 정상 빈 결과.
+    """
+    for message in messages:
+        if message.get("method") != "Network.responseReceived":
+            continue
+        params = message.get("params") or {}
+        status = (params.get("response") or {}).get("status")
+        if status == 429:
+            return "http_429"
+        if status == 403 and params.get("type") == "Document":
+            return "http_403"
+    if page_listings:
+        return None
+    try:
+        text = driver.execute_script(
+            "return (document.title + ' ' + (document.body ? document.body.innerHTML.slice(0, 20000) : ''))"
+        ) or ""
+    except Exception:
+        text = ""
+    lowered = text.lower()
+    if any(marker in lowered for marker in _BLOCK_MARKERS):
+        return "captcha"
+    return None
+
+
+def _collect_page(
+    driver: webdriver.Chrome,
+    host: str,
+    page: int,
+    perf_log: bool,
+    trace_events: list[dict] | None,
+) -> list[dict]:
+    """
+    현재 페이지 수집 + 차단 감지. 차단이면 속도 제어기에 알리고 백오프 후 새로고침해 재시도.
+    정상 수집이면 속도 제어기에 성공 보고.
+    """
+    for attempt in range(PACING_BLOCK_RETRIES + 1):
+        page_listings = get_airbnb_listings(driver)
+        messages = _read_performance_log(driver) if perf_log else []
+        if trace_events is not None:
+            trace_events.extend(extract_trace_events(messages))
+        reason = detect_block(driver, page_listings, messages)
+        if reason is None:
+            RATE_CONTROLLER.report_success(host)
+            return page_listings
+        RATE_CONTROLLER.report_block(host, reason)
+        if page_listings or attempt == PACING_BLOCK_RETRIES:
+            return page_listings
+        logger.info("차단 감지(%s), 백오프 후 페이지 %d 재시도 (%d/%d)", reason, page, attempt + 1, PACING_BLOCK_RETRIES)
+        with span("pacing"):
+            RATE_CONTROLLER.acquire(host)
+        with span("navigate"):
+            driver.refresh()
+            _wait_for_listings(driver)
+    return []
+
+
+def probe_result_count(driver: webdriver.Chrome, url: str) -> int | None:
+    """
+    검색 URL 첫 페이지를 열어 결과 수 반환 (검색 분할 계획용). 제목에서 찾지 못하면 None.
+    결과가 없는 페이지는 0 — 차단 신호는 속도 제어기에 보고.
+    """
+    host = urlparse(url).hostname or ""
+    with span("pacing"):
+        RATE_CONTROLLER.acquire(host)
+    with span("probe"):
+        driver.get(url)
+        found = _wait_for_listings(driver)
+        text = driver.execute_script(
+            "const h = document.querySelector('h1, [data-testid=\"stays-page-heading\"]');"
+            "return (h ? h.innerText + ' ' : '') + (document.body ? document.body.innerText.slice(0, 3000) : '');"
+        ) or ""
+    count = parse_result_count(text)
+    if count is None and not found:
+        reason = detect_block(driver, [], _read_performance_log(driver) if PACING_NETWORK_LOG else [])
+        if reason:
+            RATE_CONTROLLER.report_block(host, reason)
+            return None
+        return 0
+    RATE_CONTROLLER.report_success(host)
+    return count
+
+
 def run_crawl(
     search_url: str,
     max_pages: int,
     on_page_result: Callable[[int, list[dict], list[dict]], None] | None = None,
+    should_stop: Callable[[], bool] | None = None,
+    keep_results: bool = True,
+    trace_events: list[dict] | None = None,
+    enrich_page: Callable[[list[dict]], None] | None = None,
+    engine: str | None = None,
 ) -> list[dict]:
     """
-    driver 생성 → URL 이동 → 쿠키/로딩 대기 → 페이지 루프(수집 + 다음 페이지) → driver 종료.
+    driver 생성 → URL 이동 → 로딩 대기 → 페이지 루프(수집 + 다음 페이지) → driver 종료.
+    페이지 이동 간격은 호스트별 공유 속도 제어기(pacing.RATE_CONTROLLER)가 결정 — 차단 신호 시 자동 감속·백오프.
     각 페이지 수집 결과는 on_page_result(현재페이지, 해당페이지_리스트, 전체_누적_리스트) 로 콜백.
-    try/finally 로 driver 는 반드시 종료.
+    should_stop() 이 True 를 반환하면 다음 페이지로 넘어가기 전에 중단.
+    keep_results=False 면 누적 리스트를 보관하지 않음 (스트리밍용, 메모리 일정) — 콜백의 전체 리스트·반환값은 빈 리스트.
+    trace_events 리스트를 넘기면 Chrome trace 이벤트를 페이지마다 수집해 추가 (프로파일링용).
+    enrich_page(해당페이지_리스트) 를 넘기면 콜백 전에 상세 정보를 병합 (enrichment.Enricher.enrich).
+    TABS_PER_DRIVER > 1 이면 (프로파일링 작업 제외) 공유 브라우저의 탭에서 실행 (multitab.TAB_POOL).
+    engine: "selenium" 또는 "cdp" (기본 CRAWL_ENGINE) — cdp 는 cdp_engine.CDP_ENGINE 의 탭에서 실행 (프로파일링 작업은 항상 selenium).
+    try/finally 로 driver(탭이면 탭 반납) 는 반드시 종료.
     """
+    engine = (engine or CRAWL_ENGINE).lower()
+    if engine not in (ENGINE_SELENIUM, ENGINE_CDP):
+        raise ValueError(f"unknown crawl engine: {engine}")
     driver = None
     all_listings: list[dict] = []
+    collected = 0
+    host = urlparse(search_url).hostname or ""
+    perf_log = PACING_NETWORK_LOG or trace_events is not None
     try:
-        driver = create_driver()
+        if trace_events is not None:
+            driver = create_driver(CHROME_TRACE_CATEGORIES)
+        elif engine == ENGINE_CDP:
+            driver = cdp_engine.CDP_ENGINE.acquire()
+        elif multitab.TAB_POOL.enabled:
+            driver = multitab.TAB_POOL.acquire()
+        else:
+            driver = create_driver()
         logger.info("검색 URL 이동: %s", search_url)
-        driver.get(search_url)
-        time.sleep(random.uniform(2.0, 4.0))  # 봇 감지 우회: 첫 로드 후 인간형 지연
+        with span("pacing"):
+            RATE_CONTROLLER.acquire(host)
+        with span("navigate"):
+            driver.get(search_url)
+            _wait_for_listings(driver)
 
         for page in range(1, max_pages + 1):
+            if should_stop and should_stop():
+                logger.info("중단 요청으로 크롤링 종료 (페이지 %d 이전)", page)
+                break
             logger.info("페이지 %d/%d 수집 중", page, max_pages)
-            page_listings = get_airbnb_listings(driver)
+            page_listings = _collect_page(driver, host, page, perf_log, trace_events)
             if not page_listings and page == 1:
                 logger.warning("첫 페이지에서 목록을 찾지 못했습니다.")
                 break
             for idx, item in enumerate(page_listings):
-                item["no"] = len(all_listings) + idx + 1
-            all_listings.extend(page_listings)
+                item["no"] = collected + idx + 1
+            collected += len(page_listings)
+            if enrich_page:
+                try:
+                    enrich_page(page_listings)
+                except Exception as e:
+                    logger.warning("상세 정보 보강 오류: %s", e)
+            PAGES_TOTAL.inc()
+            LISTINGS_TOTAL.inc(len(page_listings))
+            LISTINGS_PER_PAGE.observe(len(page_listings))
+            if keep_results:
+                all_listings.extend(page_listings)
             if on_page_result:
                 try:
                     on_page_result(page, page_listings, all_listings)
                 except Exception as e:
                     logger.warning("on_page_result 콜백 오류: %s", e)
-            if page < max_pages and not go_to_next_page(driver):
-                logger.info("다음 페이지 없음, 크롤링 종료.")
+            if should_stop and should_stop():
+                logger.info("중단 요청으로 크롤링 종료 (페이지 %d 이후)", page)
                 break
-            time.sleep(random.uniform(1.0, 2.5))  # 페이지 간 랜덤 지연으로 봇 패턴 완화
+            if page < max_pages:
+                with span("pacing"):
+                    RATE_CONTROLLER.acquire(host)
+                with span("next_page"):
+                    moved = go_to_next_page(driver)
+                if not moved:
+                    logger.info("다음 페이지 없음, 크롤링 종료.")
+                    break
     finally:
         if driver:
+            if trace_events is not None:
+                trace_events.extend(extract_trace_events(_read_performance_log(driver)))
             try:
                 driver.quit()
             except Exception:
@@ -0,0 +1,315 @@
+"""
+숙소 상세 정보 보강(enrichment) — 검색 카드에는 없는 최대 인원·호스트·편의시설·좌표를 /rooms/{id} 페이지에서 수집.
+- 엔진: http(urllib, 기본 — 브라우저 없이 서버 렌더링 HTML 파싱) 또는 driver(Chrome 드라이버 풀)
+- 동시성: 프로세스 공용 ENRICH_CONCURRENCY 개 워커 (작업 수와 무관), 상세 페이지 전용 속도 제어 예산(pacing, 호스트별)
+- driver 엔진: 프로세스 공용 드라이버 풀(DRIVER_POOL) — scheduler 가 MAX_CONCURRENT_DRIVERS 예산에서 떼어 준 수만큼만 Chrome 을 띄움
+- 캐시: 방 ID 기준 TTL + LRU (프로세스 전역) — 같은 지역을 다시 크롤링하면 이미 보강한 숙소는 건너뜀
+run_crawl(enrich_page=enricher.enrich) 로 페이지마다 호출해 listing 레코드에 필드를 병합.
+"""
+
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import urlparse
+
+from listing_index import room_id_from_url
+from metrics import Counter, in_current_context, span
+from pacing import RATE_CONTROLLER
+from scheduler import ENRICH_DRIVER_SLOTS
+
+logger = logging.getLogger(__name__)
+
+ENGINE_HTTP = "http"
+ENGINE_DRIVER = "driver"
+
+ENRICH_ENGINE = os.environ.get("ENRICH_ENGINE", ENGINE_HTTP).strip().lower()
+# 프로세스 전체 상세 페이지 동시 수집 수 (모든 작업 공유)
+ENRICH_CONCURRENCY = max(1, int(os.environ.get("ENRICH_CONCURRENCY", "4")))
+# driver 엔진 공용 풀의 Chrome 수 — 크롤링 드라이버 예산(MAX_CONCURRENT_DRIVERS)에서 떼어 냄 (scheduler.ENRICH_DRIVER_SLOTS)
+ENRICH_DRIVERS = max(1, ENRICH_DRIVER_SLOTS)
+ENRICH_CACHE_SIZE = int(os.environ.get("ENRICH_CACHE_SIZE", "20000"))
+ENRICH_CACHE_TTL = float(os.environ.get("ENRICH_CACHE_TTL", str(24 * 3600)))
+ENRICH_TIMEOUT = 15
+# driver 엔진: 드라이버 풀에서 드라이버를 빌릴 때 최대 대기(초)
+ENRICH_DRIVER_WAIT = float(os.environ.get("ENRICH_DRIVER_WAIT", "60"))
+
+# listing 레코드에 추가되는 필드
+ENRICHED_FIELDS = ("room_id", "capacity", "host", "amenities", "lat", "lng")
+
+ENRICH_CACHE_TOTAL = Counter("crawl_enrich_cache_total", "상세 정보 캐시 조회 수", ("result",))
+ENRICH_FETCH_TOTAL = Counter("crawl_enrich_fetch_total", "상세 페이지 수집 수", ("engine", "result"))
+
+_LAT_RE = re.compile(r'"lat(?:itude)?"\s*:\s*(-?\d+\.\d+)')
+_LNG_RE = re.compile(r'"(?:lng|longitude)"\s*:\s*(-?\d+\.\d+)')
+_CAPACITY_JSON_RE = re.compile(r'"personCapacity"\s*:\s*(\d+)')
+_CAPACITY_TEXT_RE = re.compile(r"(?:최대\s*인원|게스트)\s*(\d+)\s*명|(\d+)\s*guests?", re.IGNORECASE)
+_HOST_JSON_RE = re.compile(r'"hostName"\s*:\s*"([^"]+)"')
+_HOST_TEXT_RE = re.compile(r"호스트\s*[:：]?\s*([^\s,·]+?)\s*님|Hosted by\s+([^\n<,·]+)")
+_AMENITY_RE = re.compile(r'"__typename"\s*:\s*"Amenity"[^{}]*?"title"\s*:\s*"([^"]+)"[^{}]*?"available"\s*:\s*(true|false)')
+_AMENITY_ALT_RE = re.compile(r'"available"\s*:\s*(true|false)[^{}]*?"title"\s*:\s*"([^"]+)"[^{}]*?"__typename"\s*:\s*"Amenity"')
+
+
+def _json_unescape(value: str) -> str:
+    try:
+        return json.loads(f'"{value}"')
+    except ValueError:
+        return value
+
+
+def parse_room_detail(html: str, text: str = "") -> dict[str, Any]:
+    """
+    상세 페이지 HTML(내장 JSON 포함)과 화면 텍스트에서 최대 인원·호스트·편의시설·좌표 추출.
+    찾지 못한 항목은 None (편의시설은 빈 리스트).
+    """
+    detail: dict[str, Any] = {"capacity": None, "host": None, "amenities": [], "lat": None, "lng": None}
+    m = _CAPACITY_JSON_RE.search(html) or _CAPACITY_TEXT_RE.search(text or html)
+    if m:
+        detail["capacity"] = int(next(g for g in m.groups() if g))
+    m = _HOST_JSON_RE.search(html)
+    if m:
+        detail["host"] = _json_unescape(m.group(1))
+    else:
+        m = _HOST_TEXT_RE.search(text or html)
+        if m:
+            detail["host"] = next(g for g in m.groups() if g).strip()
+    lat, lng = _LAT_RE.search(html), _LNG_RE.search(html)
+    if lat and lng:
+        detail["lat"], detail["lng"] = float(lat.group(1)), float(lng.group(1))
+    amenities = [_json_unescape(t) for t, available in _AMENITY_RE.findall(html) if available == "true"]
+    amenities += [_json_unescape(t) for available, t in _AMENITY_ALT_RE.findall(html) if available == "true"]
+    detail["amenities"] = list(dict.fromkeys(amenities))
+    return detail
+
+
+class RoomCache:
+    """방 ID → 상세 정보. TTL 이 지나면 만료, 용량 초과 시 가장 오래 쓰지 않은 항목부터 제거 (스레드 안전)."""
+
+    def __init__(self, max_size: int = ENRICH_CACHE_SIZE, ttl: float = ENRICH_CACHE_TTL) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+    def get(self, room_id: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._items.get(room_id)
+            if entry is None:
+                return None
+            stored_at, detail = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._items[room_id]
+                return None
+            self._items.move_to_end(room_id)
+            return detail
+
+    def put(self, room_id: str, detail: dict[str, Any]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[room_id] = (time.monotonic(), detail)
+            self._items.move_to_end(room_id)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+
+# 프로세스 전역 캐시 — 작업 간 공유
+ROOM_CACHE = RoomCache()
+
+
+def _fetch_http(url: str) -> dict[str, Any]:
+    from crawler import CHROME_USER_AGENT
+
+    req = urllib.request.Request(
+        url,
+        headers={"User-Agent": CHROME_USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9", "Accept": "text/html"},
+    )
+    with urllib.request.urlopen(req, timeout=ENRICH_TIMEOUT) as resp:
+        html = resp.read().decode("utf-8", errors="replace")
+    return parse_room_detail(html)
+
+
+class _DriverPool:
+    """
+    상세 페이지용 Chrome 드라이버 풀 (프로세스 공용, 필요할 때 최대 size 개까지 생성).
+    사용 중인 Enricher 가 있는 동안 드라이버를 유지하고(attach/detach), 마지막 Enricher 가 닫히면 모두 quit.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._idle: queue.Queue = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._all: list[Any] = []
+        self._users = 0
+
+    def attach(self) -> None:
+        with self._lock:
+            self._users += 1
+
+    def detach(self) -> None:
+        """사용자 하나 반납. 마지막이면 (모든 드라이버가 반납된 상태) 드라이버를 모두 종료."""
+        with self._lock:
+            self._users -= 1
+            if self._users > 0:
+                return
+        self.close()
+
+    def acquire(self, timeout: float = ENRICH_DRIVER_WAIT) -> Any:
+        """유휴 드라이버를 빌리거나 자리가 있으면 새로 생성. 생성 실패는 그대로 전달, timeout 초 안에 못 빌리면 TimeoutError."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                create = self._idle.empty() and self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                return self._create()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("no enrich driver available")
+            try:
+                # 짧게 나눠 대기 — 다른 스레드의 생성이 실패해 자리가 나면 직접 생성 시도
+                return self._idle.get(timeout=min(remaining, 1.0))
+            except queue.Empty:
+                continue
+
+    def _create(self) -> Any:
+        import crawler
+        try:
+            driver = crawler.create_driver()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self._all.append(driver)
+        return driver
+
+    def release(self, driver: Any) -> None:
+        self._idle.put(driver)
+
+    def close(self) -> None:
+        with self._lock:
+            drivers, self._all = self._all, []
+            self._created = 0
+            self._idle = queue.Queue()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+# 모든 작업이 공유하는 상세 페이지 수집 워커·드라이버 풀
+EXECUTOR = ThreadPoolExecutor(max_workers=ENRICH_CONCURRENCY, thread_name_prefix="enrich")
+DRIVER_POOL = _DriverPool(ENRICH_DRIVERS)
+
+
+class Enricher:
+    """
+    페이지 단위 상세 정보 보강기. 작업 하나에서 생성해 run_crawl(enrich_page=enricher.enrich) 로 사용.
+        with Enricher() as enricher: run_crawl(url, pages, enrich_page=enricher.enrich)
+    수집 워커(EXECUTOR)와 driver 엔진의 드라이버(DRIVER_POOL)는 프로세스 공용 — 동시 작업 수가 늘어도 상한 고정.
+    """
+
+    def __init__(
+        self,
+        engine: str = ENRICH_ENGINE,
+        cache: RoomCache = ROOM_CACHE,
+        executor: ThreadPoolExecutor = EXECUTOR,
+        drivers: _DriverPool = DRIVER_POOL,
+    ) -> None:
+        if engine not in (ENGINE_HTTP, ENGINE_DRIVER):
+            raise ValueError(f"unknown enrich engine: {engine}")
+        self.engine = engine
+        self.cache = cache
+        self._executor = executor
+        self._drivers = drivers if engine == ENGINE_DRIVER else None
+        if self._drivers is not None:
+            if not ENRICH_DRIVER_SLOTS:
+                logger.warning("보강용 드라이버 예산 없음 (ENRICH_ENGINE≠driver 또는 MAX_CONCURRENT_DRIVERS=1) — 예산 밖에서 Chrome 1개 사용")
+            self._drivers.attach()
+
+    def __enter__(self) -> "Enricher":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._drivers is not None:
+            self._drivers.detach()
+            self._drivers = None
+
+    def _fetch_driver(self, url: str) -> dict[str, Any]:
+        driver = self._drivers.acquire()
+        try:
+            driver.get(url)
+            html = driver.page_source or ""
+            text = driver.execute_script("return document.body ? document.body.innerText : ''") or ""
+            return parse_room_detail(html, text)
+        finally:
+            self._drivers.release(driver)
+
+    def _fetch(self, url: str) -> dict[str, Any] | None:
+        # 상세 페이지는 검색 페이지와 별도 예산으로 속도 제어 (검색 진행이 상세 수집에 막히지 않도록)
+        host = (urlparse(url).hostname or "") + "#detail"
+        RATE_CONTROLLER.acquire(host)
+        try:
+            if self.engine == ENGINE_DRIVER:
+                detail = self._fetch_driver(url)
+            else:
+                detail = _fetch_http(url)
+        except Exception as e:
+            status = getattr(e, "code", None)
+            if status in (403, 429):
+                RATE_CONTROLLER.report_block(host, f"http_{status}")
+            logger.debug("상세 페이지 수집 실패 %s: %s", url, e)
+            ENRICH_FETCH_TOTAL.inc(engine=self.engine, result="error")
+            return None
+        RATE_CONTROLLER.report_success(host)
+        ENRICH_FETCH_TOTAL.inc(engine=self.engine, result="ok")
+        return detail
+
+    def enrich(self, listings: list[dict]) -> None:
+        """
+        listing 레코드에 room_id·capacity·host·amenities·lat·lng 병합 (제자리 수정).
+        캐시에 있는 방은 바로 채우고, 나머지만 동시 수집 후 캐시에 저장. 수집 실패한 방은 필드 None.
+        """
+        missing: dict[str, str] = {}
+        for item in listings:
+            room_id = room_id_from_url(str(item.get("url") or ""))
+            item["room_id"] = room_id
+            cached = self.cache.get(room_id) if room_id else None
+            if cached is not None:
+                ENRICH_CACHE_TOTAL.inc(result="hit")
+                item.update(cached)
+            elif room_id:
+                ENRICH_CACHE_TOTAL.inc(result="miss")
+                # 카드 링크의 검색 쿼리(날짜·인원)를 유지한 채 상세 페이지로 사용
+                missing.setdefault(room_id, item["url"])
+        if missing:
+            with span("enrich"):
+                details = dict(zip(missing, self._executor.map(in_current_context(self._fetch), missing.values())))
+            for room_id, detail in details.items():
+                if detail is not None:
+                    self.cache.put(room_id, detail)
+            for item in listings:
+                detail = details.get(item["room_id"])
+                if detail is not None:
+                    item.update(detail)
+        for item in listings:
+            for field in ENRICHED_FIELDS:
+                item.setdefault(field, [] if field == "amenities" else None)
@@ -1,15 +1,29 @@
 """
 엑셀 유틸 — 수집 결과를 엑셀 bytes 로 생성 (파일 시스템 저장 없음).
-컬럼: 번호, 제목, 가격, 주소, 평점/후기, 링크.
+컬럼: 번호, 제목, 가격, 주소, 평점/후기, 링크 (+ 상세 정보 보강 시 방 ID, 최대 인원, 호스트, 편의시설, 위도, 경도).
+대용량 변환: iter_ndjson / iter_csv 로 행을 하나씩 읽어 write_listings_excel_stream(write-only 워크북)으로 파일에 기록 — 메모리가 행 수와 무관.
 """
 
+import copy
+import csv
+import io
+import itertools
+import json
 import logging
 from datetime import datetime
 from io import BytesIO
-from typing import Any
+from typing import Any, BinaryIO, Iterable, Iterator
 
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
 from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -23,42 +37,81 @@ EXCEL_COLUMNS = [
     ("url", "링크"),
 ]
 
+# 상세 정보 보강(enrich) 결과가 있을 때만 추가하는 컬럼
+ENRICHED_COLUMNS = [
+    ("room_id", "방 ID"),
+    ("capacity", "최대 인원"),
+    ("host", "호스트"),
+    ("amenities", "편의시설"),
+    ("lat", "위도"),
+    ("lng", "경도"),
+]
+
+
+# 스트리밍 변환에서 열 구성(보강 컬럼 여부)·열 너비를 정할 때 보는 앞쪽 행 수
+SAMPLE_ROWS = 200
+
+# CSV 헤더는 키(title) 또는 한글 헤더(숙소명) 모두 허용
+_LABEL_KEYS = {label: key for key, label in EXCEL_COLUMNS + ENRICHED_COLUMNS}
+# CSV 에서 숫자로 바꿔 쓰는 컬럼 (JSON 입력과 같은 셀 형식)
+_CSV_NUMBERS = {"no": int, "capacity": int, "lat": float, "lng": float}
+
+_HEADER_FONT = Font(bold=True, size=11, color="FFFFFF")
+_HEADER_FILL = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+_THIN = Side(style="thin")
+_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+_DATA_ALIGN = Alignment(vertical="center", wrap_text=True)
+
+
+def _columns_for(listings: list[dict]) -> list[tuple[str, str]]:
+    """기본 컬럼 + (보강된 행이 있으면) 상세 정보 컬럼."""
+    if any("room_id" in item for item in listings):
+        return EXCEL_COLUMNS + ENRICHED_COLUMNS
+    return EXCEL_COLUMNS
+
 
 def _apply_formatting(ws: Any) -> None:
     """헤더·데이터 행 서식 적용."""
-    header_font = Font(bold=True, size=11, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    header_align = Alignment(horizontal="center", vertical="center")
-    thin = Side(style="thin")
-    border = Border(left=thin, right=thin, top=thin, bottom=thin)
-    data_align = Alignment(vertical="center", wrap_text=True)
-
     for cell in ws[1]:
-        cell.font = header_font
-        cell.fill = header_fill
-        cell.alignment = header_align
-        cell.border = border
+        cell.font = _HEADER_FONT
+        cell.fill = _HEADER_FILL
+        cell.alignment = _HEADER_ALIGN
+        cell.border = _BORDER
 
     for row in ws.iter_rows(min_row=2):
         for cell in row:
-            cell.alignment = data_align
-            cell.border = border
+            cell.alignment = _DATA_ALIGN
+            cell.border = _BORDER
 
     for col in ws.columns:
-        max_len = 0
-        letter = col[0].column_letter
-        for cell in col:
-            try:
-                v = str(cell.value) if cell.value else ""
-                n = sum(2 if ord(c) > 127 else 1 for c in v)
-                max_len = max(max_len, n)
-            except Exception:
-                pass
-        ws.column_dimensions[letter].width = min(max(max_len + 2, 10), 50)
+        max_len = max(_display_width(cell.value) for cell in col)
+        ws.column_dimensions[col[0].column_letter].width = _column_width(max_len)
 
     ws.freeze_panes = "A2"
 
 
+def _display_width(value: Any) -> int:
+    """셀 표시 폭 (한글 등 비 ASCII 문자는 2칸)."""
+    v = str(value) if value else ""
+    return sum(2 if ord(c) > 127 else 1 for c in v)
+
+
+def _column_width(max_len: int) -> int:
+    return min(max(max_len + 2, 10), 50)
+
+
+def _cell_value(val: Any) -> Any:
+    """셀에 쓸 값. 목록은 쉼표로 합치고, 엑셀이 거부하는 제어 문자는 제거."""
+    if isinstance(val, list):
+        val = ", ".join(str(v) for v in val)
+    elif isinstance(val, dict):
+        val = str(val)
+    if isinstance(val, str):
+        return ILLEGAL_CHARACTERS_RE.sub("", val)
+    return val
+
+
 def save_listings_to_excel(listings: list[dict]) -> bytes:
     """
     수집된 숙소 목록을 엑셀 파일 bytes 로 생성 (디스크 저장 없음).
@@ -80,15 +133,13 @@ def save_listings_to_excel(listings: list[dict]) -> bytes:
     ws = wb.active
     ws.title = "목록"
 
-    for c, (key, label) in enumerate(EXCEL_COLUMNS, 1):
+    columns = _columns_for(listings)
+    for c, (key, label) in enumerate(columns, 1):
         ws.cell(row=1, column=c, value=label)
 
     for r, item in enumerate(listings, 2):
-        for c, (key, _) in enumerate(EXCEL_COLUMNS, 1):
-            val = item.get(key, "")
-            if isinstance(val, (list, dict)):
-                val = str(val)
-            ws.cell(row=r, column=c, value=val)
+        for c, (key, _) in enumerate(columns, 1):
+            ws.cell(row=r, column=c, value=_cell_value(item.get(key, "")))
 
     _apply_formatting(ws)
     buf = BytesIO()
@@ -97,6 +148,95 @@ def save_listings_to_excel(listings: list[dict]) -> bytes:
     return buf.getvalue()
 
 
+def iter_ndjson(fp: BinaryIO) -> Iterator[dict]:
+    """NDJSON(한 줄에 listing 객체 하나)을 한 줄씩 파싱. 빈 줄은 건너뜀, 잘못된 줄은 ValueError(줄 번호 포함)."""
+    loads = orjson.loads if orjson is not None else json.loads
+    for lineno, line in enumerate(fp, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = loads(line)
+        except ValueError as e:
+            raise ValueError(f"line {lineno}: invalid JSON ({e})") from None
+        if not isinstance(item, dict):
+            raise ValueError(f"line {lineno}: expected a JSON object")
+        yield item
+
+
+def iter_csv(fp: BinaryIO) -> Iterator[dict]:
+    """CSV(UTF-8, BOM 허용, 첫 줄 헤더)를 한 행씩 dict 로. 헤더는 키 또는 한글 헤더, 숫자 컬럼은 변환."""
+    text = io.TextIOWrapper(fp, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.reader(text)
+        try:
+            header = next(reader, None)
+            if header is None:
+                return
+            keys = [_LABEL_KEYS.get(h.strip(), h.strip()) for h in header]
+            for row in reader:
+                if not any(row):
+                    continue
+                item = dict(zip(keys, row))
+                for key, convert in _CSV_NUMBERS.items():
+                    if item.get(key):
+                        try:
+                            item[key] = convert(item[key])
+                        except ValueError:
+                            pass
+                yield item
+        except csv.Error as e:
+            raise ValueError(f"line {reader.line_num}: invalid CSV ({e})") from None
+    finally:
+        # 래퍼가 정리될 때 호출자의 파일까지 닫지 않도록 분리
+        text.detach()
+
+
+def write_listings_excel_stream(rows: Iterable[dict], path: str) -> int:
+    """
+    숙소 행을 write-only(스트리밍) 워크북으로 path 에 저장하고 행 수 반환. 메모리에는 앞쪽 SAMPLE_ROWS 행만 보관.
+    save_listings_to_excel 과 같은 헤더·서식 — 열 구성(보강 컬럼 여부)과 열 너비는 앞쪽 SAMPLE_ROWS 행 기준.
+    """
+    rows = iter(rows)
+    sample = list(itertools.islice(rows, SAMPLE_ROWS))
+    columns = _columns_for(sample)
+
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet("목록")
+    for c, (key, label) in enumerate(columns, 1):
+        max_len = max([_display_width(label)] + [_display_width(_cell_value(item.get(key, ""))) for item in sample])
+        ws.column_dimensions[get_column_letter(c)].width = _column_width(max_len)
+    ws.freeze_panes = "A2"
+
+    header = []
+    for _, label in columns:
+        cell = WriteOnlyCell(ws, value=label)
+        cell.font = _HEADER_FONT
+        cell.fill = _HEADER_FILL
+        cell.alignment = _HEADER_ALIGN
+        cell.border = _BORDER
+        header.append(cell)
+    ws.append(header)
+
+    # 셀마다 alignment·border 를 대입하면 스타일 조회가 반복되므로, 서식을 지정한 셀의 스타일 배열을 복사해 사용
+    styled = WriteOnlyCell(ws)
+    styled.alignment = _DATA_ALIGN
+    styled.border = _BORDER
+    data_style = styled._style
+    count = 0
+    for item in itertools.chain(sample, rows):
+        row = []
+        for key, _ in columns:
+            cell = WriteOnlyCell(ws, value=_cell_value(item.get(key, "")))
+            cell._style = copy.copy(data_style)
+            row.append(cell)
+        ws.append(row)
+        count += 1
+    wb.save(path)
+    logger.info("엑셀 스트리밍 생성 완료: %d행", count)
+    return count
+
+
 def get_excel_filename() -> str:
     """다운로드용 파일명: airbnb_listings_{timestamp}.xlsx"""
     return f"airbnb_listings_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
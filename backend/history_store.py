@@ -0,0 +1,304 @@
+"""
+숙소 이력 저장소 (SQLite) — 방 ID 기준으로 크롤링 결과를 누적해 가격·평점 변화를 추적.
+- listings: 방 ID 별 최신 값, 처음·마지막 발견 시각
+- snapshots: 새로 발견되었거나 가격·평점·후기 수가 바뀐 시점의 값 (이전 값 포함)
+- search_listings: 검색(정규화한 검색 URL)별로 발견된 방 — 다음 크롤링에서 사라진 숙소 판별용
+- runs: 크롤링 실행 기록 (검색, 모드, 페이지 수, 조기 종료 여부)
+페이지마다 record_page() 한 번 = 트랜잭션 한 번 (executemany 일괄 upsert).
+delta 모드는 페이지 결과 중 이미 알고 있고 바뀌지 않은 비율(known_unchanged)로 조기 종료를 판단.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from listing_index import parse_price, parse_rating, room_id_from_url
+
+logger = logging.getLogger(__name__)
+
+# CRAWL_HISTORY=0 이면 이력 저장 끔
+HISTORY_ENABLED = os.environ.get("CRAWL_HISTORY", "1").strip().lower() not in ("0", "false", "no")
+HISTORY_DB_PATH = os.environ.get("HISTORY_DB_PATH") or os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data", "history.sqlite3"
+)
+# delta 모드 기본값: 페이지의 이 비율 이상이 이미 알고 있고 바뀌지 않았으면 다음 페이지로 가지 않음
+DELTA_THRESHOLD = 0.8
+
+MODE_FULL = "full"
+MODE_DELTA = "delta"
+
+# 검색 키에서 제외할 파라미터 (페이지 위치·추적용 — 같은 검색이면 같은 키)
+_VOLATILE_KEYS = {
+    "items_offset", "cursor", "section_offset", "pagination_search",
+    "federated_search_session_id", "search_type", "source", "search_mode",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    room_id TEXT PRIMARY KEY,
+    title TEXT,
+    address TEXT,
+    url TEXT,
+    price TEXT,
+    price_value INTEGER,
+    rating TEXT,
+    rating_value REAL,
+    reviews INTEGER,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    room_id TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    seen_at REAL NOT NULL,
+    change TEXT NOT NULL,
+    price_value INTEGER,
+    rating_value REAL,
+    reviews INTEGER,
+    prev_price_value INTEGER,
+    prev_rating_value REAL,
+    prev_reviews INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_snapshots_run ON snapshots (run_id);
+CREATE INDEX IF NOT EXISTS idx_snapshots_room ON snapshots (room_id, seen_at);
+CREATE TABLE IF NOT EXISTS search_listings (
+    search_key TEXT NOT NULL,
+    room_id TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_run_id INTEGER NOT NULL,
+    PRIMARY KEY (search_key, room_id)
+);
+CREATE INDEX IF NOT EXISTS idx_search_listings_run ON search_listings (search_key, last_run_id);
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    search_key TEXT NOT NULL,
+    search_url TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    pages INTEGER NOT NULL DEFAULT 0,
+    listings INTEGER NOT NULL DEFAULT 0,
+    stopped_early INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_runs_key ON runs (search_key, run_id);
+"""
+
+
+def normalize_search_key(search_url: str) -> str:
+    """검색 URL 정규화: 호스트 소문자, 페이지 위치·추적 파라미터 제거, 파라미터 정렬."""
+    parts = urlsplit(search_url.strip())
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in _VOLATILE_KEYS)
+    return urlunsplit(("", parts.netloc.lower(), parts.path.rstrip("/"), urlencode(query), "")).lstrip("/")
+
+
+def _values(item: dict) -> tuple[int | None, float | None, int | None]:
+    rating, reviews = parse_rating(str(item.get("rating") or ""))
+    return parse_price(str(item.get("price") or "")), rating, reviews
+
+
+class HistoryStore:
+    """SQLite 연결 하나를 lock 으로 직렬화해 여러 작업 스레드에서 공유 (WAL 모드)."""
+
+    def __init__(self, path: str = HISTORY_DB_PATH) -> None:
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def start_run(self, search_url: str, mode: str = MODE_FULL) -> int:
+        """실행 기록 생성 후 run_id 반환."""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO runs (search_key, search_url, mode, status, started_at) VALUES (?, ?, ?, 'running', ?)",
+                (normalize_search_key(search_url), search_url, mode, time.time()),
+            )
+            return int(cur.lastrowid)
+
+    def finish_run(self, run_id: int, status: str, stopped_early: bool = False) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE runs SET status = ?, finished_at = ?, stopped_early = ? WHERE run_id = ?",
+                (status, time.time(), int(stopped_early), run_id),
+            )
+
+    def record_page(self, run_id: int, listings: list[dict]) -> dict[str, int]:
+        """
+        한 페이지 결과를 한 트랜잭션으로 반영. 반환: {"new", "changed", "unchanged", "skipped"(방 ID 없음)}.
+        new = 이 검색에서 처음 본 숙소, changed = 가격·평점·후기 수 변경 — 둘 다 snapshots 에 이전 값과 함께 기록.
+        """
+        now = time.time()
+        rows: dict[str, tuple[dict, tuple]] = {}
+        skipped = 0
+        for item in listings:
+            room_id = item.get("room_id") or room_id_from_url(str(item.get("url") or ""))
+            if not room_id:
+                skipped += 1
+                continue
+            rows[room_id] = (item, _values(item))
+        counts = {"new": 0, "changed": 0, "unchanged": 0, "skipped": skipped}
+        if not rows:
+            return counts
+        with self._lock, self._conn:
+            search_key = self._conn.execute("SELECT search_key FROM runs WHERE run_id = ?", (run_id,)).fetchone()[0]
+            placeholders = ",".join("?" * len(rows))
+            existing = {
+                r["room_id"]: (r["price_value"], r["rating_value"], r["reviews"])
+                for r in self._conn.execute(
+                    f"SELECT room_id, price_value, rating_value, reviews FROM listings WHERE room_id IN ({placeholders})",
+                    list(rows),
+                )
+            }
+            in_search = {
+                r[0]
+                for r in self._conn.execute(
+                    f"SELECT room_id FROM search_listings WHERE search_key = ? AND room_id IN ({placeholders})",
+                    [search_key, *rows],
+                )
+            }
+            snapshots = []
+            for room_id, (_, values) in rows.items():
+                prev = existing.get(room_id)
+                if room_id not in in_search:
+                    # 이 검색에서 처음 보는 숙소 (다른 검색에서 본 적이 있으면 이전 값도 함께 기록)
+                    counts["new"] += 1
+                    snapshots.append((room_id, run_id, now, "new", *values, *(prev or (None, None, None))))
+                elif prev != values:
+                    counts["changed"] += 1
+                    change = "price" if prev is None or prev[0] != values[0] else "rating"
+                    snapshots.append((room_id, run_id, now, change, *values, *(prev or (None, None, None))))
+                else:
+                    counts["unchanged"] += 1
+            self._conn.executemany(
+                """
+                INSERT INTO listings (room_id, title, address, url, price, price_value, rating, rating_value, reviews,
+                                      first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (room_id) DO UPDATE SET
+                    title = excluded.title, address = excluded.address, url = excluded.url,
+                    price = excluded.price, price_value = excluded.price_value,
+                    rating = excluded.rating, rating_value = excluded.rating_value, reviews = excluded.reviews,
+                    last_seen = excluded.last_seen
+                """,
+                [
+                    (
+                        room_id, item.get("title"), item.get("address"), item.get("url"),
+                        item.get("price"), values[0], item.get("rating"), values[1], values[2], now, now,
+                    )
+                    for room_id, (item, values) in rows.items()
+                ],
+            )
+            self._conn.executemany(
+                """
+                INSERT INTO snapshots (room_id, run_id, seen_at, change, price_value, rating_value, reviews,
+                                       prev_price_value, prev_rating_value, prev_reviews)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                snapshots,
+            )
+            self._conn.executemany(
+                """
+                INSERT INTO search_listings (search_key, room_id, first_seen, last_seen, last_run_id)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (search_key, room_id) DO UPDATE SET
+                    last_seen = excluded.last_seen, last_run_id = excluded.last_run_id
+                """,
+                [(search_key, room_id, now, now, run_id) for room_id in rows],
+            )
+            self._conn.execute(
+                "UPDATE runs SET pages = pages + 1, listings = listings + ? WHERE run_id = ?",
+                (len(rows), run_id),
+            )
+        return counts
+
+    def run_room_ids(self, run_id: int) -> set[str]:
+        """실행에서 발견된 방 ID (이후 같은 검색을 다시 실행하기 전까지 유효)."""
+        with self._lock:
+            return {
+                r[0]
+                for r in self._conn.execute("SELECT room_id FROM search_listings WHERE last_run_id = ?", (run_id,))
+            }
+
+    def changes(self, run_id: int) -> dict[str, Any] | None:
+        """
+        실행 하나에서 새로 발견된 숙소, 가격·평점이 바뀐 숙소, (전체 수집이었다면) 직전 전체 수집 이후 보였다가
+        이번에 보이지 않은 숙소. 사라진 숙소는 조기 종료·실패한 실행에서는 판단할 수 없으므로 removed=None.
+        """
+        with self._lock:
+            run = self._conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+            if run is None:
+                return None
+            prev = self._conn.execute(
+                "SELECT run_id FROM runs WHERE search_key = ? AND run_id < ? AND status = 'completed' "
+                "AND stopped_early = 0 ORDER BY run_id DESC LIMIT 1",
+                (run["search_key"], run_id),
+            ).fetchone()
+            changed = [
+                dict(r)
+                for r in self._conn.execute(
+                    """
+                    SELECT s.room_id, s.change, l.title, l.url, l.price, s.price_value, s.prev_price_value,
+                           s.rating_value, s.prev_rating_value, s.reviews, s.prev_reviews
+                    FROM snapshots s JOIN listings l ON l.room_id = s.room_id
+                    WHERE s.run_id = ? ORDER BY s.id
+                    """,
+                    (run_id,),
+                )
+            ]
+            complete = run["status"] == "completed" and not run["stopped_early"]
+            removed = None
+            if complete and prev is not None:
+                removed = [
+                    dict(r)
+                    for r in self._conn.execute(
+                        """
+                        SELECT sl.room_id, l.title, l.url, l.price, l.last_seen
+                        FROM search_listings sl JOIN listings l ON l.room_id = sl.room_id
+                        WHERE sl.search_key = ? AND sl.last_run_id >= ? AND sl.last_run_id < ?
+                        ORDER BY sl.room_id
+                        """,
+                        (run["search_key"], prev["run_id"], run_id),
+                    )
+                ]
+        return {
+            "run_id": run_id,
+            "previous_run_id": prev["run_id"] if prev else None,
+            "search_key": run["search_key"],
+            "mode": run["mode"],
+            "stopped_early": bool(run["stopped_early"]),
+            "new": [c for c in changed if c["change"] == "new"],
+            "repriced": [c for c in changed if c["change"] == "price"],
+            "rating_changed": [c for c in changed if c["change"] == "rating"],
+            "removed": removed,
+        }
+
+
+_store: HistoryStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> HistoryStore | None:
+    """프로세스 전역 저장소 (처음 호출 시 DB 파일 생성). CRAWL_HISTORY=0 이면 None."""
+    global _store
+    if not HISTORY_ENABLED:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore()
+        return _store
@@ -1,14 +1,21 @@
 """
 크롤링 작업 상태 관리
 작업 ID(UUID), 상태(pending/running/completed/failed), 수집 결과·현재 페이지·진행율 저장.
+배치 작업: 부모 작업이 하위 작업들의 결과를 방 ID 기준 중복 제거해 합치고, 진행율·상태를 종합.
 스레드 안전: threading.Lock 사용.
 """
 
+import bisect
 import logging
 import threading
+import time
 import uuid
 from typing import Any
 
+from listing_index import ListingIndex, room_id_from_url
+from listing_stats import ListingStats
+from response_utils import COMPRESS_MIN_SIZE, PayloadCache, compress, dumps, dumps_items, join_object_with_array
+
 logger = logging.getLogger(__name__)
 
 STATUS_PENDING = "pending"
@@ -23,24 +30,90 @@ class JobManager:
     _lock = threading.Lock()
     _jobs: dict[str, dict[str, Any]] = {}
 
+    @staticmethod
+    def _new_job(job_id: str, search_url: str, max_pages: int, profile: bool = False) -> dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "status": STATUS_PENDING,
+            "search_url": search_url,
+            "max_pages": max_pages,
+            "current_page": 0,
+            "listings": [],
+            "progress_percent": 0.0,
+            "error_message": None,
+            "profile": profile,
+            "index": ListingIndex(),
+            "stats": ListingStats(),
+            # 상태·listings 가 바뀔 때마다 증가 — 직렬화 캐시 무효화 기준 (구간 시간 누적은 제외)
+            "version": 0,
+            # 페이지별로 한 번 직렬화한 listings 청크 (대괄호 없는 JSON bytes)
+            "listing_chunks": [],
+            # 청크별 첫 행 번호(0부터) — since 커서로 이어 받을 청크 찾기
+            "chunk_starts": [],
+            "payload_cache": PayloadCache(),
+            # 구간별 누적 소요 시간(초) — metrics.span 기록
+            "phases": {},
+            "started_at": None,
+            "finished_at": None,
+            # 배치 하위 작업이면 부모 작업 ID
+            "parent_id": None,
+        }
+
     @classmethod
-    def create_job(cls, search_url: str, max_pages: int) -> str:
+    def create_job(cls, search_url: str, max_pages: int, profile: bool = False) -> str:
         """작업 생성 후 job_id(UUID) 반환."""
         job_id = str(uuid.uuid4())
         with cls._lock:
-            cls._jobs[job_id] = {
-                "job_id": job_id,
-                "status": STATUS_PENDING,
-                "search_url": search_url,
-                "max_pages": max_pages,
-                "current_page": 0,
-                "listings": [],
-                "progress_percent": 0.0,
-                "error_message": None,
-            }
+            cls._jobs[job_id] = cls._new_job(job_id, search_url, max_pages, profile)
         logger.info("작업 생성: job_id=%s, max_pages=%s", job_id, max_pages)
         return job_id
 
+    @classmethod
+    def create_batch_job(cls, search_urls: list[str], max_pages: int) -> tuple[str, list[str]]:
+        """배치 부모 작업과 URL별 하위 작업 생성. (부모 job_id, 하위 job_id 목록) 반환."""
+        parent_id = str(uuid.uuid4())
+        child_ids = [str(uuid.uuid4()) for _ in search_urls]
+        with cls._lock:
+            parent = cls._new_job(parent_id, "", max_pages * len(search_urls))
+            parent["search_urls"] = list(search_urls)
+            parent["children"] = child_ids
+            # 이미 합친 방 ID (하위 작업 간 중복 제거)
+            parent["seen_room_ids"] = set()
+            parent["duplicates_skipped"] = 0
+            cls._jobs[parent_id] = parent
+            for child_id, url in zip(child_ids, search_urls):
+                child = cls._new_job(child_id, url, max_pages)
+                child["parent_id"] = parent_id
+                cls._jobs[child_id] = child
+        logger.info("배치 작업 생성: job_id=%s, 하위 작업 %d개, max_pages=%s", parent_id, len(child_ids), max_pages)
+        return parent_id, child_ids
+
+    @classmethod
+    def add_batch_children(
+        cls,
+        parent_id: str,
+        search_urls: list[str],
+        max_pages: int,
+        plan: dict[str, Any] | None = None,
+    ) -> list[str]:
+        """기존 배치 부모 작업에 하위 작업 추가 (검색 분할처럼 URL 이 나중에 정해지는 경우). 부모가 없으면 빈 리스트."""
+        child_ids = [str(uuid.uuid4()) for _ in search_urls]
+        with cls._lock:
+            parent = cls._jobs.get(parent_id)
+            if parent is None or "children" not in parent:
+                return []
+            for child_id, url in zip(child_ids, search_urls):
+                child = cls._new_job(child_id, url, max_pages)
+                child["parent_id"] = parent_id
+                cls._jobs[child_id] = child
+            parent["children"].extend(child_ids)
+            parent["search_urls"].extend(search_urls)
+            parent["max_pages"] += max_pages * len(search_urls)
+            if plan is not None:
+                parent["plan"] = plan
+            parent["version"] += 1
+        return child_ids
+
     @classmethod
     def get_status(cls, job_id: str) -> dict[str, Any] | None:
         """작업 상태 조회 (스레드 안전)."""
@@ -53,6 +126,16 @@ class JobManager:
         with cls._lock:
             if job_id in cls._jobs:
                 cls._jobs[job_id]["status"] = STATUS_RUNNING
+                cls._jobs[job_id]["started_at"] = time.time()
+                cls._jobs[job_id]["version"] += 1
+                cls._refresh_parent(cls._jobs[job_id])
+
+    @classmethod
+    def set_profile(cls, job_id: str, profile: bool) -> None:
+        """프로파일 여부 변경 (실행 시작 시 프로파일 슬롯을 얻지 못한 작업)."""
+        with cls._lock:
+            if job_id in cls._jobs:
+                cls._jobs[job_id]["profile"] = profile
 
     @classmethod
     def set_page_result(
@@ -68,9 +151,109 @@ class JobManager:
                 return
             job = cls._jobs[job_id]
             job["current_page"] = current_page
+            new_rows = all_listings[len(job["index"]):]
             job["listings"] = list(all_listings)
+            cls._append_rows(job, new_rows)
             max_pages = job.get("max_pages", 1)
             job["progress_percent"] = round(100.0 * current_page / max_pages, 1) if max_pages else 0.0
+            parent = cls._jobs.get(job["parent_id"]) if job["parent_id"] else None
+            if parent is not None:
+                cls._merge_into_parent(parent, new_rows)
+                cls._refresh_parent(job)
+
+    @staticmethod
+    def _append_rows(job: dict[str, Any], rows: list[dict]) -> None:
+        """인덱스·집계·직렬화 청크에 새 행 반영 (호출 측에서 lock 보유, listings 는 호출 측이 갱신)."""
+        job["chunk_starts"].append(len(job["index"]))
+        job["index"].extend(rows)
+        job["stats"].extend(rows)
+        job["listing_chunks"].append(dumps_items(rows))
+        job["version"] += 1
+
+    @classmethod
+    def _merge_into_parent(cls, parent: dict[str, Any], rows: list[dict]) -> None:
+        """하위 작업의 새 행을 방 ID 기준 중복 제거 후 부모에 추가, 번호는 부모 기준으로 다시 매김."""
+        seen: set[str] = parent["seen_room_ids"]
+        merged: list[dict] = []
+        for item in rows:
+            room_id = room_id_from_url(str(item.get("url") or ""))
+            if room_id:
+                if room_id in seen:
+                    parent["duplicates_skipped"] += 1
+                    continue
+                seen.add(room_id)
+            merged.append({**item, "no": len(parent["listings"]) + len(merged) + 1})
+        parent["listings"].extend(merged)
+        cls._append_rows(parent, merged)
+
+    @classmethod
+    def _refresh_parent(cls, child: dict[str, Any]) -> None:
+        """하위 작업 변화에 맞춰 부모의 페이지 수·진행율·상태 갱신 (호출 측에서 lock 보유)."""
+        parent = cls._jobs.get(child["parent_id"]) if child["parent_id"] else None
+        if parent is None:
+            return
+        children = [cls._jobs[c] for c in parent["children"] if c in cls._jobs]
+        if not children:
+            return
+        statuses = [c["status"] for c in children]
+        parent["current_page"] = sum(c["current_page"] for c in children)
+        parent["progress_percent"] = round(sum(c["progress_percent"] for c in children) / len(children), 1)
+        failed = statuses.count(STATUS_FAILED)
+        if all(st in (STATUS_COMPLETED, STATUS_FAILED) for st in statuses):
+            parent["status"] = STATUS_FAILED if failed == len(children) else STATUS_COMPLETED
+            parent["finished_at"] = time.time()
+            if parent["status"] == STATUS_COMPLETED:
+                parent["progress_percent"] = 100.0
+        elif any(st != STATUS_PENDING for st in statuses):
+            parent["status"] = STATUS_RUNNING
+            if parent["started_at"] is None:
+                parent["started_at"] = time.time()
+        parent["error_message"] = f"{failed}/{len(children)} child jobs failed" if failed else None
+        parent["version"] += 1
+
+    @classmethod
+    def set_history(cls, job_id: str, history: dict[str, Any]) -> None:
+        """이력 저장 요약(run_id·모드·new/changed/unchanged 누적·조기 종료 여부) 갱신."""
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job is None:
+                return
+            job["history"] = dict(history)
+            job["version"] += 1
+
+    @classmethod
+    def get_history_runs(cls, job_id: str) -> list[int] | None:
+        """작업(배치 부모면 하위 작업들)의 이력 run_id 목록. 작업이 없으면 None."""
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job is None:
+                return None
+            jobs = [cls._jobs[c] for c in job["children"] if c in cls._jobs] if "children" in job else [job]
+            return [j["history"]["run_id"] for j in jobs if "history" in j]
+
+    @classmethod
+    def add_phase_time(cls, job_id: str, phase: str, seconds: float) -> None:
+        """구간 소요 시간 누적 (작업별 구간 분해용)."""
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job is None:
+                return
+            parent = cls._jobs.get(job["parent_id"]) if job["parent_id"] else None
+            # version 은 올리지 않음 — metrics 는 캐시된 상태 본문 밖에서 요청마다 붙임
+            for target in (job, parent) if parent is not None else (job,):
+                phases = target["phases"]
+                phases[phase] = phases.get(phase, 0.0) + seconds
+
+    @classmethod
+    def count_by_status(cls) -> dict[str, int]:
+        """상태별 작업 수 (metrics 게이지용, 배치 부모 작업은 제외 — 하위 작업으로 집계)."""
+        counts = {s: 0 for s in (STATUS_PENDING, STATUS_RUNNING, STATUS_COMPLETED, STATUS_FAILED)}
+        with cls._lock:
+            for job in cls._jobs.values():
+                if "children" in job:
+                    continue
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
 
     @classmethod
     def set_completed(cls, job_id: str) -> None:
@@ -81,6 +264,9 @@ class JobManager:
                 job = cls._jobs[job_id]
                 job["progress_percent"] = 100.0
                 job["current_page"] = job.get("max_pages", 0)
+                job["finished_at"] = time.time()
+                job["version"] += 1
+                cls._refresh_parent(job)
 
     @classmethod
     def set_failed(cls, job_id: str, error_message: str) -> None:
@@ -89,11 +275,120 @@ class JobManager:
             if job_id in cls._jobs:
                 cls._jobs[job_id]["status"] = STATUS_FAILED
                 cls._jobs[job_id]["error_message"] = error_message
+                cls._jobs[job_id]["finished_at"] = time.time()
+                cls._jobs[job_id]["version"] += 1
+                cls._refresh_parent(cls._jobs[job_id])
         logger.warning("작업 실패: job_id=%s, error=%s", job_id, error_message)
 
+    @classmethod
+    def get_status_payload(
+        cls, job_id: str, encoding: str | None = None, since: int | None = None
+    ) -> tuple[bytes, str | None] | None:
+        """
+        상태 JSON bytes (status/json·SSE 공용) 와 적용된 압축 방식 반환. 작업이 없으면 None.
+        listings 는 페이지별 청크를 이어 붙이고, 결과는 버전별로 캐시해 폴러 간 재사용 (encoding 은 None/gzip).
+        metrics(경과 시간·구간별 시간)는 span 마다 바뀌므로 캐시에 넣지 않고 요청마다 본문 끝에 붙임.
+        since 를 주면 listings 에는 since 번째(0부터) 이후 행만 담음 (이미 받은 행은 다시 보내지 않는 증분 폴링, 캐시 없음).
+        """
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job is None:
+                return None
+            head = {
+                "status": job["status"],
+                "current_page": job["current_page"],
+                "max_pages": job.get("max_pages", 0),
+                "total_listings": len(job["listings"]),
+                "progress_percent": job.get("progress_percent", 0),
+                "error_message": job.get("error_message"),
+            }
+            job_metrics = cls._job_metrics(job)
+            if "children" in job:
+                head["duplicates_skipped"] = job["duplicates_skipped"]
+                head["children"] = [cls._child_summary(cls._jobs[c]) for c in job["children"] if c in cls._jobs]
+            if "plan" in job:
+                head["plan"] = job["plan"]
+            if "history" in job:
+                head["history"] = job["history"]
+            if since:
+                chunks = cls._chunks_since(job, since)
+            else:
+                version = job["version"]
+                chunks = list(job["listing_chunks"])
+                cache: PayloadCache = job["payload_cache"]
+        if since:
+            body = join_object_with_array({**head, "metrics": job_metrics}, "listings", chunks)
+            if encoding is None or len(body) < COMPRESS_MIN_SIZE:
+                return body, None
+            return compress(body, encoding), encoding
+        return cache.get(
+            version,
+            encoding,
+            lambda: join_object_with_array(head, "listings", chunks),
+            tail=b'"metrics":' + dumps(job_metrics),
+        )
+
+    @staticmethod
+    def _chunks_since(job: dict[str, Any], since: int) -> list[bytes]:
+        """since 번째 행부터의 listings 청크 (호출 측에서 lock 보유). 청크 경계가 아니면 걸친 청크만 다시 직렬화."""
+        starts: list[int] = job["chunk_starts"]
+        i = bisect.bisect_right(starts, since) - 1
+        if i < 0:
+            return list(job["listing_chunks"])
+        if starts[i] == since:
+            return job["listing_chunks"][i:]
+        end = starts[i + 1] if i + 1 < len(starts) else len(job["listings"])
+        return [dumps_items(job["listings"][since:end]), *job["listing_chunks"][i + 1:]]
+
+    @staticmethod
+    def _child_summary(child: dict[str, Any]) -> dict[str, Any]:
+        """배치 하위 작업 요약 (호출 측에서 lock 보유)."""
+        return {
+            "job_id": child["job_id"],
+            "search_url": child["search_url"],
+            "status": child["status"],
+            "current_page": child["current_page"],
+            "progress_percent": child["progress_percent"],
+            "total_listings": len(child["listings"]),
+            "error_message": child["error_message"],
+        }
+
+    @staticmethod
+    def _job_metrics(job: dict[str, Any]) -> dict[str, Any]:
+        """작업별 구간 분해·처리량 (호출 측에서 lock 보유)."""
+        started = job.get("started_at")
+        elapsed = ((job.get("finished_at") or time.time()) - started) if started else 0.0
+        pages = len(job["listing_chunks"])
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "pages_per_second": round(pages / elapsed, 3) if elapsed > 0 else 0.0,
+            "phases": {k: round(v, 3) for k, v in sorted(job["phases"].items())},
+        }
+
     @classmethod
     def get_listings(cls, job_id: str) -> list[dict]:
         """수집된 목록 반환 (스레드 안전)."""
         with cls._lock:
             job = cls._jobs.get(job_id)
             return list(job["listings"]) if job else []
+
+    @classmethod
+    def query_listings(cls, job_id: str, **query: Any) -> dict[str, Any] | None:
+        """인덱스 기반 정렬·필터·검색 결과 한 페이지 반환. 작업이 없으면 None."""
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job is None:
+                return None
+            index: ListingIndex = job["index"]
+        return index.query(**query)
+
+    @classmethod
+    def get_stats(cls, job_id: str) -> dict[str, Any] | None:
+        """증분 집계 요약 반환 (JobManager lock 밖에서 계산 — 다른 작업·폴링을 막지 않음). 작업이 없으면 None."""
+        with cls._lock:
+            job = cls._jobs.get(job_id)
+            if job is None:
+                return None
+            stats: ListingStats = job["stats"]
+            status = job["status"]
+        return {"status": status, **stats.snapshot()}
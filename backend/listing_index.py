@@ -0,0 +1,232 @@
+"""
+작업별 수집 결과 인덱스 — 서버 측 정렬·필터·검색용.
+가격/평점/후기 수 정렬 인덱스(bisect)와 제목·주소 역색인(토큰 → 행 번호)을 페이지 단위로 증분 구축.
+스레드 안전: 인덱스마다 threading.Lock 사용.
+"""
+
+import base64
+import bisect
+import json
+import re
+import threading
+from typing import Any
+
+# 정렬 가능한 필드 (쿼리 파라미터 sort 값)
+SORT_FIELDS = ("no", "price", "rating", "reviews")
+
+_PRICE_RE = re.compile(r"₩\s*([\d,]+)")
+_NUMBER_RE = re.compile(r"\d[\d,]*")
+# "평점 4.88점(5점 만점), 후기 550개"
+_RATING_KO_RE = re.compile(r"평점\s*(\d+(?:\.\d+)?)")
+_REVIEWS_KO_RE = re.compile(r"후기\s*([\d,]+)")
+# "4.88 (550)"
+_RATING_SHORT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*\((\d[\d,]*)\)")
+_TOKEN_RE = re.compile(r"\w+")
+# 필터 후보가 전체 행의 1/N 이하이면 후보만 정렬, 그보다 많으면 정렬 인덱스를 앞에서부터 훑어 한 페이지만 채움
+_SORT_CANDIDATES_RATIO = 8
+
+
+def parse_price(text: str) -> int | None:
+    """가격 문자열에서 원화 금액 추출. '총액 ₩929,831, 원래 요금 ₩1,017,031' -> 929831"""
+    if not text:
+        return None
+    m = _PRICE_RE.search(text) or _NUMBER_RE.search(text)
+    if not m:
+        return None
+    digits = (m.group(1) if m.re is _PRICE_RE else m.group(0)).replace(",", "")
+    return int(digits) if digits else None
+
+
+def parse_rating(text: str) -> tuple[float | None, int | None]:
+    """평점/후기 문자열에서 (평점, 후기 수) 추출. 없으면 None."""
+    if not text:
+        return None, None
+    m = _RATING_SHORT_RE.search(text)
+    if m:
+        return float(m.group(1)), int(m.group(2).replace(",", ""))
+    rating_m = _RATING_KO_RE.search(text)
+    reviews_m = _REVIEWS_KO_RE.search(text)
+    rating = float(rating_m.group(1)) if rating_m else None
+    reviews = int(reviews_m.group(1).replace(",", "")) if reviews_m else None
+    return rating, reviews
+
+
+def room_id_from_url(url: str) -> str:
+    """숙소 링크에서 방 ID 추출. https://www.airbnb.co.kr/rooms/9977181?... -> 9977181"""
+    if not url or "/rooms/" not in url:
+        return ""
+    return url.split("/rooms/")[-1].split("?")[0].strip("/")
+
+
+def tokenize(text: str) -> list[str]:
+    """검색용 토큰 분리 (소문자, 단어 문자 기준)."""
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _encode_cursor(sort: str, order: str, key: tuple) -> str:
+    raw = json.dumps([sort, order, *key], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _decode_cursor(cursor: str, sort: str, order: str) -> tuple:
+    """
+    next_cursor → 정렬 키 (결측여부, 값, 행번호). 만든 요청과 sort/order 가 다르거나 형식이 틀리면 ValueError
+    (정렬 키끼리 비교할 수 없는 값이 bisect 에 들어가지 않도록 여기서 모두 거름).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("invalid cursor")
+    if not isinstance(key, list) or len(key) != 5:
+        raise ValueError("invalid cursor")
+    cursor_sort, cursor_order, missing, value, pos = key
+    if cursor_sort != sort or cursor_order != order:
+        raise ValueError("cursor does not match sort/order")
+    if missing not in (0, 1) or isinstance(missing, bool) or not _is_number(value):
+        raise ValueError("invalid cursor")
+    if not isinstance(pos, int) or isinstance(pos, bool) or pos < 0:
+        raise ValueError("invalid cursor")
+    return missing, value, pos
+
+
+class ListingIndex:
+    """
+    한 작업의 수집 결과 인덱스.
+    - 정렬 인덱스: 필드별 (결측여부, 값, 행번호) 정렬 리스트 (오름차순·내림차순 각각)
+    - 역색인: 제목·주소 토큰 → 행번호 집합, 접두어 검색용 정렬 어휘 목록
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rows: list[dict] = []
+        self._values: dict[str, list[float | None]] = {f: [] for f in SORT_FIELDS}
+        self._asc: dict[str, list[tuple]] = {f: [] for f in SORT_FIELDS}
+        self._desc: dict[str, list[tuple]] = {f: [] for f in SORT_FIELDS}
+        self._postings: dict[str, set[int]] = {}
+        self._vocab: list[str] = []
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def extend(self, listings: list[dict]) -> None:
+        """새로 수집된 행만 인덱스에 추가 (페이지 단위 증분)."""
+        with self._lock:
+            for item in listings:
+                self._add(item)
+
+    def _add(self, item: dict) -> None:
+        pos = len(self._rows)
+        self._rows.append(item)
+        rating, reviews = parse_rating(str(item.get("rating") or ""))
+        values = {
+            "no": item.get("no") if isinstance(item.get("no"), (int, float)) else pos + 1,
+            "price": parse_price(str(item.get("price") or "")),
+            "rating": rating,
+            "reviews": reviews,
+        }
+        for field, value in values.items():
+            self._values[field].append(value)
+            missing = 1 if value is None else 0
+            v = 0 if value is None else value
+            bisect.insort(self._asc[field], (missing, v, pos))
+            bisect.insort(self._desc[field], (missing, -v, pos))
+
+        text = f"{item.get('title') or ''} {item.get('address') or ''}"
+        for token in set(tokenize(text)):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                bisect.insort(self._vocab, token)
+            postings.add(pos)
+
+    def _match_token(self, token: str) -> set[int]:
+        """접두어 일치 토큰들의 행번호 합집합 ('광안' -> '광안동', '광안리' ...)."""
+        matched: set[int] = set()
+        i = bisect.bisect_left(self._vocab, token)
+        while i < len(self._vocab) and self._vocab[i].startswith(token):
+            matched |= self._postings[self._vocab[i]]
+            i += 1
+        return matched
+
+    def _range(self, field: str, low: float | None, high: float | None) -> set[int]:
+        """정렬 인덱스에서 [low, high] 구간에 속하는 행번호 집합."""
+        keys = self._asc[field]
+        start = 0 if low is None else bisect.bisect_left(keys, (0, low, -1))
+        end = (
+            bisect.bisect_left(keys, (1, 0, -1))
+            if high is None
+            else bisect.bisect_right(keys, (0, high, len(self._rows)))
+        )
+        return {key[2] for key in keys[start:end]}
+
+    def query(
+        self,
+        *,
+        limit: int = 50,
+        cursor: str | None = None,
+        sort: str = "no",
+        order: str = "asc",
+        q: str | None = None,
+        ranges: dict[str, tuple[float | None, float | None]] | None = None,
+    ) -> dict[str, Any]:
+        """
+        정렬·필터·검색 후 한 페이지 반환.
+        cursor 는 직전 응답의 next_cursor (정렬 키 기반이라 수집 중 행이 추가돼도 중복·누락 없음).
+        잘못된 sort/order/cursor 는 ValueError.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"invalid sort field: {sort}")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"invalid order: {order}")
+        after = _decode_cursor(cursor, sort, order) if cursor else None
+
+        with self._lock:
+            keys = self._asc[sort] if order == "asc" else self._desc[sort]
+            candidates: set[int] | None = None
+            for token in tokenize(q or ""):
+                matched = self._match_token(token)
+                candidates = matched if candidates is None else candidates & matched
+            for field, (low, high) in (ranges or {}).items():
+                if low is None and high is None:
+                    continue
+                matched = self._range(field, low, high)
+                candidates = matched if candidates is None else candidates & matched
+
+            if candidates is not None and len(candidates) * _SORT_CANDIDATES_RATIO <= len(keys):
+                values = self._values[sort]
+                sign = 1 if order == "asc" else -1
+                keys = sorted(
+                    (0, sign * values[p], p) if values[p] is not None else (1, 0, p)
+                    for p in candidates
+                )
+                candidates = None
+            start = bisect.bisect_right(keys, after) if after else 0
+            if candidates is None:
+                total = len(keys)
+                page_keys = keys[start:start + limit]
+                has_more = start + limit < total
+            else:
+                # 커서 다음 위치부터 정렬 인덱스를 훑으며 후보만 골라 limit + 1 개에서 멈춤 (다음 페이지 유무 확인용 1개)
+                total = len(candidates)
+                page_keys = []
+                for i in range(start, len(keys)):
+                    if keys[i][2] in candidates:
+                        page_keys.append(keys[i])
+                        if len(page_keys) > limit:
+                            break
+                has_more = len(page_keys) > limit
+                page_keys = page_keys[:limit]
+            items = [self._rows[key[2]] for key in page_keys]
+
+        return {
+            "total": total,
+            "count": len(items),
+            "next_cursor": _encode_cursor(sort, order, page_keys[-1]) if has_more and page_keys else None,
+            "listings": items,
+        }
@@ -0,0 +1,160 @@
+"""
+작업별 수집 결과 집계 — 가격 분포, 평점 히스토그램, 주소별 건수·중앙 가격.
+NumPy 배열에 페이지 단위로 증분 적재(새 행만 파싱, JobManager lock 안에서 호출되므로 전체 재계산 없음).
+요약은 조회(GET /crawl/{job_id}/stats) 시 새 행이 있을 때만 다시 계산하고, 다음 페이지까지는 보관된 요약을 그대로 반환.
+"""
+
+import threading
+from typing import Any
+
+import numpy as np
+
+from listing_index import parse_price, parse_rating
+
+PRICE_PERCENTILES = (10, 25, 50, 75, 90)
+# 평점 히스토그램 구간: [0, 3.5), [3.5, 4.0), [4.0, 4.5), [4.5, 4.8), [4.8, 5.0]
+RATING_BIN_EDGES = (0.0, 3.5, 4.0, 4.5, 4.8, 5.0)
+TOP_ADDRESSES = 10
+
+
+class _GrowableArray:
+    """용량을 2배씩 늘리는 float64 배열 (append 분할 상환 O(1))."""
+
+    def __init__(self, capacity: int = 256) -> None:
+        self._data = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+
+    def extend(self, values: list[float]) -> None:
+        need = self._size + len(values)
+        if need > len(self._data):
+            grown = np.empty(max(need, 2 * len(self._data)), dtype=np.float64)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+        self._data[self._size:need] = values
+        self._size = need
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._data[: self._size]
+
+
+class ListingStats:
+    """한 작업의 집계 상태. extend() 로 새 행만 추가하고 snapshot() 으로 요약 조회 (필요할 때 계산)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._count = 0
+        self._prices = _GrowableArray()
+        self._ratings = _GrowableArray()
+        self._reviews = _GrowableArray()
+        self._address_codes = _GrowableArray()
+        self._address_ids: dict[str, int] = {}
+        self._address_names: list[str] = []
+        # 마지막으로 계산한 요약 — extend() 후 None (다음 snapshot() 에서 다시 계산)
+        self._snapshot: dict[str, Any] | None = None
+
+    def extend(self, listings: list[dict]) -> None:
+        """새로 수집된 행만 파싱해 배열에 추가 (O(페이지 행 수)). 요약은 snapshot() 에서 계산."""
+        if not listings:
+            return
+        prices: list[float] = []
+        ratings: list[float] = []
+        reviews: list[float] = []
+        codes: list[float] = []
+        with self._lock:
+            for item in listings:
+                price = parse_price(str(item.get("price") or ""))
+                rating, review_count = parse_rating(str(item.get("rating") or ""))
+                address = str(item.get("address") or "").strip()
+                code = self._address_ids.get(address)
+                if code is None:
+                    code = self._address_ids[address] = len(self._address_names)
+                    self._address_names.append(address)
+                prices.append(np.nan if price is None else float(price))
+                ratings.append(np.nan if rating is None else rating)
+                reviews.append(np.nan if review_count is None else float(review_count))
+                codes.append(float(code))
+            self._prices.extend(prices)
+            self._ratings.extend(ratings)
+            self._reviews.extend(reviews)
+            self._address_codes.extend(codes)
+            self._count += len(listings)
+            self._snapshot = None
+
+    def snapshot(self) -> dict[str, Any]:
+        """요약 반환. 마지막 계산 이후 추가된 행이 있을 때만 다시 계산 (전체 행 벡터 연산 1회)."""
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = self._summarize()
+            return self._snapshot
+
+    def _summarize(self) -> dict[str, Any]:
+        prices = self._prices.values
+        ratings = self._ratings.values
+        reviews = self._reviews.values
+        priced = ~np.isnan(prices)
+        valid_prices = prices[priced]
+
+        price_summary: dict[str, Any] = {"count": int(valid_prices.size)}
+        if valid_prices.size:
+            pct = np.percentile(valid_prices, PRICE_PERCENTILES)
+            price_summary.update({
+                "min": int(valid_prices.min()),
+                "max": int(valid_prices.max()),
+                "mean": round(float(valid_prices.mean()), 1),
+                "percentiles": {f"p{p}": round(float(v), 1) for p, v in zip(PRICE_PERCENTILES, pct)},
+            })
+
+        valid_ratings = ratings[~np.isnan(ratings)]
+        hist, _ = np.histogram(valid_ratings, bins=RATING_BIN_EDGES)
+        rating_summary: dict[str, Any] = {
+            "count": int(valid_ratings.size),
+            "mean": round(float(valid_ratings.mean()), 2) if valid_ratings.size else None,
+            "histogram": [
+                {"from": lo, "to": hi, "count": int(n)}
+                for lo, hi, n in zip(RATING_BIN_EDGES[:-1], RATING_BIN_EDGES[1:], hist)
+            ],
+        }
+        valid_reviews = reviews[~np.isnan(reviews)]
+
+        codes = self._address_codes.values.astype(np.int64)
+        counts = np.bincount(codes, minlength=len(self._address_names))
+        # 주소별 중앙 가격: (주소, 가격) 정렬 후 그룹 경계에서 한 번에 계산
+        group_codes = np.empty(0, dtype=np.int64)
+        medians = np.empty(0, dtype=np.float64)
+        if valid_prices.size:
+            order = np.lexsort((valid_prices, codes[priced]))
+            sorted_codes = codes[priced][order]
+            sorted_prices = valid_prices[order]
+            starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+            ends = np.r_[starts[1:], sorted_codes.size]
+            medians = (sorted_prices[(starts + ends - 1) // 2] + sorted_prices[(starts + ends) // 2]) / 2
+            group_codes = sorted_codes[starts]
+        median_by_code = dict(zip(group_codes.tolist(), medians.tolist()))
+
+        def address_row(code: int) -> dict[str, Any]:
+            median = median_by_code.get(code)
+            return {
+                "address": self._address_names[code],
+                "count": int(counts[code]),
+                "median_price": round(median, 1) if median is not None else None,
+            }
+
+        by_count = [
+            address_row(int(code))
+            for code in np.argsort(-counts, kind="stable")[:TOP_ADDRESSES]
+            if counts[code] > 0
+        ]
+        by_price = [
+            address_row(int(group_codes[i]))
+            for i in np.argsort(-medians, kind="stable")[:TOP_ADDRESSES]
+        ]
+
+        return {
+            "count": self._count,
+            "price": price_summary,
+            "rating": rating_summary,
+            "reviews_total": int(valid_reviews.sum()) if valid_reviews.size else 0,
+            "top_addresses_by_count": by_count,
+            "top_addresses_by_median_price": by_price,
+        }
@@ -1,26 +1,135 @@
 """
 FastAPI 백엔드 — 크롤링 작업 시작, SSE 상태 스트리밍, 엑셀 다운로드, 헬스체크.
+Selenium(crawler)·openpyxl(excel_utils) 은 처음 필요할 때 import — API 는 무거운 모듈 없이 먼저 기동.
 """
 
-import json
+import asyncio
+import contextlib
+import io
 import logging
+import os
+import queue
+import tempfile
 import threading
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal
 
-from fastapi import FastAPI, HTTPException
+# 기동 시간 측정 기준점 (모듈 로드 시작)
+_MODULE_LOAD_START = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response, StreamingResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from starlette.background import BackgroundTask
 
-from crawler import run_crawl
+import enrichment
+import history_store
+import metrics
+import profiling
+import scheduler
+import sharding
+from batch import expand_batch_urls
 from job_manager import JobManager
-from excel_utils import save_listings_to_excel, get_excel_filename
+from response_utils import dumps, encoded_response, json_response, negotiate_encoding
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="에어비앤비 크롤러 API", version="1.0.0")
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# /excel-from-listings 스트리밍 입력 형식 (Content-Type → 파서)
+STREAM_UPLOAD_TYPES = {
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "text/csv": "csv",
+    "application/csv": "csv",
+}
+# 업로드 수신 → 변환 스레드 사이에 대기할 수 있는 최대 본문 청크 수 (메모리 상한)
+UPLOAD_QUEUE_CHUNKS = 16
+
+# CRAWLER_WARMUP=0 이면 기동 시 crawler import·chromedriver 경로 확정을 하지 않음 (첫 작업에서 수행)
+CRAWLER_WARMUP = os.environ.get("CRAWLER_WARMUP", "1").strip().lower() not in ("0", "false", "no")
+
+# 기동·첫 작업 지연 측정값(초) — /metrics 의 crawl_startup_seconds 로 노출
+_startup_timings: dict[str, float] = {}
+_first_job_lock = threading.Lock()
+
+
+def run_crawl(*args: Any, **kwargs: Any) -> list[dict]:
+    """crawler.run_crawl 지연 import 후 실행 (Selenium·webdriver_manager 는 첫 크롤링 때 로드)."""
+    from crawler import run_crawl as _run_crawl
+    return _run_crawl(*args, **kwargs)
+
+
+def save_listings_to_excel(listings: list[dict]) -> bytes:
+    """excel_utils.save_listings_to_excel 지연 import 후 실행."""
+    from excel_utils import save_listings_to_excel as _save
+    return _save(listings)
+
+
+def get_excel_filename() -> str:
+    from excel_utils import get_excel_filename as _filename
+    return _filename()
+
+
+def write_listings_excel_stream(kind: str, fp: Any, path: str) -> int:
+    """excel_utils 지연 import 후 kind("ndjson"/"csv") 형식 입력을 스트리밍 엑셀로 변환."""
+    import excel_utils
+    parse = excel_utils.iter_ndjson if kind == "ndjson" else excel_utils.iter_csv
+    return excel_utils.write_listings_excel_stream(parse(fp), path)
+
+
+def make_shard_probe() -> Any:
+    """검색 분할 계획용 결과 수 probe (컨텍스트 매니저, 드라이버 하나 재사용)."""
+    return sharding.BrowserProbe()
+
+
+def _record_startup(name: str, seconds: float) -> None:
+    _startup_timings[name] = seconds
+    metrics.STARTUP_SECONDS.set(seconds, phase=name)
+
+
+def _warm_up_crawler() -> None:
+    """백그라운드에서 crawler import, chromedriver 경로 확정, (BROWSER_PROFILE=1) 프로필 템플릿 생성 (첫 작업 지연 감소)."""
+    try:
+        start = time.perf_counter()
+        import crawler
+        _record_startup("crawler_import", time.perf_counter() - start)
+        start = time.perf_counter()
+        crawler.resolve_chromedriver_path()
+        _record_startup("driver_resolve", time.perf_counter() - start)
+        logger.info(
+            "크롤러 준비 완료: import %.0fms, chromedriver 확정 %.0fms",
+            _startup_timings["crawler_import"] * 1000,
+            _startup_timings["driver_resolve"] * 1000,
+        )
+    except Exception as e:
+        logger.warning("크롤러 사전 준비 실패 (첫 작업에서 다시 시도): %s", e)
+    # BROWSER_PROFILE=1: 프로필 템플릿 (없거나 오래됐을 때만 생성)
+    try:
+        import browser_profile
+        start = time.perf_counter()
+        if browser_profile.PROFILES.ensure():
+            _record_startup("profile_warm", time.perf_counter() - start)
+            logger.info("프로필 템플릿 준비 완료: %.0fms", _startup_timings["profile_warm"] * 1000)
+    except Exception as e:
+        logger.warning("프로필 템플릿 사전 준비 실패 (첫 작업에서 다시 시도): %s", e)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_app: FastAPI) -> Any:
+    _record_startup("api_ready", time.perf_counter() - _MODULE_LOAD_START)
+    logger.info("API 기동 완료: %.0fms", _startup_timings["api_ready"] * 1000)
+    if CRAWLER_WARMUP:
+        threading.Thread(target=_warm_up_crawler, name="crawler-warmup", daemon=True).start()
+    yield
+
+
+app = FastAPI(title="에어비앤비 크롤러 API", version="1.0.0", lifespan=lifespan)
 
 # Streamlit Cloud 등 다른 도메인에서 API 호출 시 필요
 app.add_middleware(
@@ -35,25 +144,187 @@ app.add_middleware(
 class CrawlRequest(BaseModel):
     search_url: str = Field(..., description="에어비앤비 검색 URL")
     max_pages: int = Field(5, ge=1, le=20, description="최대 크롤링 페이지 수")
+    profile: bool = Field(False, description="작업 프로파일링 (Python 샘플링 + Chrome trace, POST /crawl 전용)")
+    enrich: bool = Field(False, description="상세 페이지에서 최대 인원·호스트·편의시설·좌표 보강")
+    delta: bool = Field(False, description="delta 모드 — 이미 알고 있고 바뀌지 않은 숙소 비율이 높은 페이지에서 중단")
+    delta_threshold: float = Field(
+        history_store.DELTA_THRESHOLD, gt=0, le=1, description="delta 모드 조기 종료 기준 (페이지 내 변경 없는 숙소 비율)"
+    )
+
+
+class BatchCrawlRequest(BaseModel):
+    search_urls: list[str] | None = Field(None, description="검색 URL 목록")
+    url_template: str | None = Field(None, description="URL 템플릿 — {이름} 필드를 params 값 조합으로 치환")
+    params: dict[str, list[str]] | None = Field(None, description="템플릿 필드별 값 목록 (모든 조합 생성)")
+    max_pages: int = Field(5, ge=1, le=20, description="URL별 최대 크롤링 페이지 수")
+    enrich: bool = Field(False, description="상세 페이지에서 최대 인원·호스트·편의시설·좌표 보강")
+    delta: bool = Field(False, description="delta 모드 — 이미 알고 있고 바뀌지 않은 숙소 비율이 높은 페이지에서 중단")
+    delta_threshold: float = Field(
+        history_store.DELTA_THRESHOLD, gt=0, le=1, description="delta 모드 조기 종료 기준 (페이지 내 변경 없는 숙소 비율)"
+    )
+
+
+class ShardedCrawlRequest(BaseModel):
+    search_url: str = Field(..., description="에어비앤비 검색 URL (결과가 많아 페이지 한도에 걸리는 검색)")
+    max_pages: int = Field(15, ge=1, le=20, description="하위 검색별 최대 크롤링 페이지 수")
+    strategy: Literal["auto", "price", "bbox"] = Field(
+        "auto", description="분할 기준: price(가격대), bbox(지도 영역 사분면), auto(URL 에 지도 영역이 있으면 bbox)"
+    )
+    max_shards: int = Field(sharding.MAX_SHARDS, ge=1, le=200, description="최대 하위 검색 수")
+    enrich: bool = Field(False, description="상세 페이지에서 최대 인원·호스트·편의시설·좌표 보강")
+    delta: bool = Field(False, description="delta 모드 — 이미 알고 있고 바뀌지 않은 숙소 비율이 높은 페이지에서 중단")
+    delta_threshold: float = Field(
+        history_store.DELTA_THRESHOLD, gt=0, le=1, description="delta 모드 조기 종료 기준 (페이지 내 변경 없는 숙소 비율)"
+    )
 
 
 class ListingsPayload(BaseModel):
     listings: list[dict] = Field(default_factory=list, description="크롤링된 숙소 목록")
 
 
-def _run_crawl_background(job_id: str, search_url: str, max_pages: int) -> None:
-    """백그라운드 스레드에서 크롤링 실행, JobManager 로 상태 갱신."""
+@contextlib.contextmanager
+def _enrich_options(enabled: bool) -> Any:
+    """enrich=True 면 작업 동안 쓸 Enricher 를 만들어 run_crawl 옵션(enrich_page)으로 제공, 끝나면 정리."""
+    if not enabled:
+        yield {}
+        return
+    with enrichment.Enricher() as enricher:
+        yield {"enrich_page": enricher.enrich}
+
+
+def _run_crawl_background(
+    job_id: str, search_url: str, max_pages: int, profile: bool = False, enrich: bool = False, **job_options: Any
+) -> None:
+    """
+    백그라운드 스레드에서 크롤링 실행, JobManager 로 상태 갱신. profile=True 면 프로파일 산출물 저장.
+    프로파일 슬롯은 대기열에서 꺼내 실제로 시작할 때 확보 — 그 사이 다른 작업이 차지했으면 프로파일 없이 실행.
+    """
+    if profile and not profiling.try_acquire_slot():
+        logger.warning("프로파일 슬롯 없음, 프로파일 없이 실행: job_id=%s", job_id)
+        JobManager.set_profile(job_id, False)
+        profile = False
+    if not profile:
+        _run_crawl_job(job_id, search_url, max_pages, enrich, **job_options)
+        return
+    trace_events: list[dict] = []
+    try:
+        with profiling.SamplingProfiler() as prof:
+            _run_crawl_job(job_id, search_url, max_pages, enrich, trace_events=trace_events, **job_options)
+        out_dir = profiling.job_dir(job_id)
+        prof.write_collapsed(os.path.join(out_dir, profiling.PYTHON_PROFILE_FILE))
+        prof.write_top(os.path.join(out_dir, profiling.PYTHON_TOP_FILE))
+        profiling.write_chrome_trace(os.path.join(out_dir, profiling.CHROME_TRACE_FILE), trace_events)
+        logger.info("프로파일 저장: job_id=%s, dir=%s", job_id, out_dir)
+    except Exception as e:
+        logger.exception("프로파일 저장 실패: %s", e)
+    finally:
+        profiling.release_slot()
+
+
+def _run_crawl_job(
+    job_id: str,
+    search_url: str,
+    max_pages: int,
+    enrich: bool = False,
+    delta: bool = False,
+    delta_threshold: float = history_store.DELTA_THRESHOLD,
+    **crawl_options: Any,
+) -> None:
+    """
+    크롤링 실행 후 완료/실패 상태 기록. enrich=True 면 페이지마다 상세 정보 보강.
+    이력 저장이 켜져 있으면 페이지마다 이력 DB 에 반영하고, delta=True 면 페이지에서 이미 알고 있고
+    바뀌지 않은 숙소 비율이 delta_threshold 이상일 때 다음 페이지로 가지 않음.
+    """
+    metrics.set_phase_recorder(lambda phase, seconds: JobManager.add_phase_time(job_id, phase, seconds))
+    job_start = time.perf_counter()
+    store: history_store.HistoryStore | None = None
+    history: dict[str, Any] | None = None
+    stop = threading.Event()
     try:
         JobManager.set_running(job_id)
+        store, history = _start_history(search_url, delta)
+        if history is not None:
+            JobManager.set_history(job_id, history)
 
         def on_page(page: int, page_listings: list[dict], all_listings: list[dict]) -> None:
+            if page == 1 and "first_job_first_page" not in _startup_timings:
+                with _first_job_lock:
+                    if "first_job_first_page" not in _startup_timings:
+                        _record_startup("first_job_first_page", time.perf_counter() - job_start)
+                        logger.info("첫 작업 첫 페이지까지 %.0fms", _startup_timings["first_job_first_page"] * 1000)
+            if history is not None:
+                _record_history(store, history, page, page_listings, delta, delta_threshold, stop)
+                JobManager.set_history(job_id, history)
             JobManager.set_page_result(job_id, page, page_listings, all_listings)
 
-        run_crawl(search_url, max_pages, on_page_result=on_page)
+        with _enrich_options(enrich) as enrich_options:
+            run_crawl(
+                search_url, max_pages, on_page_result=on_page, should_stop=stop.is_set, **enrich_options, **crawl_options
+            )
+        if history is not None:
+            _finish_history(store, history, "completed")
         JobManager.set_completed(job_id)
+        metrics.JOBS_FINISHED_TOTAL.inc(status="completed")
     except Exception as e:
         logger.exception("크롤링 실패: %s", e)
+        if history is not None:
+            _finish_history(store, history, "failed")
         JobManager.set_failed(job_id, str(e))
+        metrics.JOBS_FINISHED_TOTAL.inc(status="failed")
+    finally:
+        metrics.set_phase_recorder(None)
+
+
+def _start_history(search_url: str, delta: bool) -> tuple[history_store.HistoryStore | None, dict[str, Any] | None]:
+    """
+    이력 저장이 켜져 있으면 (저장소, 실행 기록 누적 건수 dict), 꺼져 있으면 (None, None).
+    DB 를 열거나 실행 기록을 만들지 못하면 이력 없이 진행 — delta 모드는 이전 값이 필요하므로 RuntimeError.
+    """
+    try:
+        store = history_store.get_store()
+        if store is None:
+            return None, None
+        mode = history_store.MODE_DELTA if delta else history_store.MODE_FULL
+        run_id = store.start_run(search_url, mode)
+    except Exception as e:
+        if delta:
+            raise RuntimeError(f"history store unavailable: {e}") from e
+        logger.warning("이력 저장소 사용 불가, 이력 없이 크롤링: %s", e)
+        return None, None
+    return store, {"run_id": run_id, "mode": mode, "new": 0, "changed": 0, "unchanged": 0, "stopped_early": False}
+
+
+def _finish_history(store: history_store.HistoryStore, history: dict[str, Any], status: str) -> None:
+    """실행 기록 종료. 실패해도 작업 상태 갱신·스트림 종료를 막지 않도록 로그만 남김."""
+    try:
+        store.finish_run(history["run_id"], status, history["stopped_early"])
+    except Exception as e:
+        logger.warning("이력 실행 기록 종료 실패 (run_id=%s): %s", history["run_id"], e)
+
+
+def _record_history(
+    store: history_store.HistoryStore,
+    history: dict[str, Any],
+    page: int,
+    page_listings: list[dict],
+    delta: bool,
+    delta_threshold: float,
+    stop: threading.Event,
+) -> None:
+    """페이지 결과를 이력 DB 에 반영하고 누적 건수 갱신. delta 모드에서 변경 없는 비율이 기준 이상이면 stop 설정."""
+    try:
+        counts = store.record_page(history["run_id"], page_listings)
+    except Exception as e:
+        # 이력 저장 실패로 크롤링을 멈추지 않음
+        logger.warning("이력 저장 실패 (page=%s): %s", page, e)
+        return
+    for key in ("new", "changed", "unchanged"):
+        history[key] += counts[key]
+    known = counts["new"] + counts["changed"] + counts["unchanged"]
+    if delta and known and counts["unchanged"] / known >= delta_threshold:
+        logger.info("delta 조기 종료: page=%s, 변경 없음 %d/%d", page, counts["unchanged"], known)
+        history["stopped_early"] = True
+        stop.set()
 
 
 @app.post("/crawl_sync")
@@ -63,81 +334,387 @@ def crawl_sync(req: CrawlRequest) -> dict:
 
     - JobManager 를 사용하지 않고, 서버 메모리에 작업 상태를 저장하지 않음.
     - 호출이 끝나면 즉시 전체 결과를 JSON 으로 반환.
+    - 크롤링 내내 워커·연결을 점유하므로 새 클라이언트는 POST /crawl_stream 사용 권장.
+    - 이력 저장이 켜져 있으면 POST /crawl 과 같이 페이지마다 이력 DB 에 반영 (delta=true 조기 종료 포함), 응답에 history.
     """
+    _check_delta(req.delta)
+    store: history_store.HistoryStore | None = None
+    history: dict[str, Any] | None = None
+    stop = threading.Event()
     try:
-        listings = run_crawl(req.search_url, req.max_pages)
+        store, history = _start_history(req.search_url, req.delta)
+
+        def on_page(page: int, page_listings: list[dict], _all: list[dict]) -> None:
+            if history is not None:
+                _record_history(store, history, page, page_listings, req.delta, req.delta_threshold, stop)
+
+        with _enrich_options(req.enrich) as enrich_options:
+            listings = run_crawl(
+                req.search_url, req.max_pages, on_page_result=on_page, should_stop=stop.is_set, **enrich_options
+            )
+        if history is not None:
+            _finish_history(store, history, "completed")
         return {
             "status": "completed",
             "total_listings": len(listings),
             "listings": listings,
+            "history": history,
         }
     except Exception as e:
         logger.exception("동기 크롤링 실패: %s", e)
+        if history is not None:
+            _finish_history(store, history, "failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# /crawl_stream 이벤트 큐 크기 — 클라이언트가 느리면 크롤러가 대기(backpressure)해 메모리 일정 유지
+STREAM_QUEUE_SIZE = 256
+# 한 번에 꺼내 전송할 최대 이벤트 수
+STREAM_BATCH_SIZE = 64
+
+
+def _drain_events(events: queue.Queue, timeout: float) -> list[dict]:
+    """큐에서 이벤트를 최대 STREAM_BATCH_SIZE 개 꺼냄. timeout 동안 없으면 빈 리스트."""
+    try:
+        batch = [events.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    while len(batch) < STREAM_BATCH_SIZE:
+        try:
+            batch.append(events.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+@app.post("/crawl_stream")
+async def crawl_stream(req: CrawlRequest, request: Request) -> StreamingResponse:
+    """
+    스트리밍 크롤링 엔드포인트 (NDJSON, 한 줄에 JSON 하나).
+
+    - {"type": "listing", ...숙소 필드} — 수집된 숙소마다 한 줄
+    - {"type": "page", "page", "page_listings", "total_listings", "progress_percent"} — 페이지 완료 시
+    - {"type": "summary", "status": completed|failed|cancelled, "pages", "total_listings", "error_message", "history"} — 마지막 줄
+    클라이언트 연결이 끊기면 크롤링을 중단하고 드라이버를 종료.
+    JobManager 를 사용하지 않으며 결과를 서버에 누적하지 않음. 이력 저장·delta 조기 종료는 POST /crawl 과 같음.
+    """
+    _check_delta(req.delta)
+    events: queue.Queue = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+    cancel = threading.Event()
+    # delta 조기 종료 (cancel 과 달리 정상 완료로 기록)
+    stop = threading.Event()
+
+    def put(event: dict) -> None:
+        while not cancel.is_set():
+            try:
+                events.put(event, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def worker() -> None:
+        pages = 0
+        total = 0
+        status, error_message = "completed", None
+        store: history_store.HistoryStore | None = None
+        history: dict[str, Any] | None = None
+
+        def on_page(page: int, page_listings: list[dict], _all: list[dict]) -> None:
+            nonlocal pages, total
+            pages = page
+            total += len(page_listings)
+            if history is not None:
+                _record_history(store, history, page, page_listings, req.delta, req.delta_threshold, stop)
+            for item in page_listings:
+                put({"type": "listing", **item})
+            put({
+                "type": "page",
+                "page": page,
+                "page_listings": len(page_listings),
+                "total_listings": total,
+                "progress_percent": round(100.0 * page / req.max_pages, 1),
+            })
+
+        try:
+            store, history = _start_history(req.search_url, req.delta)
+            with _enrich_options(req.enrich) as enrich_options:
+                run_crawl(
+                    req.search_url,
+                    req.max_pages,
+                    on_page_result=on_page,
+                    should_stop=lambda: cancel.is_set() or stop.is_set(),
+                    keep_results=False,
+                    **enrich_options,
+                )
+            if cancel.is_set():
+                status = "cancelled"
+        except Exception as e:
+            logger.exception("스트리밍 크롤링 실패: %s", e)
+            status, error_message = "failed", str(e)
+        if history is not None:
+            _finish_history(store, history, status)
+        put({
+            "type": "summary",
+            "status": status,
+            "pages": pages,
+            "total_listings": total,
+            "error_message": error_message,
+            "history": history,
+        })
+
+    async def generate() -> Any:
+        threading.Thread(target=metrics.in_current_context(worker), daemon=True).start()
+        try:
+            while True:
+                batch = await asyncio.to_thread(_drain_events, events, 1.0)
+                if not batch:
+                    if await request.is_disconnected():
+                        logger.info("스트리밍 클라이언트 연결 종료, 크롤링 중단 요청")
+                        return
+                    continue
+                yield b"".join(dumps(e) + b"\n" for e in batch)
+                if batch[-1]["type"] == "summary":
+                    return
+        finally:
+            cancel.set()
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+def _check_delta(delta: bool) -> None:
+    """delta 모드는 이력 저장이 켜져 있어야 함 (이전 값과 비교)."""
+    if delta and not history_store.HISTORY_ENABLED:
+        raise HTTPException(status_code=400, detail="delta mode requires history store (CRAWL_HISTORY=1)")
+
+
 @app.post("/crawl")
 def start_crawl(req: CrawlRequest) -> dict[str, str]:
     """
     크롤링 작업 시작.
-    body: { "search_url": "https://www.airbnb.co.kr/s/서울?...", "max_pages": 5 }
+    body: { "search_url": "https://www.airbnb.co.kr/s/서울?...", "max_pages": 5, "profile": false, "enrich": false,
+            "delta": false, "delta_threshold": 0.8 }
     response: { "job_id": "uuid-string" }
+    profile=true 는 동시 MAX_PROFILED_JOBS 개까지만 실행 (이미 그만큼 프로파일 중이면 429,
+    대기열에서 기다리는 동안 슬롯이 차면 프로파일 없이 실행).
+    delta=true 는 이전 크롤링에서 본 숙소가 대부분 그대로인 페이지에서 중단 (변경분은 GET /crawl/{job_id}/changes).
     """
-    job_id = JobManager.create_job(req.search_url, req.max_pages)
-    thread = threading.Thread(
-        target=_run_crawl_background,
-        args=(job_id, req.search_url, req.max_pages),
-        daemon=True,
+    _check_delta(req.delta)
+    # 슬롯은 작업이 실제로 시작할 때 확보 (_run_crawl_background) — 대기 중인 작업이 슬롯을 잡고 있지 않도록
+    if req.profile and not profiling.slot_available():
+        raise HTTPException(status_code=429, detail="too many profiled jobs running")
+    job_id = JobManager.create_job(req.search_url, req.max_pages, profile=req.profile)
+    scheduler.submit(
+        _run_crawl_background, job_id, req.search_url, req.max_pages, req.profile, req.enrich,
+        delta=req.delta, delta_threshold=req.delta_threshold,
     )
-    thread.start()
     return {"job_id": job_id}
 
 
+@app.post("/crawl/batch")
+def start_batch_crawl(req: BatchCrawlRequest) -> dict:
+    """
+    여러 검색 URL 을 한 번에 크롤링하는 배치 작업 시작.
+    body: { "search_urls": [...] } 또는 { "url_template": "https://.../s/{city}/homes?checkin={checkin}",
+            "params": {"city": ["서울", "부산"], "checkin": ["2026-11-01"]} }, "max_pages": 5
+    response: { "job_id": 부모 작업, "child_job_ids": [...], "total_urls": n }
+    하위 작업은 공유 워커 풀(MAX_CONCURRENT_DRIVERS)에서 실행되고, 부모 작업의 status/json·listings·stats·download 는
+    방 ID 기준 중복 제거된 통합 결과를 반환.
+    """
+    _check_delta(req.delta)
+    try:
+        urls = expand_batch_urls(req.search_urls, req.url_template, req.params)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    parent_id, child_ids = JobManager.create_batch_job(urls, req.max_pages)
+    for child_id, url in zip(child_ids, urls):
+        scheduler.submit(_run_crawl_job, child_id, url, req.max_pages, req.enrich, req.delta, req.delta_threshold)
+    return {"job_id": parent_id, "child_job_ids": child_ids, "total_urls": len(urls)}
+
+
+def _plan_sharded_crawl(parent_id: str, req: ShardedCrawlRequest) -> None:
+    """검색 분할 계획(결과 수 probe) 후 하위 검색을 하위 작업으로 등록해 워커 풀에 제출."""
+    metrics.set_phase_recorder(lambda phase, seconds: JobManager.add_phase_time(parent_id, phase, seconds))
+    JobManager.set_running(parent_id)
+    try:
+        with make_shard_probe() as probe, metrics.span("shard_plan"):
+            plan = sharding.plan_shards(req.search_url, probe, req.strategy, max_shards=req.max_shards)
+    except Exception as e:
+        logger.exception("검색 분할 계획 실패: %s", e)
+        JobManager.set_failed(parent_id, f"shard planning failed: {e}")
+        return
+    finally:
+        metrics.set_phase_recorder(None)
+    urls = [shard["url"] for shard in plan["shards"]]
+    if not urls:
+        JobManager.set_failed(parent_id, "no shards to crawl")
+        return
+    for child_id, url in zip(JobManager.add_batch_children(parent_id, urls, req.max_pages, plan=plan), urls):
+        scheduler.submit(_run_crawl_job, child_id, url, req.max_pages, req.enrich, req.delta, req.delta_threshold)
+
+
+@app.post("/crawl/sharded")
+def start_sharded_crawl(req: ShardedCrawlRequest) -> dict[str, str]:
+    """
+    검색 분할 크롤링 시작 — 결과가 페이지 한도를 넘는 검색을 가격대·지도 영역으로 나눠 병렬 수집.
+    body: { "search_url": "URL", "max_pages": 15, "strategy": "auto", "max_shards": 64 }
+    response: { "job_id": 부모 작업, "strategy": "price" | "bbox" }
+    계획이 끝나면 부모 작업 status/json 에 plan(하위 검색·결과 수)과 children 이 채워지고,
+    결과는 배치 작업과 같이 방 ID 기준 중복 제거해 통합.
+    """
+    _check_delta(req.delta)
+    try:
+        strategy = sharding.resolve_strategy(req.search_url, req.strategy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    parent_id, _ = JobManager.create_batch_job([], req.max_pages)
+    scheduler.submit(_plan_sharded_crawl, parent_id, req)
+    return {"job_id": parent_id, "strategy": strategy}
+
+
 @app.get("/crawl/{job_id}/status/json")
-def get_crawl_status_json(job_id: str) -> dict:
-    """현재 작업 상태를 JSON 한 번 반환 (폴링용)."""
-    job = JobManager.get_status(job_id)
-    if job is None:
+def get_crawl_status_json(
+    job_id: str,
+    request: Request,
+    since: int | None = Query(None, ge=0, description="이미 받은 listings 건수 — 이후 행만 반환"),
+) -> Response:
+    """
+    현재 작업 상태를 JSON 한 번 반환 (폴링용). 배치 작업은 children(하위 작업 요약)·duplicates_skipped 포함.
+    상태가 바뀌지 않았으면 캐시된 bytes(압축 포함)를 재사용하고 metrics 만 새로 붙임.
+    since=N 이면 listings 에 N번째 이후 새 행만 담아 반환 — 폴링 응답 크기가 전체 수집 건수와 무관하게 일정.
+    total_listings 가 since 보다 작으면 (작업이 바뀌었거나 재시작) 클라이언트는 since=0 부터 다시 받아야 함.
+    """
+    # 캐시 경로(since 없음)는 gzip 만 — 캐시된 압축 상태에 metrics 를 이어 붙임 (PayloadCache)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), allow_br=bool(since))
+    payload = JobManager.get_status_payload(job_id, encoding, since)
+    if payload is None:
         raise HTTPException(status_code=404, detail="job not found")
-    listings = job.get("listings")
-    if not isinstance(listings, list):
-        listings = []
-    return {
-        "status": job["status"],
-        "current_page": job["current_page"],
-        "max_pages": job.get("max_pages", 0),
-        "total_listings": len(listings),
-        "listings": listings,
-        "progress_percent": job.get("progress_percent", 0),
-        "error_message": job.get("error_message"),
-    }
+    body, applied = payload
+    return encoded_response(body, applied)
+
+
+@app.get("/crawl/{job_id}/listings")
+def query_crawl_listings(
+    job_id: str,
+    request: Request,
+    limit: int = Query(50, ge=1, le=500, description="페이지 크기"),
+    cursor: str | None = Query(None, description="직전 응답의 next_cursor"),
+    sort: str = Query("no", description="정렬 기준: no, price, rating, reviews"),
+    order: str = Query("asc", description="asc 또는 desc"),
+    q: str | None = Query(None, description="제목·주소 검색어 (공백 구분 AND, 접두어 일치)"),
+    min_price: int | None = Query(None, ge=0),
+    max_price: int | None = Query(None, ge=0),
+    min_rating: float | None = Query(None, ge=0),
+    max_rating: float | None = Query(None, ge=0),
+    min_reviews: int | None = Query(None, ge=0),
+    max_reviews: int | None = Query(None, ge=0),
+) -> Response:
+    """
+    수집 결과를 서버에서 정렬·필터·검색해 페이지 단위로 반환 (전체 listings 전송 없이 조회).
+    response: { "total", "count", "next_cursor", "listings" } — next_cursor 가 null 이면 마지막 페이지.
+    """
+    try:
+        result = JobManager.query_listings(
+            job_id,
+            limit=limit,
+            cursor=cursor,
+            sort=sort,
+            order=order,
+            q=q,
+            ranges={
+                "price": (min_price, max_price),
+                "rating": (min_rating, max_rating),
+                "reviews": (min_reviews, max_reviews),
+            },
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return json_response(result, request)
+
+
+@app.get("/crawl/{job_id}/stats")
+def get_crawl_stats(job_id: str) -> dict:
+    """
+    수집 결과 집계 (가격 min/max/백분위, 평점 히스토그램, 주소별 건수·중앙 가격).
+    페이지 수신 시 미리 계산된 값을 반환하므로 크롤링 중 폴링해도 비용이 거의 없음.
+    """
+    stats = JobManager.get_stats(job_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return stats
+
+
+@app.get("/crawl/{job_id}/changes")
+def get_crawl_changes(job_id: str, request: Request) -> Response:
+    """
+    이력 DB 기준 변경분만 반환 — 이번 크롤링에서 새로 본 숙소, 가격·평점이 바뀐 숙소, 사라진 숙소.
+    response: { "job_id", "runs": [run_id], "new", "repriced", "rating_changed", "removed", "complete" }
+    removed 는 조기 종료·실패 없이 끝난 전체 수집에서만 판단 가능 — 하나라도 판단할 수 없으면 null.
+    배치·분할 작업은 하위 작업들의 변경분을 방 ID 기준 중복 제거해 합침.
+    """
+    try:
+        store = history_store.get_store()
+    except Exception as e:
+        logger.warning("이력 저장소 열기 실패: %s", e)
+        raise HTTPException(status_code=503, detail="history store unavailable")
+    runs = JobManager.get_history_runs(job_id)
+    if runs is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    if store is None or not runs:
+        raise HTTPException(status_code=404, detail="no history for job")
+    merged: dict[str, Any] = {"new": {}, "repriced": {}, "rating_changed": {}, "removed": {}}
+    complete = True
+    for run_id in runs:
+        result = store.changes(run_id)
+        if result is None:
+            continue
+        if result["removed"] is None:
+            complete = False
+        for key, rows in merged.items():
+            for row in result[key] or []:
+                rows.setdefault(row["room_id"], row)
+    # 다른 하위 검색에서 보인 숙소는 사라진 것이 아님
+    seen = set(merged["new"]) | set(merged["repriced"]) | set(merged["rating_changed"])
+    for run_id in runs:
+        seen.update(store.run_room_ids(run_id))
+    return json_response(
+        {
+            "job_id": job_id,
+            "runs": runs,
+            "new": list(merged["new"].values()),
+            "repriced": list(merged["repriced"].values()),
+            "rating_changed": list(merged["rating_changed"].values()),
+            "removed": [r for k, r in merged["removed"].items() if k not in seen] if complete else None,
+            "complete": complete,
+        },
+        request,
+    )
 
 
 @app.get("/crawl/{job_id}/status")
 def stream_crawl_status(job_id: str):
     """
     SSE: 1초 간격으로 현재 상태 스트리밍.
-    event data: { "status", "current_page", "total_listings", "listings", "progress_percent", "error_message" }
+    event data: { "status", "current_page", "max_pages", "total_listings", "listings", "progress_percent", "error_message" }
     완료/실패 시 마지막 이벤트 후 스트림 종료.
     """
     def generate() -> Any:
         while True:
             job = JobManager.get_status(job_id)
-            if job is None:
-                yield f"data: {json.dumps({'error': 'job not found'})}\n\n"
+            payload = JobManager.get_status_payload(job_id) if job is not None else None
+            if payload is None:
+                yield b'data: {"error":"job not found"}\n\n'
                 return
-            payload = {
-                "status": job["status"],
-                "current_page": job["current_page"],
-                "max_pages": job.get("max_pages", 0),
-                "total_listings": len(job.get("listings", [])),
-                "listings": job.get("listings", []),
-                "progress_percent": job.get("progress_percent", 0),
-            }
-            if job.get("error_message"):
-                payload["error_message"] = job["error_message"]
-            yield f"data: {json.dumps(payload)}\n\n"
-            if job["status"] in ("completed", "failed"):
+            # 상태를 먼저 읽었으므로 종료 상태면 payload 도 최종 상태를 담고 있음
+            finished = job["status"] in ("completed", "failed")
+            body, _ = payload
+            yield b"data: " + body + b"\n\n"
+            if finished:
                 return
             time.sleep(1)
 
@@ -160,7 +737,16 @@ def download_crawl_result(job_id: str):
             detail=f"job not completed (status={job['status']})",
         )
     listings = JobManager.get_listings(job_id)
-    content = save_listings_to_excel(listings)
+    if job.get("profile") and profiling.try_acquire_slot():
+        try:
+            with profiling.SamplingProfiler() as prof, metrics.span("excel"):
+                content = save_listings_to_excel(listings)
+            prof.write_collapsed(os.path.join(profiling.job_dir(job_id), profiling.EXPORT_PROFILE_FILE))
+        finally:
+            profiling.release_slot()
+    else:
+        with metrics.span("excel"):
+            content = save_listings_to_excel(listings)
     filename = get_excel_filename()
     return Response(
         content=content,
@@ -169,22 +755,182 @@ def download_crawl_result(job_id: str):
     )
 
 
-@app.post("/excel-from-listings")
-def excel_from_listings(payload: ListingsPayload):
+def _require_profiled_job(job_id: str) -> None:
+    """JobManager 가 아는 profile=true 작업이 아니면 404 (산출물 경로는 job_id 로 만들므로 먼저 확인)."""
+    job = JobManager.get_status(job_id)
+    if job is None or not job.get("profile"):
+        raise HTTPException(status_code=404, detail="job not found")
+
+
+@app.get("/crawl/{job_id}/profile")
+def list_profile_artifacts(job_id: str) -> dict:
+    """profile=true 작업의 프로파일 산출물 목록."""
+    _require_profiled_job(job_id)
+    artifacts = profiling.list_artifacts(job_id)
+    if not artifacts:
+        raise HTTPException(status_code=404, detail="no profile artifacts")
+    return {"job_id": job_id, "artifacts": artifacts}
+
+
+@app.get("/crawl/{job_id}/profile/{name}")
+def download_profile_artifact(job_id: str, name: str):
+    """
+    프로파일 산출물 다운로드.
+    - python_profile.collapsed.txt / export_profile.collapsed.txt: flamegraph.pl·speedscope 입력
+    - python_top.txt: 함수별 self/total 비율
+    - chrome_trace.json: Chrome DevTools Performance 패널에서 불러오기
+    """
+    _require_profiled_job(job_id)
+    path = profiling.artifact_path(job_id, name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="artifact not found")
+    return FileResponse(path, filename=f"{job_id}_{name}")
+
+
+class _BodyReader(io.RawIOBase):
+    """업로드 본문 청크를 이벤트 루프의 asyncio.Queue 에서 꺼내 읽는 파일 객체 (변환 스레드용). None 은 본문 끝."""
+
+    def __init__(self, chunks: asyncio.Queue, loop: asyncio.AbstractEventLoop) -> None:
+        self._chunks = chunks
+        self._loop = loop
+        self._buf = memoryview(b"")
+        self.eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _next_chunk(self) -> bytes | None:
+        return asyncio.run_coroutine_threadsafe(self._chunks.get(), self._loop).result()
+
+    def readinto(self, b: Any) -> int:
+        while not self._buf and not self.eof:
+            chunk = self._next_chunk()
+            if chunk is None:
+                self.eof = True
+            else:
+                self._buf = memoryview(chunk)
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+    def drain(self) -> None:
+        """본문 끝까지 버림 — 변환이 먼저 끝나도 업로드 수신 쪽이 큐에서 막히지 않도록."""
+        while not self.eof:
+            if self._next_chunk() is None:
+                self.eof = True
+
+
+# 업로드 변환 전용 스레드 — 수신 쪽(async)은 스레드풀 토큰 없이 큐에 넣기만 하므로,
+# 변환이 모두 본문을 기다리는 중에도 수신이 막히지 않음 (공용 스레드풀을 쓰면 동시 업로드 수가 토큰 수에 닿을 때 교착)
+UPLOAD_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(1, int(os.environ.get("UPLOAD_WORKERS", "4"))), thread_name_prefix="excel-upload"
+)
+
+
+async def _convert_upload(request: Request, kind: str, path: str) -> int:
     """
-    클라이언트에서 전달한 listings JSON 을 엑셀 파일로 변환해 바로 반환.
-    - 서버에 결과를 저장하지 않고, 요청 범위 내 메모리에서만 처리.
+    요청 본문을 받는 대로 변환 스레드에 넘겨 파싱·엑셀 기록을 동시에 진행 (본문 전체를 메모리·디스크에 모으지 않음).
+    큐 크기(UPLOAD_QUEUE_CHUNKS)로 수신 속도를 변환 속도에 맞춤. 반환: 기록한 행 수.
     """
-    listings = payload.listings or []
-    content = save_listings_to_excel(listings)
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=UPLOAD_QUEUE_CHUNKS)
+    stopped = threading.Event()
+
+    def convert() -> int:
+        raw = _BodyReader(chunks, loop)
+        try:
+            return write_listings_excel_stream(kind, io.BufferedReader(raw), path)
+        finally:
+            stopped.set()
+            raw.drain()
+
+    task = loop.run_in_executor(UPLOAD_EXECUTOR, convert)
+    try:
+        async for chunk in request.stream():
+            if stopped.is_set():
+                break
+            if chunk:
+                await chunks.put(chunk)
+    except BaseException:
+        await chunks.put(None)
+        with contextlib.suppress(Exception):
+            await task
+        raise
+    await chunks.put(None)
+    return await task
+
+
+def _remove_file(path: str) -> None:
+    with contextlib.suppress(OSError):
+        os.unlink(path)
+
+
+@app.post(
+    "/excel-from-listings",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": ListingsPayload.model_json_schema()},
+                "application/x-ndjson": {"schema": {"type": "string", "description": "한 줄에 listing 객체 하나"}},
+                "text/csv": {"schema": {"type": "string", "description": "첫 줄 헤더 (키 또는 한글 헤더)"}},
+            },
+        }
+    },
+)
+async def excel_from_listings(request: Request) -> Response:
+    """
+    클라이언트에서 전달한 listings 를 엑셀 파일로 변환해 바로 반환.
+    - application/json: {"listings": [...]} (기존 형식, 전체를 메모리에서 처리)
+    - application/x-ndjson · text/csv: 본문을 받는 대로 한 행씩 파싱해 write-only 워크북에 기록 — 메모리가 업로드 크기와 무관.
+      결과 파일은 임시 파일에서 청크 단위로 응답하고 전송 후 삭제. 잘못된 행은 400 (줄 번호 포함).
+    - 서버에 결과를 저장하지 않음.
+    """
+    content_type = (request.headers.get("content-type") or "").split(";")[0].strip().lower()
+    kind = STREAM_UPLOAD_TYPES.get(content_type)
     filename = get_excel_filename()
-    return Response(
-        content=content,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    if kind is None:
+        try:
+            payload = ListingsPayload.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+        with metrics.span("excel"):
+            content = await run_in_threadpool(save_listings_to_excel, payload.listings or [])
+        return Response(
+            content=content,
+            media_type=XLSX_MEDIA_TYPE,
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+
+    fd, path = tempfile.mkstemp(prefix="listings-", suffix=".xlsx")
+    os.close(fd)
+    try:
+        with metrics.span("excel"):
+            rows = await _convert_upload(request, kind, path)
+    except ValueError as e:
+        _remove_file(path)
+        raise HTTPException(status_code=400, detail=str(e))
+    except BaseException:
+        _remove_file(path)
+        raise
+    return FileResponse(
+        path,
+        media_type=XLSX_MEDIA_TYPE,
+        filename=filename,
+        headers={"X-Row-Count": str(rows)},
+        background=BackgroundTask(_remove_file, path),
     )
 
 
+@app.get("/metrics")
+def prometheus_metrics() -> Response:
+    """Prometheus 텍스트 포맷 지표 (구간별 소요 시간, 페이지·숙소 수, fallback 비율, 드라이버 생성, 대기열)."""
+    for status, count in JobManager.count_by_status().items():
+        metrics.JOBS.set(count, status=status)
+    return Response(content=metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/health")
 def health() -> dict[str, str]:
     """헬스체크."""
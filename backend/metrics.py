@@ -0,0 +1,229 @@
+"""
+크롤링 계측 — 구간별 소요 시간(span), 카운터·게이지·히스토그램, Prometheus 텍스트 포맷 출력.
+외부 라이브러리 없이 동작. CRAWL_METRICS=0 이면 span 과 모든 기록이 no-op (오버헤드 거의 없음).
+스레드 안전: 지표마다 threading.Lock 사용.
+"""
+
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from typing import Callable
+
+METRICS_ENABLED = os.environ.get("CRAWL_METRICS", "1").strip().lower() not in ("0", "false", "no")
+
+# 구간 소요 시간 히스토그램 버킷 (초)
+PHASE_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LISTINGS_PER_PAGE_BUCKETS = (0, 5, 10, 15, 18, 20, 30, 50)
+
+_REGISTRY: list["_Metric"] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = labels
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.label_names)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """단조 증가 카운터."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(_Metric):
+    """현재 값 게이지."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        if not METRICS_ENABLED:
+            return
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (_bucket, _sum, _count)."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = PHASE_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+        self._sums: dict[tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * len(self.buckets)
+                self._sums[key] = 0.0
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._sums[key] += value
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            items = sorted((k, list(c), self._sums[k]) for k, c in self._counts.items())
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+PHASE_SECONDS = Histogram("crawl_phase_seconds", "크롤링 구간별 소요 시간(초)", ("phase",))
+PAGES_TOTAL = Counter("crawl_pages_total", "수집 완료한 검색 결과 페이지 수")
+LISTINGS_TOTAL = Counter("crawl_listings_total", "수집한 숙소 수")
+LISTINGS_PER_PAGE = Histogram(
+    "crawl_listings_per_page", "페이지당 수집 숙소 수", buckets=LISTINGS_PER_PAGE_BUCKETS
+)
+EXTRACTIONS_TOTAL = Counter("crawl_extractions_total", "페이지 수집 경로별 횟수 (fast/fallback)", ("path",))
+DRIVER_STARTUPS_TOTAL = Counter("crawl_driver_startups_total", "Chrome 드라이버 생성 횟수")
+JOBS_FINISHED_TOTAL = Counter("crawl_jobs_finished_total", "종료된 작업 수", ("status",))
+STARTUP_SECONDS = Gauge(
+    "crawl_startup_seconds",
+    "기동 지연(초): api_ready, crawler_import, driver_resolve, first_job_first_page",
+    ("phase",),
+)
+JOBS = Gauge("crawl_jobs", "상태별 현재 작업 수 (pending = 대기열 길이)", ("status",))
+
+# 작업별 구간 합계용 recorder — 스레드가 아니라 실행 컨텍스트에 묶어 두고, 작업 대신 일하는
+# 워커 스레드에는 in_current_context 로 컨텍스트를 넘겨 같은 작업으로 합산되게 함
+_recorder: contextvars.ContextVar[Callable[[str, float], None] | None] = contextvars.ContextVar(
+    "phase_recorder", default=None
+)
+
+
+def set_phase_recorder(recorder: Callable[[str, float], None] | None) -> None:
+    """현재 컨텍스트의 span 소요 시간을 추가로 전달받을 함수 등록 (작업별 구간 합계용)."""
+    _recorder.set(recorder)
+
+
+def in_current_context(fn: Callable) -> Callable:
+    """호출 시점의 컨텍스트(recorder 포함)에서 fn 을 실행하는 함수 반환 — 다른 스레드에 넘기는 작업용.
+    호출마다 컨텍스트 사본을 써서 여러 워커 스레드가 동시에 실행해도 안전."""
+    ctx = contextvars.copy_context()
+
+    def run(*args: object, **kwargs: object) -> object:
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+class _Span:
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase: str) -> None:
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        elapsed = time.perf_counter() - self.start
+        PHASE_SECONDS.observe(elapsed, phase=self.phase)
+        recorder = _recorder.get()
+        if recorder is not None:
+            try:
+                recorder(self.phase, elapsed)
+            except Exception:
+                pass
+
+
+_NOOP_SPAN = contextlib.nullcontext()
+
+
+def span(phase: str) -> contextlib.AbstractContextManager:
+    """구간 소요 시간 측정. with span("navigate"): driver.get(url)"""
+    if not METRICS_ENABLED:
+        return _NOOP_SPAN
+    return _Span(phase)
+
+
+def render() -> str:
+    """등록된 모든 지표를 Prometheus 텍스트 포맷(0.0.4)으로 출력."""
+    lines: list[str] = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,237 @@
+"""
+한 Chrome 드라이버에 여러 탭 — 작업(run_crawl)마다 Chrome 을 띄우는 대신 공유 브라우저의 탭 하나를 빌려 씀.
+- TAB_POOL.acquire() → TabDriver: WebDriver 와 같은 인터페이스의 프록시. 명령마다 브라우저 lock 을 잡고 자기 탭으로 전환 후 실행.
+- 탭 브라우저는 pageLoadStrategy=none 으로 생성 — 탐색·클릭 명령이 로딩 완료를 기다리지 않고, 로딩 대기
+  (_wait_for_listings 등 WebDriverWait 폴링)는 lock 밖에서 sleep → 한 브라우저가 여러 탭의 로딩을 겹쳐 진행.
+- performance 로그는 세션 공용이라 entry 의 webview(탭 target id)로 나눠 탭별로 전달 (다른 탭의 429/403 에 반응하지 않도록).
+- 탭을 닫아(quit) 반납, 빌려준 탭이 모두 반납된 브라우저는 종료.
+scheduler.TABS_PER_DRIVER=1(기본)이면 사용하지 않음 — 작업마다 드라이버 하나.
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable
+
+from selenium.webdriver.remote.webelement import WebElement
+
+from metrics import Gauge
+from scheduler import TABS_PER_DRIVER
+
+logger = logging.getLogger(__name__)
+
+TAB_BROWSERS = Gauge("crawl_tab_browsers", "탭 공유 Chrome 브라우저 수")
+TABS_OPEN = Gauge("crawl_tabs_open", "공유 브라우저에서 사용 중인 탭 수")
+
+
+def _target_id(handle: str) -> str:
+    # 오래된 chromedriver 는 창 핸들에 CDwindow- 접두어를 붙임
+    return handle.removeprefix("CDwindow-")
+
+
+class _Browser:
+    """공유 브라우저 하나: 드라이버, 명령 직렬화 lock, 현재 탭, 탭별 performance 로그 버퍼."""
+
+    def __init__(self) -> None:
+        self.driver: Any = None
+        self.lock = threading.RLock()
+        self.ready = threading.Event()
+        self.broken = False
+        # 빌려준 탭 수 (생성 중 예약 포함, TabPool lock 으로 보호)
+        self.tabs = 0
+        self._current: str | None = None
+        # 드라이버 생성 시 열린 창 — 첫 탭으로 재사용
+        self._spare: str | None = None
+        self._logs: dict[str, list[dict]] = {}
+
+    def start(self) -> None:
+        import crawler
+        try:
+            self.driver = crawler.create_driver(page_load_strategy="none")
+            self._current = self._spare = self.driver.current_window_handle
+        except Exception:
+            self.broken = True
+            raise
+        finally:
+            self.ready.set()
+
+    def run(self, handle: str, fn: Callable[[], Any]) -> Any:
+        """lock 을 잡고 handle 탭으로 전환한 뒤 fn 실행."""
+        with self.lock:
+            if self._current != handle:
+                self.driver.switch_to.window(handle)
+                self._current = handle
+            return fn()
+
+    def open_tab(self) -> str:
+        """새 탭 핸들 (처음 한 번은 기존 창). 새 탭에도 navigator.webdriver 숨김·수집 함수 사전 설치 적용."""
+        import crawler
+        with self.lock:
+            if self._spare is not None:
+                handle, self._spare = self._spare, None
+                return handle
+            self.driver.switch_to.new_window("tab")
+            handle = self._current = self.driver.current_window_handle
+            crawler._apply_stealth_cdp(self.driver)
+            crawler._install_extractor(self.driver)
+            return handle
+
+    def close_tab(self, handle: str) -> None:
+        with self.lock:
+            self._logs.pop(_target_id(handle), None)
+            try:
+                self.run(handle, self.driver.close)
+            except Exception as e:
+                logger.warning("탭 닫기 실패, 브라우저 재사용 중단: %s", e)
+                self.broken = True
+            self._current = None
+
+    def read_log(self, handle: str) -> list[dict]:
+        """세션 performance 로그를 비우며 탭별로 나누고, handle 탭 몫(raw entry)을 반환."""
+        with self.lock:
+            try:
+                entries = self.driver.get_log("performance")
+            except Exception as e:
+                logger.debug("performance 로그 조회 실패: %s", e)
+                entries = []
+            for entry in entries:
+                try:
+                    webview = json.loads(entry["message"]).get("webview")
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if webview:
+                    self._logs.setdefault(webview, []).append(entry)
+            return self._logs.pop(_target_id(handle), [])
+
+    def quit(self) -> None:
+        if self.driver is None:
+            return
+        with self.lock:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+
+
+class TabDriver:
+    """
+    공유 브라우저의 탭 하나 — run_crawl 등 기존 코드가 WebDriver 처럼 사용.
+    찾은 요소도 프록시로 감싸 다른 탭이 활성화된 상태에서 호출돼도 자기 탭으로 전환 후 실행. quit() 은 탭 반납.
+    """
+
+    def __init__(self, pool: "TabPool", browser: _Browser, handle: str) -> None:
+        self._pool = pool
+        self._browser = browser
+        self._handle = handle
+
+    def _run(self, fn: Callable[[], Any]) -> Any:
+        return self._wrap(self._browser.run(self._handle, fn))
+
+    def _wrap(self, value: Any) -> Any:
+        if isinstance(value, WebElement):
+            return _TabElement(self, value)
+        if isinstance(value, list) and value and isinstance(value[0], WebElement):
+            return [_TabElement(self, v) for v in value]
+        return value
+
+    def _bind(self, target: Any, name: str) -> Any:
+        value = self._run(lambda: getattr(target, name))
+        if not callable(value):
+            return value
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            args = tuple(a._element if isinstance(a, _TabElement) else a for a in args)
+            return self._run(lambda: value(*args, **kwargs))
+
+        return call
+
+    def __getattr__(self, name: str) -> Any:
+        return self._bind(self._browser.driver, name)
+
+    def get_log(self, log_type: str) -> list[dict]:
+        if log_type == "performance":
+            return self._browser.read_log(self._handle)
+        return self._run(lambda: self._browser.driver.get_log(log_type))
+
+    def quit(self) -> None:
+        self._pool.release(self)
+
+
+class _TabElement:
+    """TabDriver 탭에서 찾은 WebElement 프록시."""
+
+    def __init__(self, tab: TabDriver, element: WebElement) -> None:
+        self._tab = tab
+        self._element = element
+
+    def __getattr__(self, name: str) -> Any:
+        return self._tab._bind(self._element, name)
+
+
+class TabPool:
+    """
+    프로세스 전역 탭 풀. 빈 탭 자리가 있는 브라우저에서 탭을 열고, 없으면 브라우저를 새로 띄움.
+    브라우저 수는 동시 작업 수 / tabs_per_driver 로 유지 (scheduler 워커 수 = MAX_CONCURRENT_DRIVERS × TABS_PER_DRIVER).
+    """
+
+    def __init__(self, tabs_per_driver: int = TABS_PER_DRIVER) -> None:
+        self.tabs_per_driver = tabs_per_driver
+        self._lock = threading.Lock()
+        self._browsers: list[_Browser] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.tabs_per_driver > 1
+
+    def acquire(self) -> TabDriver:
+        with self._lock:
+            browser = next(
+                (b for b in self._browsers if not b.broken and b.tabs < self.tabs_per_driver), None
+            )
+            create = browser is None
+            if create:
+                browser = _Browser()
+                self._browsers.append(browser)
+            browser.tabs += 1
+            self._update_gauges()
+        try:
+            if create:
+                browser.start()
+            else:
+                browser.ready.wait()
+                if browser.broken:
+                    raise RuntimeError("shared browser failed to start")
+            handle = browser.open_tab()
+        except Exception:
+            self._release_slot(browser)
+            raise
+        return TabDriver(self, browser, handle)
+
+    def release(self, tab: TabDriver) -> None:
+        browser = tab._browser
+        if not self._release_slot(browser):
+            browser.close_tab(tab._handle)
+
+    def _release_slot(self, browser: _Browser) -> bool:
+        """탭 자리 반납. 마지막 탭이면 브라우저를 풀에서 빼고 종료한 뒤 True."""
+        with self._lock:
+            browser.tabs -= 1
+            last = browser.tabs == 0
+            if last:
+                self._browsers.remove(browser)
+            self._update_gauges()
+        if last:
+            browser.quit()
+            logger.info("탭 공유 브라우저 종료")
+        return last
+
+    def _update_gauges(self) -> None:
+        TAB_BROWSERS.set(len(self._browsers))
+        TABS_OPEN.set(sum(b.tabs for b in self._browsers))
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {"browsers": len(self._browsers), "tabs": sum(b.tabs for b in self._browsers)}
+
+
+TAB_POOL = TabPool()
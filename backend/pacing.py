@@ -0,0 +1,139 @@
+"""
+호스트별 적응형 요청 속도 제어 — 모든 작업·드라이버가 공유하는 토큰 버킷.
+정상 응답이 이어지면 속도를 조금씩 올리고(가산 증가), 차단 신호(빈 첫 페이지, captcha, HTTP 429)가
+오면 속도를 절반으로 줄이고 지수 백오프 동안 대기(곱셈 감소). 이후 성공이 이어지면 자동 회복.
+스레드 안전: threading.Condition 사용.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+
+from metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+# 초당 페이지 이동 수 (호스트당, 모든 작업 합산)
+PACING_START_RATE = _env_float("PACING_START_RATE", 0.4)
+PACING_MIN_RATE = _env_float("PACING_MIN_RATE", 0.05)
+PACING_MAX_RATE = _env_float("PACING_MAX_RATE", 2.0)
+# 성공 1회당 증가량, 차단 시 감소 배율
+PACING_INCREASE_STEP = _env_float("PACING_INCREASE_STEP", 0.05)
+PACING_DECREASE_FACTOR = _env_float("PACING_DECREASE_FACTOR", 0.5)
+# 토큰 간격에 더하는 무작위 비율 (0.3 이면 간격의 0~30% 추가)
+PACING_JITTER = _env_float("PACING_JITTER", 0.3)
+# 차단 후 대기(초): base * 2^(연속 차단 - 1), 최대 max
+PACING_BACKOFF_BASE = _env_float("PACING_BACKOFF_BASE", 10.0)
+PACING_BACKOFF_MAX = _env_float("PACING_BACKOFF_MAX", 300.0)
+
+PACING_RATE = Gauge("crawl_pacing_rate", "호스트별 현재 허용 속도 (페이지 이동/초)", ("host",))
+PACING_BLOCKS_TOTAL = Counter("crawl_pacing_blocks_total", "감지된 차단 신호 수", ("host", "reason"))
+PACING_WAIT_SECONDS_TOTAL = Counter("crawl_pacing_wait_seconds_total", "속도 제어로 대기한 누적 시간(초)", ("host",))
+
+
+class _HostState:
+    __slots__ = ("rate", "tokens", "updated", "blocked_until", "strikes")
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.strikes = 0
+
+
+class AdaptiveRateController:
+    """호스트별 토큰 버킷 (용량 1 — 버스트 없이 간격 유지) + AIMD 속도 조절 + 지수 백오프."""
+
+    def __init__(
+        self,
+        start_rate: float = PACING_START_RATE,
+        min_rate: float = PACING_MIN_RATE,
+        max_rate: float = PACING_MAX_RATE,
+    ) -> None:
+        self._cond = threading.Condition()
+        self._hosts: dict[str, _HostState] = {}
+        self.start_rate = start_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.start_rate)
+            PACING_RATE.set(state.rate, host=host)
+        return state
+
+    def acquire(self, host: str) -> float:
+        """토큰 하나를 얻을 때까지 대기 후 대기 시간(초) 반환. 백오프 중이면 해제 시각까지 대기."""
+        start = time.monotonic()
+        with self._cond:
+            while True:
+                state = self._state(host)
+                now = time.monotonic()
+                state.tokens = min(1.0, state.tokens + (now - state.updated) * state.rate)
+                state.updated = now
+                if now < state.blocked_until:
+                    wait = state.blocked_until - now
+                elif state.tokens >= 1.0:
+                    state.tokens -= 1.0
+                    break
+                else:
+                    wait = (1.0 - state.tokens) / state.rate
+                self._cond.wait(timeout=wait)
+            jitter = random.uniform(0.0, PACING_JITTER) / state.rate
+        time.sleep(jitter)
+        waited = time.monotonic() - start
+        PACING_WAIT_SECONDS_TOTAL.inc(waited, host=host)
+        return waited
+
+    def report_success(self, host: str) -> None:
+        """정상 페이지 수신 — 속도 가산 증가, 연속 차단 횟수 감소."""
+        with self._cond:
+            state = self._state(host)
+            state.rate = min(self.max_rate, state.rate + PACING_INCREASE_STEP)
+            state.strikes = max(0, state.strikes - 1)
+            PACING_RATE.set(state.rate, host=host)
+
+    def report_block(self, host: str, reason: str) -> float:
+        """차단 신호 — 속도 절반, 지수 백오프 설정. 백오프 시간(초) 반환."""
+        with self._cond:
+            state = self._state(host)
+            state.strikes += 1
+            state.rate = max(self.min_rate, state.rate * PACING_DECREASE_FACTOR)
+            state.tokens = 0.0
+            backoff = min(PACING_BACKOFF_MAX, PACING_BACKOFF_BASE * 2 ** (state.strikes - 1))
+            backoff *= random.uniform(1.0, 1.0 + PACING_JITTER)
+            state.blocked_until = max(state.blocked_until, time.monotonic() + backoff)
+            PACING_RATE.set(state.rate, host=host)
+            self._cond.notify_all()
+        PACING_BLOCKS_TOTAL.inc(host=host, reason=reason)
+        logger.warning("차단 신호 감지: host=%s, reason=%s → 속도 %.3f/s, %.0f초 대기", host, reason, state.rate, backoff)
+        return backoff
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """호스트별 현재 속도·백오프 남은 시간."""
+        now = time.monotonic()
+        with self._cond:
+            return {
+                host: {
+                    "rate": round(s.rate, 3),
+                    "backoff_remaining": round(max(0.0, s.blocked_until - now), 1),
+                    "strikes": s.strikes,
+                }
+                for host, s in self._hosts.items()
+            }
+
+
+# 프로세스 전역 공유 인스턴스
+RATE_CONTROLLER = AdaptiveRateController()
@@ -0,0 +1,191 @@
+"""
+작업 단위 프로파일링 — profile=true 로 시작한 작업만 대상.
+Python: 대상 스레드 스택을 주기적으로 샘플링(sys._current_frames)해 collapsed stack(flamegraph 입력 형식)으로 저장.
+Chrome: chromedriver performance 로그의 Tracing 이벤트를 모아 DevTools 에서 열 수 있는 trace JSON 으로 저장.
+산출물은 PROFILE_DIR/{job_id}/ 에 저장, 동시 프로파일 작업 수는 MAX_PROFILED_JOBS 로 제한.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "airbnb_crawler_profiles")
+MAX_PROFILED_JOBS = max(1, int(os.environ.get("MAX_PROFILED_JOBS", "1")))
+# 샘플링 간격(초) — 5ms 면 대상 스레드 오버헤드는 수 % 이내
+SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL", "0.005"))
+
+# DevTools Performance 패널에서 필요한 카테고리
+CHROME_TRACE_CATEGORIES = ",".join([
+    "devtools.timeline",
+    "disabled-by-default-devtools.timeline",
+    "disabled-by-default-devtools.timeline.frame",
+    "v8.execute",
+    "blink.user_timing",
+    "loading",
+    "latencyInfo",
+])
+
+PYTHON_PROFILE_FILE = "python_profile.collapsed.txt"
+PYTHON_TOP_FILE = "python_top.txt"
+EXPORT_PROFILE_FILE = "export_profile.collapsed.txt"
+CHROME_TRACE_FILE = "chrome_trace.json"
+
+_slots = threading.BoundedSemaphore(MAX_PROFILED_JOBS)
+
+
+def try_acquire_slot() -> bool:
+    """프로파일 슬롯 확보 (대기하지 않음). 실패 시 False."""
+    return _slots.acquire(blocking=False)
+
+
+def slot_available() -> bool:
+    """지금 프로파일 슬롯이 비어 있는지 (확보하지 않음 — 요청 접수 시 빠른 거절용)."""
+    if not _slots.acquire(blocking=False):
+        return False
+    _slots.release()
+    return True
+
+
+def release_slot() -> None:
+    """프로파일 슬롯 반환."""
+    try:
+        _slots.release()
+    except ValueError:
+        logger.warning("프로파일 슬롯 반환 횟수가 확보 횟수보다 많습니다.")
+
+
+def _safe_job_path(job_id: str) -> str | None:
+    """PROFILE_DIR 바로 아래의 작업 디렉터리 실제 경로. 밖을 가리키면("..", 절대 경로, 심볼릭 링크) None."""
+    root = os.path.realpath(PROFILE_DIR)
+    path = os.path.realpath(os.path.join(root, job_id))
+    if os.path.dirname(path) != root:
+        return None
+    return path
+
+
+def job_dir(job_id: str) -> str:
+    """작업별 산출물 디렉터리 (없으면 생성)."""
+    path = _safe_job_path(job_id)
+    if path is None:
+        raise ValueError(f"invalid job id for profile dir: {job_id!r}")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def list_artifacts(job_id: str) -> list[str]:
+    """작업의 산출물 파일명 목록."""
+    path = _safe_job_path(job_id)
+    if path is None or not os.path.isdir(path):
+        return []
+    return sorted(
+        f for f in os.listdir(path)
+        if os.path.isfile(os.path.join(path, f)) and not os.path.islink(os.path.join(path, f))
+    )
+
+
+def artifact_path(job_id: str, name: str) -> str | None:
+    """산출물 절대 경로. 목록에 없는 이름이나 작업 디렉터리 밖을 가리키는 경로는 None."""
+    if name not in list_artifacts(job_id):
+        return None
+    path = _safe_job_path(job_id)
+    full = os.path.realpath(os.path.join(path, name))
+    if os.path.dirname(full) != path:
+        return None
+    return full
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    한 스레드의 호출 스택을 별도 스레드에서 주기적으로 샘플링.
+    with SamplingProfiler() as prof: ... 후 prof.write_collapsed(path)
+    """
+
+    def __init__(self, thread_id: int | None = None, interval: float = SAMPLE_INTERVAL) -> None:
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples: Counter[tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.started_at = 0.0
+        self.duration = 0.0
+
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.samples[tuple(reversed(stack))] += 1
+
+    def write_collapsed(self, path: str) -> None:
+        """'a;b;c 횟수' 형식 (flamegraph.pl / speedscope 입력)."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(";".join(stack) + f" {count}\n")
+
+    def write_top(self, path: str, limit: int = 40) -> None:
+        """함수별 self/total 샘플 비율 요약."""
+        total = sum(self.samples.values()) or 1
+        self_counts: Counter[str] = Counter()
+        total_counts: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+        lines = [
+            f"duration: {self.duration:.3f}s, samples: {total}, interval: {self.interval * 1000:.1f}ms",
+            "",
+            f"{'self%':>7} {'total%':>7}  function",
+        ]
+        for label, count in total_counts.most_common(limit):
+            lines.append(f"{100 * self_counts[label] / total:7.2f} {100 * count / total:7.2f}  {label}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def extract_trace_events(messages: list[dict]) -> list[dict]:
+    """
+    performance 로그 메시지(crawler._read_performance_log)에서 Tracing 이벤트만 추출.
+    로그 버퍼가 넘치지 않도록 crawler 가 페이지마다 로그를 비우며 호출.
+    """
+    return [m.get("params") or {} for m in messages if m.get("method") == "Tracing.dataCollected"]
+
+
+def write_chrome_trace(path: str, trace_events: list[dict]) -> None:
+    """DevTools Performance 패널에서 불러올 수 있는 trace JSON 저장."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace_events}, f)
@@ -0,0 +1,134 @@
+"""
+응답 직렬화·압축 유틸 — 목록이 큰 응답(status/json, SSE, listings)용.
+orjson 이 있으면 사용(없으면 표준 json), Accept-Encoding 협상으로 br/gzip 압축 (임계 크기 이상만).
+작업 상태 응답은 버전별로 직렬화·압축 결과를 캐시해 여러 폴러가 재사용 (요청마다 바뀌는 작은 필드만 덧붙임).
+"""
+
+import gzip
+import json
+import threading
+import zlib
+from typing import Any, Callable
+
+from fastapi import Request
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+# 이 크기(bytes) 미만 응답은 압축하지 않음 (헤더·CPU 비용이 더 큼)
+COMPRESS_MIN_SIZE = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+
+def dumps(obj: Any) -> bytes:
+    """JSON bytes 직렬화 (UTF-8, 한글 이스케이프 없음)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_items(items: list[dict]) -> bytes:
+    """리스트 원소들을 대괄호 없이 직렬화 — 페이지별 청크를 이어 붙여 배열을 만들 때 사용."""
+    return dumps(items)[1:-1]
+
+
+def join_object_with_array(head: dict, key: str, chunks: list[bytes]) -> bytes:
+    """head 객체에 key: [청크들] 배열 필드를 붙인 JSON bytes (청크 재직렬화 없음)."""
+    prefix = dumps(head)
+    body = b",".join(c for c in chunks if c)
+    sep = b"," if len(prefix) > 2 else b""
+    return prefix[:-1] + sep + b'"' + key.encode("utf-8") + b'":[' + body + b"]}"
+
+
+def negotiate_encoding(accept_encoding: str | None, allow_br: bool = True) -> str | None:
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (br 우선, 다음 gzip). allow_br=False 면 gzip 만."""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    if allow_br and brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """지정 방식으로 압축."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+def encoded_response(body: bytes, encoding: str | None, media_type: str = "application/json") -> Response:
+    """(이미 압축된) body 로 Response 생성."""
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+def json_response(obj: Any, request: Request) -> Response:
+    """obj 를 빠르게 직렬화하고 협상된 방식으로 압축해 반환 (캐시 없음)."""
+    body = dumps(obj)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding and len(body) >= COMPRESS_MIN_SIZE:
+        return encoded_response(compress(body, encoding), encoding)
+    return encoded_response(body, None)
+
+
+class PayloadCache:
+    """
+    마지막 버전 하나의 직렬화 bytes 와 gzip 압축 상태 보관.
+    같은 버전을 여러 클라이언트가 요청하면 직렬화·압축은 한 번만 수행하고, 요청마다 바뀌는 작은 필드(tail)만
+    닫는 괄호 앞에 덧붙임 — gzip 은 본문까지 압축한 zlib 상태를 복사해 tail 만 이어서 압축.
+    brotli 는 압축 상태를 복사할 수 없어 지원하지 않음 (negotiate_encoding(allow_br=False) 로 협상).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._version = -1
+        # 닫는 괄호를 뺀 본문
+        self._prefix = b""
+        # (본문까지 처리한 gzip 압축기, 지금까지 나온 압축 bytes)
+        self._gzip: tuple[Any, bytes] | None = None
+
+    def get(
+        self, version: int, encoding: str | None, build: Callable[[], bytes], tail: bytes = b""
+    ) -> tuple[bytes, str | None]:
+        """
+        (body, 실제 적용된 encoding) 반환. build() 는 JSON 객체 bytes, tail 은 그 뒤에 붙일 '"키":값' bytes.
+        임계 크기 미만이면 압축하지 않음.
+        """
+        if encoding not in (None, "gzip"):
+            raise ValueError(f"unsupported encoding for cached payload: {encoding}")
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._prefix = build()[:-1]
+                self._gzip = None
+            prefix = self._prefix
+            suffix = (b"," + tail if tail and len(prefix) > 1 else tail) + b"}"
+            if encoding is None or len(prefix) + len(suffix) < COMPRESS_MIN_SIZE:
+                return prefix + suffix, None
+            if self._gzip is None:
+                compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+                self._gzip = (compressor, compressor.compress(prefix))
+            compressor, head = self._gzip
+            compressor = compressor.copy()
+        return head + compressor.compress(suffix) + compressor.flush(), encoding
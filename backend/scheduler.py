@@ -0,0 +1,66 @@
+"""
+크롤링 작업 스케줄러 — 프로세스 전역 워커 풀 하나로 모든 작업(단일·배치)을 실행.
+동시에 띄우는 Chrome 드라이버 수를 MAX_CONCURRENT_DRIVERS 로 제한하고(상세 정보 보강 driver 엔진 몫 포함), 초과분은 대기열(pending)에서 순서대로 실행.
+TABS_PER_DRIVER > 1 이면 작업이 공유 브라우저의 탭(multitab.py)에서 실행되므로 워커는 드라이버 수 × 탭 수.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# 프로세스 전체 Chrome 드라이버 예산 (크롤링 + driver 엔진 상세 정보 보강)
+MAX_CONCURRENT_DRIVERS = max(1, int(os.environ.get("MAX_CONCURRENT_DRIVERS", "4")))
+# Chrome 하나에서 동시에 돌릴 작업(탭) 수 — 1 이면 작업마다 드라이버 하나
+TABS_PER_DRIVER = max(1, int(os.environ.get("TABS_PER_DRIVER", "1")))
+# 상세 정보 보강이 driver 엔진(ENRICH_ENGINE=driver)이면 예산 중 ENRICH_DRIVERS 개를 공용 보강 드라이버 풀
+# (enrichment.DRIVER_POOL)에 떼어 줌 — 크롤링 드라이버는 최소 1개 남김
+if os.environ.get("ENRICH_ENGINE", "http").strip().lower() == "driver":
+    ENRICH_DRIVER_SLOTS = max(0, min(int(os.environ.get("ENRICH_DRIVERS", "2")), MAX_CONCURRENT_DRIVERS - 1))
+else:
+    ENRICH_DRIVER_SLOTS = 0
+CRAWL_DRIVERS = MAX_CONCURRENT_DRIVERS - ENRICH_DRIVER_SLOTS
+MAX_WORKERS = CRAWL_DRIVERS * TABS_PER_DRIVER
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="crawl-worker")
+_lock = threading.Lock()
+_queued = 0
+_active = 0
+
+
+def submit(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+    """작업을 워커 풀에 등록. 빈 워커가 없으면 대기열에서 기다림."""
+    global _queued
+
+    def run() -> Any:
+        global _queued, _active
+        with _lock:
+            _queued -= 1
+            _active += 1
+        try:
+            return fn(*args, **kwargs)
+        except Exception:
+            logger.exception("스케줄된 작업 오류")
+            raise
+        finally:
+            with _lock:
+                _active -= 1
+
+    with _lock:
+        _queued += 1
+    return _executor.submit(run)
+
+
+def snapshot() -> dict[str, int]:
+    """워커 풀 상태: 최대 동시 실행 수, 드라이버당 탭 수, 실행 중, 대기 중."""
+    with _lock:
+        return {
+            "max_workers": MAX_WORKERS,
+            "tabs_per_driver": TABS_PER_DRIVER,
+            "enrich_drivers": ENRICH_DRIVER_SLOTS,
+            "active": _active,
+            "queued": _queued,
+        }
@@ -0,0 +1,229 @@
+"""
+검색 공간 분할(sharding) — 페이지네이션 한도(약 15페이지) 때문에 잘리는 큰 검색을 겹치지 않는 하위 검색으로 분할.
+분할 기준: 가격대(price_min/price_max) 또는 지도 영역(ne_lat/ne_lng/sw_lat/sw_lng) 사분면.
+각 하위 검색의 결과 수를 probe 로 확인해 포화(SHARD_SATURATION 이상)면 다시 나눔 — 포화가 풀리거나
+더 나눌 수 없을 때까지 재귀. 만들어진 하위 검색은 배치 작업으로 병렬 크롤링하고 방 ID 로 중복 제거.
+probe 는 URL → 결과 수(int, 알 수 없으면 None) 함수라 로컬 mock 검색 서버로 검증 가능 (benchmarks/bench_sharding.py).
+"""
+
+import logging
+import os
+import re
+import urllib.request
+from collections import deque
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# 이 결과 수 이상이면 포화로 보고 분할 (검색 결과는 약 15페이지 × 18개까지만 노출)
+SHARD_SATURATION = int(os.environ.get("SHARD_SATURATION", "270"))
+# 하나의 검색에서 만들 최대 하위 검색 수
+MAX_SHARDS = int(os.environ.get("MAX_SHARDS", "64"))
+# 가격대 분할 하한 폭(원) — 이보다 좁은 구간은 더 나누지 않음
+MIN_PRICE_WIDTH = 1000
+# 상한 없는 가격 구간을 처음 나눌 기준(원) — 이후 구간 하한의 2배씩
+OPEN_PRICE_SPLIT = 200000
+# 지도 영역 분할 하한(위도·경도 차, 약 100m)
+MIN_BBOX_SPAN = 0.001
+
+STRATEGY_PRICE = "price"
+STRATEGY_BBOX = "bbox"
+STRATEGY_AUTO = "auto"
+
+BBOX_KEYS = ("ne_lat", "ne_lng", "sw_lat", "sw_lng")
+# 하위 검색 URL 에서 제거할 페이지 위치 파라미터
+_PAGING_KEYS = ("items_offset", "cursor", "section_offset", "pagination_search")
+
+_COUNT_PATTERNS = (
+    re.compile(r"숙소\s*([\d,]+)\s*개"),
+    re.compile(r"([\d,]+)\s*개\s*(?:이상의\s*)?숙소"),
+    re.compile(r"([\d,]+)\+?\s*(?:places|homes|stays)", re.IGNORECASE),
+)
+
+Probe = Callable[[str], "int | None"]
+
+
+def parse_result_count(text: str) -> int | None:
+    """검색 결과 제목 텍스트에서 결과 수 추출. '서울의 숙소 1,000개 이상' → 1000, 없으면 None."""
+    for pattern in _COUNT_PATTERNS:
+        m = pattern.search(text or "")
+        if m:
+            return int(m.group(1).replace(",", ""))
+    return None
+
+
+def with_params(url: str, params: dict[str, Any]) -> str:
+    """URL 쿼리 파라미터 덮어쓰기 (값이 None 이면 제거), 페이지 위치 파라미터는 항상 제거."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in params and k not in _PAGING_KEYS]
+    query.extend((k, str(v)) for k, v in params.items() if v is not None)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _query(url: str) -> dict[str, str]:
+    return dict(parse_qsl(urlsplit(url).query))
+
+
+class Shard:
+    """하위 검색 하나: 분할 파라미터와 probe 로 확인한 결과 수."""
+
+    __slots__ = ("url", "params", "depth", "count")
+
+    def __init__(self, url: str, params: dict[str, Any], depth: int = 0, count: int | None = None) -> None:
+        self.url = url
+        self.params = params
+        self.depth = depth
+        self.count = count
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"url": self.url, "params": self.params, "depth": self.depth, "count": self.count}
+
+
+def _split_price(base_url: str, shard: Shard) -> list[Shard] | None:
+    """가격 구간 [lo, hi] 를 겹치지 않는 두 구간으로 분할. 더 나눌 수 없으면 None."""
+    lo = int(shard.params.get("price_min") or 0)
+    hi = shard.params.get("price_max")
+    if hi is None:
+        mid = max(OPEN_PRICE_SPLIT, lo * 2)
+    else:
+        hi = int(hi)
+        if hi - lo < 2 * MIN_PRICE_WIDTH:
+            return None
+        mid = (lo + hi) // 2
+    halves = ({"price_min": lo, "price_max": mid}, {"price_min": mid + 1, "price_max": hi})
+    return [Shard(with_params(base_url, p), p, shard.depth + 1) for p in halves]
+
+
+def _split_bbox(base_url: str, shard: Shard) -> list[Shard] | None:
+    """지도 영역을 사분면 4개로 분할 (경계는 한쪽에만 포함되도록 1e-6 간격). 더 나눌 수 없으면 None."""
+    ne_lat, ne_lng = float(shard.params["ne_lat"]), float(shard.params["ne_lng"])
+    sw_lat, sw_lng = float(shard.params["sw_lat"]), float(shard.params["sw_lng"])
+    if ne_lat - sw_lat < 2 * MIN_BBOX_SPAN and ne_lng - sw_lng < 2 * MIN_BBOX_SPAN:
+        return None
+    mid_lat = round((ne_lat + sw_lat) / 2, 6)
+    mid_lng = round((ne_lng + sw_lng) / 2, 6)
+    eps = 1e-6
+    quads = (
+        (ne_lat, ne_lng, mid_lat + eps, mid_lng + eps),
+        (ne_lat, mid_lng, mid_lat + eps, sw_lng),
+        (mid_lat, ne_lng, sw_lat, mid_lng + eps),
+        (mid_lat, mid_lng, sw_lat, sw_lng),
+    )
+    shards = []
+    for q in quads:
+        p = {**shard.params, **dict(zip(BBOX_KEYS, (round(v, 6) for v in q))), "search_by_map": "true"}
+        shards.append(Shard(with_params(base_url, p), p, shard.depth + 1))
+    return shards
+
+
+def resolve_strategy(search_url: str, strategy: str = STRATEGY_AUTO) -> str:
+    """요청 전략을 실제 분할 방식(price/bbox)으로 확정. URL 이 전략에 맞지 않으면 ValueError."""
+    return _initial_shard(search_url, strategy)[0]
+
+
+def _initial_shard(search_url: str, strategy: str) -> tuple[str, Shard]:
+    query = _query(search_url)
+    if strategy == STRATEGY_AUTO:
+        strategy = STRATEGY_BBOX if all(k in query for k in BBOX_KEYS) else STRATEGY_PRICE
+    if strategy == STRATEGY_BBOX:
+        if not all(k in query for k in BBOX_KEYS):
+            raise ValueError("bbox strategy requires ne_lat, ne_lng, sw_lat, sw_lng in search_url")
+        try:
+            params: dict[str, Any] = {k: float(query[k]) for k in BBOX_KEYS}
+        except ValueError:
+            raise ValueError("invalid bbox coordinates in search_url")
+    elif strategy == STRATEGY_PRICE:
+        try:
+            params = {"price_min": int(query.get("price_min") or 0)}
+            params["price_max"] = int(query["price_max"]) if query.get("price_max") else None
+        except ValueError:
+            raise ValueError("invalid price_min/price_max in search_url")
+    else:
+        raise ValueError(f"unknown strategy: {strategy}")
+    return strategy, Shard(search_url, params)
+
+
+def plan_shards(
+    search_url: str,
+    probe: Probe,
+    strategy: str = STRATEGY_AUTO,
+    saturation: int = SHARD_SATURATION,
+    max_shards: int = MAX_SHARDS,
+) -> dict[str, Any]:
+    """
+    포화된 검색을 재귀적으로 분할한 하위 검색 목록 계획.
+    response: { "strategy", "shards": [Shard.to_dict()], "probes": probe 호출 수, "estimated_total", "truncated" }
+    truncated=True 면 max_shards 나 최소 분할 폭에 걸려 여전히 포화된 하위 검색이 남음.
+    """
+    strategy, root = _initial_shard(search_url, strategy)
+    split = _split_bbox if strategy == STRATEGY_BBOX else _split_price
+    pending = deque([root])
+    done: list[Shard] = []
+    probes = 0
+    truncated = False
+    while pending:
+        shard = pending.popleft()
+        if shard.count is None:
+            shard.count = probe(shard.url)
+            probes += 1
+        if shard.count is None:
+            logger.warning("결과 수 확인 실패, 분할하지 않음: %s", shard.url)
+        if shard.count is not None and shard.count == 0 and shard is not root:
+            continue
+        saturated = shard.count is not None and shard.count >= saturation
+        if saturated:
+            children = split(search_url, shard)
+            # 분할하면 하위 검색 수가 (대기 + 완료 + 새 하위) 로 늘어남
+            if children and len(done) + len(pending) + len(children) <= max_shards:
+                pending.extend(children)
+                continue
+            truncated = True
+        done.append(shard)
+    done.sort(key=lambda s: s.url)
+    logger.info(
+        "검색 분할 계획: strategy=%s, 하위 검색 %d개, probe %d회, truncated=%s",
+        strategy, len(done), probes, truncated,
+    )
+    return {
+        "strategy": strategy,
+        "shards": [s.to_dict() for s in done],
+        "probes": probes,
+        "estimated_total": sum(s.count or 0 for s in done),
+        "truncated": truncated,
+    }
+
+
+def http_probe(url: str, timeout: float = 10) -> int | None:
+    """HTML 을 HTTP 로 받아 결과 수 파싱 (mock 검색 서버·테스트용 — 실제 사이트는 브라우저 probe 사용)."""
+    req = urllib.request.Request(url, headers={"Accept-Language": "ko-KR"})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        text = resp.read().decode("utf-8", errors="replace")
+    return parse_result_count(text)
+
+
+class BrowserProbe:
+    """
+    드라이버 하나로 각 하위 검색 첫 페이지를 열어 결과 수 확인 (호스트별 속도 제어 적용).
+    with BrowserProbe() as probe: plan_shards(url, probe)
+    """
+
+    def __init__(self) -> None:
+        self._driver: Any = None
+
+    def __enter__(self) -> "BrowserProbe":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception:
+                pass
+            self._driver = None
+
+    def __call__(self, url: str) -> int | None:
+        import crawler
+        if self._driver is None:
+            self._driver = crawler.create_driver()
+        return crawler.probe_result_count(self._driver, url)
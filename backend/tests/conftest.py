@@ -0,0 +1,14 @@
+"""
+pytest 공통 설정 — backend 폴더를 import 경로에 추가하고, 모듈 import 전에 테스트용 환경 변수 지정
+(기동 시 크롤러 사전 준비 끔, 이력 DB 는 임시 파일).
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+os.environ.setdefault("CRAWLER_WARMUP", "0")
+os.environ.setdefault("HISTORY_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="crawler-tests-"), "history.sqlite3"))
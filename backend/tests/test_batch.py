@@ -0,0 +1,70 @@
+import pytest
+
+import batch
+from batch import expand_batch_urls, expand_template
+
+
+def test_expand_template_product_in_order_and_quoted():
+    urls = expand_template(
+        "https://www.airbnb.co.kr/s/{city}/homes?checkin={checkin}",
+        {"city": ["서울", "부산"], "checkin": ["2026-11-01", "2026-11-08"]},
+    )
+    assert urls == [
+        "https://www.airbnb.co.kr/s/%EC%84%9C%EC%9A%B8/homes?checkin=2026-11-01",
+        "https://www.airbnb.co.kr/s/%EC%84%9C%EC%9A%B8/homes?checkin=2026-11-08",
+        "https://www.airbnb.co.kr/s/%EB%B6%80%EC%82%B0/homes?checkin=2026-11-01",
+        "https://www.airbnb.co.kr/s/%EB%B6%80%EC%82%B0/homes?checkin=2026-11-08",
+    ]
+
+
+def test_expand_template_repeated_field_uses_same_value():
+    assert expand_template("/s/{city}?q={city}", {"city": ["a b"]}) == ["/s/a%20b?q=a%20b"]
+
+
+@pytest.mark.parametrize(
+    "template, params, message",
+    [
+        ("/s/{city}", {}, "missing params"),
+        ("/s/{city}", {"city": []}, "missing params"),
+        ("/s/{city}", {"city": ["a"], "guests": ["2"]}, "not used"),
+        ("/s/{0}", {}, "invalid template field"),
+        ("/s/{city.name}", {"city": ["a"]}, "invalid template field"),
+    ],
+)
+def test_expand_template_rejects_bad_input(template, params, message):
+    with pytest.raises(ValueError, match=message):
+        expand_template(template, params)
+
+
+def test_expand_template_limits_url_count(monkeypatch):
+    monkeypatch.setattr(batch, "MAX_BATCH_URLS", 3)
+    with pytest.raises(ValueError, match="too many urls"):
+        expand_template("/s/{a}/{b}", {"a": ["1", "2"], "b": ["1", "2"]})
+
+
+def test_expand_batch_urls_merges_and_dedupes():
+    urls = expand_batch_urls(
+        search_urls=[" /s/x ", "", "/s/%EC%84%9C%EC%9A%B8"],
+        url_template="/s/{city}",
+        params={"city": ["서울", "y"]},
+    )
+    assert urls == ["/s/x", "/s/%EC%84%9C%EC%9A%B8", "/s/y"]
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({}, "no search urls"),
+        ({"search_urls": ["  "]}, "no search urls"),
+        ({"search_urls": ["/s/x"], "params": {"city": ["a"]}}, "requires url_template"),
+    ],
+)
+def test_expand_batch_urls_rejects_bad_input(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        expand_batch_urls(**kwargs)
+
+
+def test_expand_batch_urls_limits_total(monkeypatch):
+    monkeypatch.setattr(batch, "MAX_BATCH_URLS", 2)
+    with pytest.raises(ValueError, match="too many urls"):
+        expand_batch_urls(search_urls=["/a", "/b", "/c"])
@@ -0,0 +1,102 @@
+import asyncio
+import io
+import json
+import threading
+
+import anyio.to_thread
+import httpx
+import openpyxl
+import pytest
+
+import main
+
+NDJSON = "application/x-ndjson"
+
+
+async def _post(body, content_type: str) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as client:
+        return await client.post("/excel-from-listings", content=body, headers={"Content-Type": content_type})
+
+
+def _ndjson(rows: int, start: int = 0) -> bytes:
+    return b"".join(
+        json.dumps({"no": i + 1, "title": f"숙소 {i + 1}", "price": "₩100,000"}, ensure_ascii=False).encode() + b"\n"
+        for i in range(start, start + rows)
+    )
+
+
+async def _chunked(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+        await asyncio.sleep(0)
+
+
+def _sheet_rows(content: bytes) -> list[tuple]:
+    wb = openpyxl.load_workbook(io.BytesIO(content), read_only=True)
+    return list(wb.active.iter_rows(values_only=True))
+
+
+@pytest.mark.parametrize(
+    "body, detail",
+    [
+        (b'{"no": 1, "title": "a"}\n{"no": 2, \n', "line 2: invalid JSON"),
+        (b'{"no": 1}\n[1, 2]\n', "line 2: expected a JSON object"),
+    ],
+)
+def test_invalid_ndjson_returns_400_with_line(body, detail):
+    response = asyncio.run(_post(body, NDJSON))
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith(detail)
+
+
+def test_non_utf8_csv_returns_400():
+    response = asyncio.run(_post(b"no,title\n1,\xff\xfe\n", "text/csv"))
+    assert response.status_code == 400
+
+
+def test_invalid_line_early_in_large_upload_returns_400():
+    # 변환이 먼저 끝나도 나머지 본문을 모두 받아 버리고 응답해야 함 (수신 쪽이 큐에서 멈추지 않음)
+    body = _chunked(b"not json\n", *(_ndjson(200, start) for start in range(0, 20000, 200)))
+    response = asyncio.run(asyncio.wait_for(_post(body, NDJSON), 30))
+    assert response.status_code == 400
+    assert "line 1" in response.json()["detail"]
+
+
+def test_ndjson_and_csv_uploads_convert():
+    response = asyncio.run(_post(_chunked(_ndjson(10), _ndjson(5, 10)), NDJSON))
+    assert response.status_code == 200
+    assert response.headers["x-row-count"] == "15"
+    assert len(_sheet_rows(response.content)) == 16
+
+    csv_body = "번호,숙소명,가격\n1,광안리 숙소,\"₩120,000\"\n".encode("utf-8-sig")
+    response = asyncio.run(_post(csv_body, "text/csv"))
+    assert response.status_code == 200
+    assert response.headers["x-row-count"] == "1"
+
+
+def test_control_characters_are_stripped():
+    body = json.dumps({"no": 1, "title": "숙소\x01\x0b이름"}).encode() + b"\n"
+    response = asyncio.run(_post(body, NDJSON))
+    assert response.status_code == 200
+    assert any("숙소이름" in row for row in _sheet_rows(response.content))
+
+
+def test_concurrent_uploads_do_not_exhaust_threadpool():
+    """동시 업로드 수가 공용 스레드풀 토큰 수보다 많아도 교착 없이 모두 완료."""
+
+    async def run() -> list[httpx.Response]:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 2
+        uploads = [
+            _post(_chunked(*(_ndjson(50, start) for start in range(0, 2000, 50))), NDJSON) for _ in range(6)
+        ]
+        return await asyncio.gather(*uploads)
+
+    # 교착되면 이벤트 루프가 멈춰 취소도 안 되므로 별도 스레드에서 실행하고 제한 시간만 기다림
+    result: dict[str, list[httpx.Response]] = {}
+    thread = threading.Thread(target=lambda: result.update(responses=asyncio.run(run())), daemon=True)
+    thread.start()
+    thread.join(60)
+    assert not thread.is_alive(), "concurrent uploads deadlocked"
+    responses = result["responses"]
+    assert [r.status_code for r in responses] == [200] * 6
+    assert {r.headers["x-row-count"] for r in responses} == {"2000"}
@@ -0,0 +1,87 @@
+import pytest
+
+from history_store import MODE_DELTA, HistoryStore, normalize_search_key
+
+SEARCH = "https://www.airbnb.co.kr/s/부산/homes?adults=2&checkin=2026-11-01"
+
+
+def _room(room_id: int, price: int, rating: str = "4.8 (10)") -> dict:
+    return {
+        "title": f"숙소 {room_id}",
+        "url": f"https://www.airbnb.co.kr/rooms/{room_id}?adults=2",
+        "price": f"₩{price:,}",
+        "rating": rating,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = HistoryStore(str(tmp_path / "history.sqlite3"))
+    yield s
+    s.close()
+
+
+def _run(store: HistoryStore, pages: list[list[dict]], status: str = "completed", **kwargs) -> int:
+    run_id = store.start_run(SEARCH, **kwargs)
+    for page in pages:
+        store.record_page(run_id, page)
+    store.finish_run(run_id, status, stopped_early=kwargs.get("mode") == MODE_DELTA)
+    return run_id
+
+
+def test_first_run_reports_everything_new(store):
+    run_id = _run(store, [[_room(1, 100000), _room(2, 200000)], [_room(3, 300000)]])
+    changes = store.changes(run_id)
+    assert changes["previous_run_id"] is None
+    assert [c["room_id"] for c in changes["new"]] == ["1", "2", "3"]
+    assert changes["repriced"] == [] and changes["rating_changed"] == []
+    assert changes["removed"] is None
+
+
+def test_second_run_reports_new_repriced_rating_and_removed(store):
+    first = _run(store, [[_room(1, 100000), _room(2, 200000), _room(3, 300000)]])
+    second = _run(store, [[_room(1, 90000), _room(2, 200000, "4.5 (12)"), _room(4, 400000)]])
+    changes = store.changes(second)
+    assert changes["previous_run_id"] == first
+    assert [c["room_id"] for c in changes["new"]] == ["4"]
+    repriced = changes["repriced"]
+    assert [(c["room_id"], c["prev_price_value"], c["price_value"]) for c in repriced] == [("1", 100000, 90000)]
+    rating = changes["rating_changed"]
+    assert [(c["room_id"], c["prev_rating_value"], c["rating_value"]) for c in rating] == [("2", 4.8, 4.5)]
+    assert [c["room_id"] for c in changes["removed"]] == ["3"]
+
+
+def test_partial_runs_do_not_report_removed(store):
+    _run(store, [[_room(1, 100000), _room(2, 200000)]])
+    delta = _run(store, [[_room(1, 100000)]], mode=MODE_DELTA)
+    assert store.changes(delta)["stopped_early"] is True
+    assert store.changes(delta)["removed"] is None
+    failed = _run(store, [[_room(1, 100000)]], status="failed")
+    assert store.changes(failed)["removed"] is None
+
+
+def test_removed_compares_against_last_complete_run(store):
+    _run(store, [[_room(1, 100000), _room(2, 200000), _room(3, 300000)]])
+    # 조기 종료 실행에서만 본 숙소도 다음 전체 실행에서 보이지 않으면 사라진 것으로 판단
+    _run(store, [[_room(5, 500000)]], mode=MODE_DELTA)
+    full = _run(store, [[_room(1, 100000)]])
+    assert [c["room_id"] for c in store.changes(full)["removed"]] == ["2", "3", "5"]
+
+
+def test_record_page_counts_and_skips_rows_without_room_id(store):
+    run_id = store.start_run(SEARCH)
+    counts = store.record_page(run_id, [_room(1, 100000), {"title": "링크 없음", "url": ""}])
+    assert counts == {"new": 1, "changed": 0, "unchanged": 0, "skipped": 1}
+    counts = store.record_page(run_id, [_room(1, 100000)])
+    assert counts == {"new": 0, "changed": 0, "unchanged": 1, "skipped": 0}
+    assert store.run_room_ids(run_id) == {"1"}
+
+
+def test_unknown_run(store):
+    assert store.changes(12345) is None
+
+
+def test_search_key_ignores_paging_and_param_order():
+    a = normalize_search_key("https://WWW.airbnb.co.kr/s/부산/homes/?checkin=2026-11-01&adults=2&items_offset=18")
+    b = normalize_search_key("https://www.airbnb.co.kr/s/부산/homes?adults=2&checkin=2026-11-01&cursor=abc")
+    assert a == b
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from job_manager import JobManager
+
+PAGES = [3, 4, 2]
+
+
+@pytest.fixture
+def job():
+    job_id = JobManager.create_job("https://www.airbnb.co.kr/s/부산/homes", max_pages=len(PAGES))
+    rows: list[dict] = []
+    for page, size in enumerate(PAGES, start=1):
+        new = [{"no": len(rows) + i + 1, "title": f"숙소 {len(rows) + i + 1}"} for i in range(size)]
+        rows += new
+        JobManager.set_page_result(job_id, page, new, rows)
+    yield job_id, rows
+    with JobManager._lock:
+        JobManager._jobs.pop(job_id, None)
+
+
+def _listings(job_id: str, since: int) -> list[dict]:
+    body, encoding = JobManager.get_status_payload(job_id, since=since)
+    assert encoding is None
+    return json.loads(body)["listings"]
+
+
+@pytest.mark.parametrize("since", range(sum(PAGES) + 2))
+def test_status_since_returns_remaining_rows(job, since):
+    job_id, rows = job
+    assert _listings(job_id, since) == rows[since:]
+
+
+def test_chunk_boundary_reuses_serialized_chunks(job):
+    job_id, _ = job
+    stored = JobManager._jobs[job_id]
+    assert stored["chunk_starts"] == [0, 3, 7]
+    chunks = JobManager._chunks_since(stored, 3)
+    assert chunks == stored["listing_chunks"][1:]
+    assert all(a is b for a, b in zip(chunks, stored["listing_chunks"][1:]))
+
+
+def test_mid_chunk_reserializes_only_the_partial_chunk(job):
+    job_id, rows = job
+    stored = JobManager._jobs[job_id]
+    chunks = JobManager._chunks_since(stored, 5)
+    assert len(chunks) == 2
+    assert json.loads(b"[" + chunks[0] + b"]") == rows[5:7]
+    assert chunks[1] is stored["listing_chunks"][2]
+
+
+def test_since_past_end_is_empty(job):
+    job_id, rows = job
+    assert _listings(job_id, len(rows)) == []
+    assert _listings(job_id, len(rows) + 5) == []
@@ -0,0 +1,123 @@
+import base64
+import json
+
+import pytest
+
+from listing_index import ListingIndex, _encode_cursor, parse_price, tokenize
+
+
+def _rows(n: int) -> list[dict]:
+    return [
+        {
+            "no": i + 1,
+            "title": "광안리 오션뷰" if i % 2 else "해운대 숙소",
+            "price": f"₩{(i * 37 % 50 + 1) * 1000:,}" if i % 7 else "",
+            "rating": f"{4 + i % 10 / 10:.1f} ({i})",
+        }
+        for i in range(n)
+    ]
+
+
+def _expected(rows: list[dict], order: str, q: str | None, ranges: dict | None) -> list[int]:
+    """정렬 인덱스 없이 직접 거르고 정렬한 가격순 번호 (가격 없는 행은 끝, 같은 값은 행 순서)."""
+    keys = []
+    for pos, item in enumerate(rows):
+        price = parse_price(item["price"])
+        if q and not all(any(t.startswith(tok) for t in tokenize(item["title"])) for tok in tokenize(q)):
+            continue
+        low, high = (ranges or {}).get("price", (None, None))
+        if (low is not None or high is not None) and (
+            price is None or (low is not None and price < low) or (high is not None and price > high)
+        ):
+            continue
+        keys.append((1, 0, pos) if price is None else (0, price if order == "asc" else -price, pos))
+    return [rows[key[2]]["no"] for key in sorted(keys)]
+
+
+def _page_all(index: ListingIndex, **query) -> list[int]:
+    seen, cursor = [], None
+    while True:
+        page = index.query(limit=7, cursor=cursor, **query)
+        seen += [item["no"] for item in page["listings"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return seen
+
+
+def _raw_cursor(key: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode().rstrip("=")
+
+
+@pytest.fixture
+def index() -> ListingIndex:
+    idx = ListingIndex()
+    idx.extend(_rows(120))
+    return idx
+
+
+@pytest.mark.parametrize("order", ["asc", "desc"])
+@pytest.mark.parametrize(
+    "q, ranges",
+    [
+        (None, None),
+        ("광안", None),
+        (None, {"price": (20000, None)}),
+        (None, {"price": (1000, 3000)}),
+    ],
+)
+def test_cursor_pages_cover_sorted_results_once(index, order, q, ranges):
+    expected = _expected(_rows(120), order, q, ranges)
+    assert _page_all(index, sort="price", order=order, q=q, ranges=ranges) == expected
+    first = index.query(limit=7, sort="price", order=order, q=q, ranges=ranges)
+    assert first["total"] == len(expected)
+
+
+def test_missing_values_sort_last(index):
+    listings = index.query(limit=1000, sort="price", order="desc")["listings"]
+    missing = [bool(item["price"]) for item in listings]
+    assert missing == sorted(missing, reverse=True)
+
+
+def test_rows_added_during_paging_are_not_duplicated(index):
+    first = index.query(limit=10, sort="no")
+    index.extend([{"no": 0, "title": "새 숙소", "price": "₩500", "rating": ""}])
+    second = index.query(limit=10, sort="no", cursor=first["next_cursor"])
+    assert [item["no"] for item in second["listings"]] == list(range(11, 21))
+
+
+def test_cursor_from_other_sort_is_rejected(index):
+    cursor = index.query(limit=5, sort="price")["next_cursor"]
+    with pytest.raises(ValueError, match="sort/order"):
+        index.query(limit=5, sort="rating", cursor=cursor)
+    with pytest.raises(ValueError, match="sort/order"):
+        index.query(limit=5, sort="price", order="desc", cursor=cursor)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not-base64!",
+        _raw_cursor({"sort": "price"}),
+        _raw_cursor(["price", "asc", 0, 1000]),
+        _raw_cursor(["price", "asc", 2, 1000, 3]),
+        _raw_cursor(["price", "asc", True, 1000, 3]),
+        _raw_cursor(["price", "asc", 0, "1000", 3]),
+        _raw_cursor(["price", "asc", 0, 1000, -1]),
+        _raw_cursor(["price", "asc", 0, 1000, 1.5]),
+    ],
+)
+def test_malformed_cursor_is_rejected(index, cursor):
+    with pytest.raises(ValueError):
+        index.query(limit=5, sort="price", cursor=cursor)
+
+
+def test_encoded_cursor_round_trips(index):
+    cursor = _encode_cursor("price", "asc", (0, 1000, 3))
+    page = index.query(limit=5, sort="price", cursor=cursor)
+    assert page["count"] == 5
+
+
+@pytest.mark.parametrize("query", [{"sort": "title"}, {"order": "up"}])
+def test_invalid_sort_or_order_is_rejected(index, query):
+    with pytest.raises(ValueError):
+        index.query(**query)
@@ -0,0 +1,61 @@
+from listing_stats import ListingStats
+
+
+def _item(price: str, rating: str, address: str) -> dict:
+    return {"price": price, "rating": rating, "address": address}
+
+
+def test_empty_snapshot():
+    snap = ListingStats().snapshot()
+    assert snap["count"] == 0
+    assert snap["price"] == {"count": 0}
+    assert snap["rating"]["mean"] is None
+    assert [b["count"] for b in snap["rating"]["histogram"]] == [0, 0, 0, 0, 0]
+    assert snap["reviews_total"] == 0
+    assert snap["top_addresses_by_count"] == []
+
+
+def test_snapshot_summarizes_prices_ratings_and_addresses():
+    stats = ListingStats()
+    stats.extend([
+        _item("₩10,000", "4.9 (10)", "부산"),
+        _item("₩30,000", "평점 4.2점(5점 만점), 후기 5개", "부산"),
+        _item("₩20,000", "", "서울"),
+        _item("", "3.0 (1)", "서울"),
+        _item("₩50,000", "4.85 (4)", "부산"),
+    ])
+    snap = stats.snapshot()
+    assert snap["count"] == 5
+    assert snap["price"]["count"] == 4
+    assert (snap["price"]["min"], snap["price"]["max"]) == (10000, 50000)
+    assert snap["price"]["percentiles"]["p50"] == 25000.0
+    assert snap["rating"]["count"] == 4
+    assert [b["count"] for b in snap["rating"]["histogram"]] == [1, 0, 1, 0, 2]
+    assert snap["reviews_total"] == 20
+    assert snap["top_addresses_by_count"][0] == {"address": "부산", "count": 3, "median_price": 30000.0}
+    assert snap["top_addresses_by_median_price"][0]["address"] == "부산"
+    assert {"address": "서울", "count": 2, "median_price": 20000.0} in snap["top_addresses_by_count"]
+
+
+def test_snapshot_is_cached_until_new_rows():
+    stats = ListingStats()
+    stats.extend([_item("₩10,000", "4.5 (2)", "부산")])
+    first = stats.snapshot()
+    assert stats.snapshot() is first
+    stats.extend([])
+    assert stats.snapshot() is first
+    stats.extend([_item("₩30,000", "4.0 (1)", "서울")])
+    second = stats.snapshot()
+    assert second is not first
+    assert second["count"] == 2
+    assert second["price"]["max"] == 30000
+
+
+def test_arrays_grow_past_initial_capacity():
+    stats = ListingStats()
+    for page in range(10):
+        stats.extend([_item(f"₩{(page * 100 + i + 1) * 10:,}", "", f"주소{i % 3}") for i in range(100)])
+    snap = stats.snapshot()
+    assert snap["count"] == 1000
+    assert (snap["price"]["min"], snap["price"]["max"]) == (10, 10000)
+    assert sum(row["count"] for row in snap["top_addresses_by_count"]) == 1000
@@ -0,0 +1,81 @@
+import gzip
+import json
+
+import pytest
+
+import response_utils
+from response_utils import COMPRESS_MIN_SIZE, PayloadCache, negotiate_encoding
+
+
+@pytest.mark.parametrize(
+    "header, allow_br, expected",
+    [
+        (None, True, None),
+        ("", True, None),
+        ("identity", True, None),
+        ("gzip", True, "gzip"),
+        ("gzip, deflate, br", True, "br"),
+        ("gzip, deflate, br", False, "gzip"),
+        ("BR;q=1.0, GZIP", True, "br"),
+        ("br;q=0, gzip", True, "gzip"),
+        ("br; q=0.0, gzip;q=0", True, None),
+        ("deflate", True, None),
+    ],
+)
+def test_negotiate_encoding(header, allow_br, expected):
+    assert negotiate_encoding(header, allow_br=allow_br) == expected
+
+
+def test_negotiate_encoding_without_brotli(monkeypatch):
+    monkeypatch.setattr(response_utils, "brotli", None)
+    assert negotiate_encoding("br, gzip") == "gzip"
+    assert negotiate_encoding("br") is None
+
+
+def _build(n: int) -> bytes:
+    return json.dumps({"status": "running", "listings": [{"no": i, "title": "숙소"} for i in range(n)]}).encode()
+
+
+def test_payload_cache_appends_tail_and_compresses():
+    cache = PayloadCache()
+    body, encoding = cache.get(1, "gzip", lambda: _build(200), tail=b'"metrics":{"polls":1}')
+    assert encoding == "gzip"
+    payload = json.loads(gzip.decompress(body))
+    assert payload["metrics"] == {"polls": 1}
+    assert len(payload["listings"]) == 200
+
+
+def test_payload_cache_builds_once_per_version():
+    cache = PayloadCache()
+    builds = []
+
+    def build() -> bytes:
+        builds.append(1)
+        return _build(200)
+
+    for polls in range(3):
+        body, _ = cache.get(1, "gzip", build, tail=f'"metrics":{{"polls":{polls}}}'.encode())
+        assert json.loads(gzip.decompress(body))["metrics"] == {"polls": polls}
+    plain, encoding = cache.get(1, None, build)
+    assert encoding is None and json.loads(plain)["status"] == "running"
+    assert len(builds) == 1
+    cache.get(2, "gzip", build)
+    assert len(builds) == 2
+
+
+def test_payload_cache_skips_compression_below_threshold():
+    cache = PayloadCache()
+    body, encoding = cache.get(1, "gzip", lambda: b'{"status":"pending"}', tail=b'"metrics":{}')
+    assert len(body) < COMPRESS_MIN_SIZE
+    assert encoding is None
+    assert json.loads(body) == {"status": "pending", "metrics": {}}
+
+
+def test_payload_cache_empty_object_with_tail():
+    body, _ = PayloadCache().get(1, None, lambda: b"{}", tail=b'"metrics":{}')
+    assert json.loads(body) == {"metrics": {}}
+
+
+def test_payload_cache_rejects_brotli():
+    with pytest.raises(ValueError):
+        PayloadCache().get(1, "br", lambda: b"{}")
@@ -0,0 +1,109 @@
+from urllib.parse import parse_qsl, urlsplit
+
+import pytest
+
+from sharding import parse_result_count, plan_shards, resolve_strategy
+
+BASE = "https://www.airbnb.co.kr/s/부산/homes?adults=2&items_offset=36"
+# 가격(원) 1,000 ~ 600,000 에 고르게 퍼진 숙소 1,200개 + 지도 좌표
+PRICES = [1000 + i * 500 for i in range(1200)]
+POINTS = [(35.0 + (i % 40) * 0.005, 129.0 + (i // 40) * 0.005) for i in range(1200)]
+
+
+def _query(url: str) -> dict[str, str]:
+    return dict(parse_qsl(urlsplit(url).query))
+
+
+def price_probe(url: str) -> int:
+    q = _query(url)
+    low = int(q.get("price_min") or 0)
+    high = int(q["price_max"]) if q.get("price_max") else None
+    return sum(1 for p in PRICES if p >= low and (high is None or p <= high))
+
+
+def bbox_probe(url: str) -> int:
+    q = {k: float(v) for k, v in _query(url).items() if k in ("ne_lat", "ne_lng", "sw_lat", "sw_lng")}
+    return sum(
+        1 for lat, lng in POINTS if q["sw_lat"] <= lat <= q["ne_lat"] and q["sw_lng"] <= lng <= q["ne_lng"]
+    )
+
+
+def test_price_shards_are_disjoint_and_unsaturated():
+    plan = plan_shards(BASE, price_probe, saturation=270)
+    assert plan["strategy"] == "price"
+    assert not plan["truncated"]
+    assert plan["estimated_total"] == len(PRICES)
+    assert all(s["count"] < 270 for s in plan["shards"])
+    ranges = sorted((s["params"]["price_min"], s["params"]["price_max"]) for s in plan["shards"])
+    for (_, high), (low, _) in zip(ranges, ranges[1:]):
+        assert low == high + 1
+    for shard in plan["shards"]:
+        q = _query(shard["url"])
+        assert q["adults"] == "2"
+        assert "items_offset" not in q
+
+
+def test_bbox_shards_cover_all_points():
+    url = BASE + "&ne_lat=35.2&ne_lng=129.15&sw_lat=35.0&sw_lng=129.0"
+    plan = plan_shards(url, bbox_probe, saturation=270)
+    assert plan["strategy"] == "bbox"
+    assert not plan["truncated"]
+    assert plan["estimated_total"] == len(POINTS)
+    assert all(s["count"] < 270 for s in plan["shards"])
+    assert all(_query(s["url"])["search_by_map"] == "true" for s in plan["shards"])
+
+
+def test_unsaturated_search_is_not_split():
+    plan = plan_shards(BASE, lambda url: 100)
+    assert plan["probes"] == 1
+    assert [s["url"] for s in plan["shards"]] == [BASE]
+
+
+def test_max_shards_truncates():
+    plan = plan_shards(BASE, price_probe, saturation=50, max_shards=4)
+    assert plan["truncated"]
+    assert len(plan["shards"]) <= 4
+    assert plan["estimated_total"] == len(PRICES)
+
+
+def test_unknown_count_is_kept_without_splitting():
+    plan = plan_shards(BASE, lambda url: None)
+    assert plan["probes"] == 1
+    assert plan["shards"][0]["count"] is None
+    assert plan["estimated_total"] == 0
+
+
+def test_empty_child_shards_are_dropped():
+    # 원래 검색만 포화, 나눈 구간은 모두 결과 없음 (결과 수 표시가 실제보다 큰 경우)
+    plan = plan_shards(BASE, lambda url: 0 if "price_min" in _query(url) else 500, saturation=270)
+    assert plan["probes"] == 3
+    assert plan["shards"] == []
+    assert plan["truncated"] is False
+
+
+@pytest.mark.parametrize(
+    "url, strategy",
+    [
+        (BASE, "bbox"),
+        (BASE + "&ne_lat=x&ne_lng=1&sw_lat=1&sw_lng=1", "bbox"),
+        (BASE + "&price_min=abc", "price"),
+        (BASE, "grid"),
+    ],
+)
+def test_invalid_strategy_input(url, strategy):
+    with pytest.raises(ValueError):
+        resolve_strategy(url, strategy)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("부산의 숙소 1,000개 이상", 1000),
+        ("300개 이상의 숙소", 300),
+        ("Over 1,000 homes", 1000),
+        ("검색 결과 없음", None),
+        ("", None),
+    ],
+)
+def test_parse_result_count(text, expected):
+    assert parse_result_count(text) == expected
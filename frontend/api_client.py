@@ -0,0 +1,110 @@
+"""
+백엔드 API 클라이언트 — 프로세스당 하나의 keep-alive 세션(연결 풀)으로 모든 요청 전송.
+- 연결 재사용: 매 폴링마다 TCP/TLS 핸드셰이크를 하지 않음 (원격 백엔드에서 지연 대부분 차지)
+- 압축 전송: Accept-Encoding gzip (brotli 모듈이 있으면 br 포함) — 백엔드 status/json·listings 압축 응답
+- 재시도: 연결 실패·일시 오류(502/503/504)만 제한 횟수 지수 백오프 (POST 는 연결 실패만)
+- 헬스체크: 짧은 TTL 동안 결과 재사용
+- 지연 측정: 엔드포인트별 최근 요청 소요 시간 (디버그 표시용)
+app.py 에서는 st.cache_resource 로 만든 get_client() 하나를 모든 세션이 공유.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401 — urllib3 가 br 응답을 풀 수 있을 때만 요청
+    ACCEPT_ENCODING = "br, gzip"
+except ImportError:
+    ACCEPT_ENCODING = "gzip"
+
+# 연결 풀 크기 (동시 세션의 폴링·다운로드)
+POOL_SIZE = 10
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+HEALTH_TTL = 10.0
+# 엔드포인트별로 보관할 최근 지연 수
+LATENCY_WINDOW = 20
+
+
+class BackendClient:
+    """백엔드 API 호출. 스레드 안전 (requests.Session 연결 풀 공유, 측정값은 lock 보호)."""
+
+    def __init__(self, base_url: str, pool_size: int = POOL_SIZE) -> None:
+        self.base_url = base_url.rstrip("/")
+        retry = Retry(
+            total=RETRY_TOTAL,
+            connect=RETRY_TOTAL,
+            read=RETRY_TOTAL,
+            status=RETRY_TOTAL,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self._lock = threading.Lock()
+        self._latency: dict[str, deque] = {}
+        self._health: tuple[float, bool, str] | None = None
+
+    def request(self, method: str, path: str, name: str | None = None, **kwargs: Any) -> requests.Response:
+        """요청 전송 후 소요 시간을 name(기본: path) 별로 기록."""
+        start = time.perf_counter()
+        try:
+            return self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._latency.setdefault(name or path, deque(maxlen=LATENCY_WINDOW)).append(elapsed)
+
+    def get(self, path: str, name: str | None = None, **kwargs: Any) -> requests.Response:
+        return self.request("GET", path, name, **kwargs)
+
+    def post(self, path: str, name: str | None = None, **kwargs: Any) -> requests.Response:
+        return self.request("POST", path, name, **kwargs)
+
+    def health(self, ttl: float = HEALTH_TTL) -> tuple[bool, str]:
+        """(정상 여부, 실패 사유) — ttl 초 안에 확인한 결과가 있으면 재사용. 실패한 결과는 캐시하지 않음."""
+        with self._lock:
+            cached = self._health
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1], cached[2]
+        url = f"{self.base_url}/health"
+        try:
+            r = self.get("/health", timeout=3)
+            if r.status_code == 200:
+                ok, detail = True, ""
+            else:
+                ok, detail = False, f"백엔드 health 체크 실패: {url} (status={r.status_code}, body={r.text})"
+        except Exception as e:
+            ok, detail = False, f"백엔드 health 체크 예외: {url}\n\n{e}"
+        with self._lock:
+            self._health = (time.monotonic(), ok, detail) if ok else None
+        return ok, detail
+
+    def latency_summary(self) -> dict[str, dict[str, float]]:
+        """엔드포인트별 최근 요청 지연(ms): last, avg, max, count."""
+        with self._lock:
+            items = {name: list(values) for name, values in self._latency.items()}
+        return {
+            name: {
+                "last_ms": round(values[-1] * 1000, 1),
+                "avg_ms": round(sum(values) / len(values) * 1000, 1),
+                "max_ms": round(max(values) * 1000, 1),
+                "count": len(values),
+            }
+            for name, values in sorted(items.items())
+            if values
+        }
+
+    def close(self) -> None:
+        self.session.close()
@@ -3,15 +3,21 @@ Streamlit 프론트엔드 — 에어비앤비 크롤링 UI.
 
 - 에어비앤비 접속 → 숙박 페이지 선택 후, 주소창 URL을 복사해 아래 입력란에 붙여넣기
 - 크롤링 시작 시 해당 URL로 수집, 진행 현황 실시간 표시 → 엑셀 내보내기
+- 진행 현황은 fragment 만 주기적으로 다시 실행하고, status/json?since=<받은 건수> 로 새 행만 받아 session_state 에 누적
+- 백엔드 호출은 api_client.BackendClient 하나(keep-alive 연결 풀, 압축, 재시도)를 st.cache_resource 로 공유
 """
 import os
+import sys
 import time
 from datetime import datetime
-from typing import Any
 
-import requests
 import streamlit as st
 
+# 루트 app.py 에서 run_path 로 실행될 때도 같은 폴더의 모듈을 import
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from api_client import BackendClient  # noqa: E402
+
 
 def _get_backend_url() -> str:
     """로컬은 .env, Streamlit Cloud는 Secrets에서 BACKEND_URL 읽기."""
@@ -27,36 +33,38 @@ def _get_backend_url() -> str:
 
 
 # 지연 계산: import 시 st.secrets 미준비로 오류 나는 것 방지 (Streamlit Cloud 등)
+# 프로세스당 한 번만 URL 을 읽고 클라이언트(연결 풀)를 만들어 모든 세션이 공유 (session_state 미사용으로 Cloud 초기화 이슈 회피)
+@st.cache_resource
+def get_client() -> BackendClient:
+    return BackendClient(_get_backend_url())
+
+
 def _backend_url() -> str:
-    """매번 조회 (session_state 미사용으로 Cloud 초기화 이슈 회피)."""
-    return _get_backend_url()
+    return get_client().base_url
 
 
 AIRBNB_URL = "https://www.airbnb.co.kr/"
+# 진행 현황 갱신 간격(초)
+POLL_INTERVAL = 2
+# 크롤링 중 표에 보여줄 최근 수집 건수 (완료 후에는 전체 표시)
+RECENT_ROWS = 100
 
 
 def check_backend() -> bool:
-    """백엔드 연결 확인."""
-    try:
-        url = f"{_backend_url()}/health"
-        r = requests.get(url, timeout=3)
-        if r.status_code == 200:
-            return True
-        # 상태코드가 200이 아니면 상세 이유를 화면에 표시
-        st.error(f"백엔드 health 체크 실패: {url} (status={r.status_code}, body={r.text})")
-        return False
-    except Exception as e:
-        # 예외 내용을 그대로 보여줘서 문제 원인을 바로 확인할 수 있도록 함
-        st.error(f"백엔드 health 체크 예외: {_backend_url()}/health\n\n{e}")
-        return False
+    """백엔드 연결 확인 (성공 결과는 잠시 재사용)."""
+    ok, detail = get_client().health()
+    if not ok:
+        # 실패 사유(상태 코드·예외)를 그대로 보여줘서 문제 원인을 바로 확인할 수 있도록 함
+        st.error(detail)
+    return ok
 
 
-def start_crawl(search_url: str, max_pages: int) -> str | None:
+def start_crawl(search_url: str, max_pages: int, enrich: bool = False) -> str | None:
     """POST /crawl 호출 후 job_id 반환. 실패 시 None."""
     try:
-        r = requests.post(
-            f"{_backend_url()}/crawl",
-            json={"search_url": search_url, "max_pages": max_pages},
+        r = get_client().post(
+            "/crawl",
+            json={"search_url": search_url, "max_pages": max_pages, "enrich": enrich},
             timeout=10,
         )
         r.raise_for_status()
@@ -66,26 +74,100 @@ def start_crawl(search_url: str, max_pages: int) -> str | None:
         return None
 
 
-def fetch_status(job_id: str) -> dict:
-    """현재 상태 1회 조회. 실패 시 failed 상태 반환."""
+def start_batch_crawl(search_urls: list[str], max_pages: int, enrich: bool = False) -> str | None:
+    """POST /crawl/batch 호출 후 부모 job_id 반환. 실패 시 None."""
     try:
-        r = requests.get(f"{_backend_url()}/crawl/{job_id}/status/json", timeout=10)
-        if r.status_code == 404:
-            return {
-                "status": "failed",
-                "error_message": "작업을 찾을 수 없습니다. (백엔드 재시작 시 이전 작업은 사라집니다) 크롤링을 다시 시작해 주세요.",
-                "job_not_found": True,
-            }
+        r = get_client().post(
+            "/crawl/batch",
+            json={"search_urls": search_urls, "max_pages": max_pages, "enrich": enrich},
+            timeout=10,
+        )
         r.raise_for_status()
-        return r.json()
-    except requests.exceptions.RequestException as e:
-        return {"status": "failed", "error_message": str(e)}
+        return r.json().get("job_id")
     except Exception as e:
-        return {"status": "failed", "error_message": str(e)}
+        st.error(f"배치 크롤링 시작 실패: {e}")
+        return None
 
 
-def get_download_url(job_id: str) -> str:
-    return f"{_backend_url()}/crawl/{job_id}/download"
+def fetch_status(job_id: str, since: int = 0) -> dict:
+    """
+    현재 상태 1회 조회 (listings 는 since 번째 이후 새 행만). 작업이 없으면(404) failed 상태 반환.
+    연결 오류·타임아웃·5xx 등 일시 오류는 예외 그대로 전달 — poll_status 가 다음 갱신 때 재시도.
+    """
+    r = get_client().get(f"/crawl/{job_id}/status/json", name="status/json", params={"since": since}, timeout=10)
+    if r.status_code == 404:
+        return {
+            "status": "failed",
+            "error_message": "작업을 찾을 수 없습니다. (백엔드 재시작 시 이전 작업은 사라집니다) 크롤링을 다시 시작해 주세요.",
+            "job_not_found": True,
+        }
+    r.raise_for_status()
+    return r.json()
+
+
+def poll_status(job_id: str) -> dict:
+    """
+    새 행만 받아 session_state["listings"] 에 이어 붙이고 상태(listings 제외)를 session_state["job_data"] 에 저장.
+    서버 건수가 로컬보다 적으면 (작업 재시작 등) 로컬 목록을 비우고 다음 조회에서 처음부터 다시 받음.
+    조회가 일시적으로 실패하면 마지막 상태·목록을 그대로 두고 session_state["poll_error"] 에 사유만 기록.
+    """
+    rows: list[dict] = st.session_state.setdefault("listings", [])
+    start = time.perf_counter()
+    try:
+        data = fetch_status(job_id, since=len(rows))
+    except Exception as e:
+        st.session_state["poll_error"] = str(e)
+        return st.session_state.get("job_data") or {}
+    st.session_state.pop("poll_error", None)
+    st.session_state["poll_latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    new_rows = data.pop("listings", None)
+    if (data.get("total_listings") or 0) < len(rows):
+        rows.clear()
+    elif isinstance(new_rows, list):
+        rows.extend(new_rows)
+    data["received_rows"] = len(new_rows or [])
+    st.session_state["job_data"] = data
+    return data
+
+
+def fetch_stats(job_id: str) -> dict | None:
+    """수집 결과 집계 조회 (원본 행 없이 요약만). 실패 시 None."""
+    try:
+        r = get_client().get(f"/crawl/{job_id}/stats", name="stats", timeout=10)
+        r.raise_for_status()
+        return r.json()
+    except Exception:
+        return None
+
+
+def render_stats(stats: dict) -> None:
+    """가격 분포·평점 히스토그램·주소별 건수/중앙 가격 표시."""
+    price = stats.get("price") or {}
+    rating = stats.get("rating") or {}
+    pct = price.get("percentiles") or {}
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("최저가", f"₩{price['min']:,}" if "min" in price else "-")
+    c2.metric("중앙값", f"₩{pct['p50']:,.0f}" if "p50" in pct else "-")
+    c3.metric("최고가", f"₩{price['max']:,}" if "max" in price else "-")
+    c4.metric("평균 평점", f"{rating['mean']:.2f}" if rating.get("mean") is not None else "-")
+    if pct:
+        st.caption(" · ".join(f"{k}: ₩{v:,.0f}" for k, v in pct.items()))
+    histogram = rating.get("histogram") or []
+    if rating.get("count"):
+        st.bar_chart(
+            [{"평점 구간": f"{b['from']}~{b['to']}", "숙소 수": b["count"]} for b in histogram],
+            x="평점 구간",
+            y="숙소 수",
+        )
+    top = stats.get("top_addresses_by_count") or []
+    if top:
+        st.dataframe(
+            [
+                {"상세설명": a["address"], "숙소 수": a["count"], "중앙 가격": a["median_price"]}
+                for a in top
+            ],
+            use_container_width=True,
+        )
 
 
 def main() -> None:
@@ -126,6 +208,13 @@ def main() -> None:
         help="에어비앤비 숙박 검색 결과 페이지의 주소를 복사해 붙여넣으세요.",
         key="search_url",
     )
+    extra_urls_text = st.text_area(
+        "추가 검색 URL (선택, 줄마다 하나)",
+        value="",
+        placeholder="https://www.airbnb.co.kr/s/부산/homes?...",
+        help="여러 도시·날짜를 한 번에 수집할 때 입력하세요. 위 URL과 함께 배치로 크롤링하고 중복 숙소는 하나로 합칩니다.",
+        key="extra_urls",
+    )
     max_pages = st.number_input(
         "최대 크롤링 페이지 수",
         min_value=1,
@@ -134,6 +223,11 @@ def main() -> None:
         step=1,
         help="수집할 최대 페이지 수 (1페이지당 여러 개 숙소)",
     )
+    enrich = st.checkbox(
+        "상세 정보 보강 (최대 인원·호스트·편의시설·좌표)",
+        value=False,
+        help="숙소 상세 페이지를 추가로 방문하므로 더 오래 걸립니다. 최근 보강한 숙소는 캐시에서 바로 채웁니다.",
+    )
 
     st.divider()
 
@@ -143,6 +237,9 @@ def main() -> None:
     st.subheader("3단계: 크롤링 및 엑셀 내보내기")
     if st.button("크롤링 시작", type="primary"):
         url_to_use = (search_url or "").strip()
+        extra_urls = [u.strip() for u in (extra_urls_text or "").splitlines() if u.strip()]
+        if not url_to_use and extra_urls:
+            url_to_use = extra_urls.pop(0)
         if not url_to_use:
             st.warning("2단계에서 검색 결과 URL을 복사해 붙여넣어 주세요.")
         else:
@@ -153,11 +250,16 @@ def main() -> None:
                     "`cd backend` 후 `python -m uvicorn main:app --reload`"
                 )
             else:
-                job_id = start_crawl(url_to_use, max_pages)
+                if extra_urls:
+                    job_id = start_batch_crawl([url_to_use, *extra_urls], max_pages, enrich)
+                else:
+                    job_id = start_crawl(url_to_use, max_pages, enrich)
                 if job_id:
                     st.session_state["job_id"] = job_id
                     st.session_state["max_pages"] = max_pages
                     st.session_state["progress_log"] = []
+                    st.session_state["listings"] = []
+                    st.session_state["job_data"] = {}
 
     job_id = st.session_state.get("job_id")
     if not job_id:
@@ -166,81 +268,42 @@ def main() -> None:
     # --------------------------------------------------
     # 진행 현황 (실시간)
     # --------------------------------------------------
-    if "progress_log" not in st.session_state:
-        st.session_state["progress_log"] = []
-
     st.subheader("📊 크롤링 진행 현황")
-    st.caption("백엔드에서 상태를 가져오는 중… 연결이 안 되면 아래에 오류가 표시됩니다.")
-    progress_placeholder = st.empty()
-    status_placeholder = st.empty()
-    log_placeholder = st.empty()
-    table_placeholder = st.empty()
-
-    last_data: dict[str, Any] = {}
-    data = fetch_status(job_id)
-    last_data = data
-    with st.expander("백엔드 상태 응답 (JSON)", expanded=False):
-        st.json(data)
-    status = data.get("status", "")
-    current = data.get("current_page", 0)
-    total = data.get("max_pages", 1) or 1
-    total_listings = data.get("total_listings", 0)
-    listings = data.get("listings") if isinstance(data.get("listings"), list) else []
-    progress_pct = data.get("progress_percent", 0) or (100 * current / total if total else 0)
-
-    # 로그 한 줄 추가
-    ts = datetime.now().strftime("%H:%M:%S")
-    log_line = f"[{ts}] 페이지 {current}/{total} · 수집 {total_listings}건 · 상태: {status}"
-    if not st.session_state["progress_log"] or st.session_state["progress_log"][-1] != log_line:
-        st.session_state["progress_log"].append(log_line)
-
-    # 진행률 바
-    progress_placeholder.progress(progress_pct / 100.0)
-
-    # 요약 상태
-    status_placeholder.markdown(
-        f"""
-        | 항목 | 값 |
-        |------|-----|
-        | **상태** | `{status}` |
-        | **현재 페이지** | {current} / {total} |
-        | **수집 건수** | **{total_listings}건** |
-        | **진행률** | {progress_pct:.1f}% |
-        """
-    )
-
-    # 진행 로그 (최근 20줄)
-    log_text = "\n".join(st.session_state["progress_log"][-20:])
-    log_placeholder.code(log_text or "대기 중...", language=None)
-
+    data = st.session_state.get("job_data") or {}
+    if data.get("status") not in ("completed", "failed"):
+        st.caption("백엔드에서 상태를 가져오는 중… 연결이 안 되면 아래에 오류가 표시됩니다.")
+        auto = st.checkbox(f"자동 갱신({POLL_INTERVAL}초)", value=True)
+        # 진행 위젯만 fragment 로 주기 실행 — 스크립트 전체를 다시 돌리지 않음
+        st.fragment(run_every=POLL_INTERVAL if auto else None)(render_progress)(job_id)
+        if not auto and st.button("상태 새로고침"):
+            st.rerun()
+        return
+    render_progress_widgets(data)
+    listings = st.session_state.get("listings") or []
     if listings:
-        table_placeholder.dataframe(listings, use_container_width=True)
+        st.dataframe(listings, use_container_width=True)
 
-    if status == "failed":
+    stats = fetch_stats(job_id)
+    if stats and stats.get("count"):
+        with st.expander("📈 수집 결과 통계", expanded=data["status"] == "completed"):
+            render_stats(stats)
+
+    if data["status"] == "failed":
         err_msg = data.get("error_message") or "알 수 없는 오류"
         st.error(err_msg)
-        if "job_id" in st.session_state:
-            del st.session_state["job_id"]
+        for key in ("job_id", "job_data", "listings"):
+            st.session_state.pop(key, None)
         st.info("아래에서 URL을 입력한 뒤 **크롤링 시작**을 다시 눌러 주세요.")
         if st.button("처음으로 (입력 화면으로 돌아가기)", type="primary"):
             st.rerun()
         st.stop()
-    if status == "completed":
-        st.success(f"크롤링 완료: 총 {total_listings}건 수집")
-    else:
-        auto = st.checkbox("자동 갱신(2초)", value=True)
-        if st.button("상태 새로고침"):
-            st.rerun()
-        if auto:
-            time.sleep(2)
-            st.rerun()
+    st.success(f"크롤링 완료: 총 {data.get('total_listings', 0)}건 수집")
 
     # 엑셀 내보내기
-    listings_for_download = last_data.get("listings") if isinstance(last_data.get("listings"), list) else []
-    if last_data.get("status") == "completed" and listings_for_download:
+    if listings:
         st.subheader("엑셀 내보내기")
         try:
-            resp = requests.get(get_download_url(job_id), timeout=30)
+            resp = get_client().get(f"/crawl/{job_id}/download", name="download", timeout=30)
             if resp.status_code == 200:
                 st.download_button(
                     label="엑셀 파일 내보내기",
@@ -254,6 +317,77 @@ def main() -> None:
             st.error(f"다운로드 요청 실패: {e}")
 
 
+def render_progress(job_id: str) -> None:
+    """
+    fragment 본문: 새 행만 받아 누적하고 진행 위젯·최근 수집 행만 다시 그림.
+    작업이 끝나면 앱 전체를 한 번 다시 실행해 전체 표·통계·엑셀 내보내기 표시.
+    """
+    data = poll_status(job_id)
+    poll_error = st.session_state.get("poll_error")
+    if poll_error:
+        st.warning(f"상태 조회 실패 — 다음 갱신 때 다시 시도합니다: {poll_error}")
+    render_progress_widgets(data)
+    listings = st.session_state.get("listings") or []
+    if listings:
+        st.caption(f"최근 수집 {min(len(listings), RECENT_ROWS)}건 (전체 표는 완료 후 표시)")
+        st.dataframe(listings[-RECENT_ROWS:], use_container_width=True)
+    if data.get("status") in ("completed", "failed"):
+        st.rerun()
+
+
+def render_progress_widgets(data: dict) -> None:
+    """진행률 바·요약 표·진행 로그·배치 하위 작업·상태 응답(listings 제외) 표시."""
+    status = data.get("status", "")
+    current = data.get("current_page", 0)
+    total = data.get("max_pages", 1) or 1
+    total_listings = data.get("total_listings", 0)
+    progress_pct = data.get("progress_percent", 0) or (100 * current / total if total else 0)
+
+    # 로그 한 줄 추가
+    log = st.session_state.setdefault("progress_log", [])
+    ts = datetime.now().strftime("%H:%M:%S")
+    log_line = f"[{ts}] 페이지 {current}/{total} · 수집 {total_listings}건 · 상태: {status}"
+    if not log or log[-1].split("] ", 1)[-1] != log_line.split("] ", 1)[-1]:
+        log.append(log_line)
+
+    st.progress(min(progress_pct, 100.0) / 100.0)
+    st.markdown(
+        f"""
+        | 항목 | 값 |
+        |------|-----|
+        | **상태** | `{status}` |
+        | **현재 페이지** | {current} / {total} |
+        | **수집 건수** | **{total_listings}건** |
+        | **진행률** | {progress_pct:.1f}% |
+        """
+    )
+    # 진행 로그 (최근 20줄)
+    st.code("\n".join(log[-20:]) or "대기 중...", language=None)
+
+    children = data.get("children") if isinstance(data.get("children"), list) else []
+    if children:
+        with st.expander(f"🗂️ 배치 하위 작업 ({len(children)}개, 중복 제외 {data.get('duplicates_skipped', 0)}건)"):
+            st.dataframe(
+                [
+                    {
+                        "URL": c.get("search_url"),
+                        "상태": c.get("status"),
+                        "페이지": c.get("current_page"),
+                        "수집": c.get("total_listings"),
+                        "진행률": c.get("progress_percent"),
+                        "오류": c.get("error_message") or "",
+                    }
+                    for c in children
+                ],
+                use_container_width=True,
+            )
+    with st.expander("백엔드 상태 응답 (JSON, listings 제외)", expanded=False):
+        latency = st.session_state.get("poll_latency_ms")
+        if latency is not None:
+            st.caption(f"마지막 상태 조회 {latency}ms · 새 행 {data.get('received_rows', 0)}건")
+        st.json({"status": data, "latency": get_client().latency_summary()}, expanded=False)
+
+
 # Streamlit Cloud는 스크립트를 import 방식으로 실행할 수 있어, __main__일 때만 실행하면 main()이 호출되지 않을 수 있음.
 # 따라서 조건 없이 main() 실행 (로컬 streamlit run 시에도 동일하게 실행됨)
 try: